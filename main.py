@@ -11,6 +11,8 @@ This script provides easy access to all the project's functionality:
 Usage:
     python main.py --help                    # Show all options
     python main.py --enrich                  # Run URL enrichment only
+    python main.py --scrape --resume         # Continue an interrupted run
+    python main.py --scrape --incremental    # Only redo new, edited or stale companies
     python main.py --scrape                  # Run full enrichment + job scraping
     python main.py --format                  # Format existing data
     python main.py --example                 # Generate example output
@@ -41,33 +43,35 @@ def print_banner():
     print("   └── .venv/         # Python virtual environment")
     print("=" * 70)
 
-async def run_enrichment():
+async def run_enrichment(search_backend="http", resume=False, output_format="excel"):
     """Run URL enrichment only"""
     print("🔍 Running URL enrichment...")
     try:
         from enricher import process_companies
-        await process_companies()
+        await process_companies(search_backend=search_backend, resume=resume, output_format=output_format)
         print("✅ URL enrichment completed!")
     except Exception as e:
         print(f"❌ Error during enrichment: {e}")
 
-async def run_full_scraping():
+async def run_full_scraping(search_backend="http", discovery_workers=4, scrape_workers=3, resume=False,
+                            incremental=False, output_format="excel", prioritize=False):
     """Run full enrichment + job scraping"""
     print("🎯 Running full data enrichment and job scraping...")
     try:
         from improved_scraper import main
-        await main()
+        await main(search_backend=search_backend, discovery_workers=discovery_workers, scrape_workers=scrape_workers,
+                   resume=resume, incremental=incremental, output_format=output_format, prioritize=prioritize)
         print("✅ Full scraping completed!")
     except Exception as e:
         print(f"❌ Error during scraping: {e}")
 
-def run_formatting():
+def run_formatting(output_format="excel"):
     """Format existing data"""
     print("📊 Formatting existing data...")
     try:
         from data_formatter import format_existing_data, create_csv_format
-        df_result = format_existing_data()
-        if df_result is not None:
+        df_result = format_existing_data(output_format)
+        if df_result is not None and output_format == "excel":
             create_csv_format()
         print("✅ Data formatting completed!")
     except Exception as e:
@@ -123,6 +127,12 @@ Examples:
     python main.py --format          # Format existing data
     python main.py --example         # Generate example output
     python main.py --status          # Show project status
+    python main.py --scrape --search-backend playwright  # Search through the browser only
+    python main.py --scrape --discovery-workers 6 --scrape-workers 2  # Size each pipeline stage
+    python main.py --scrape --resume # Skip companies finished by an interrupted run
+    python main.py --scrape --incremental  # Nightly run: skip companies whose data is still fresh
+    python main.py --scrape --prioritize  # Scrape the companies with known job boards first
+    python main.py --scrape --output-format jsonl  # Stream rows to output/Data_enriched_improved.jsonl
         """
     )
     
@@ -136,6 +146,20 @@ Examples:
                        help="Generate example output")
     parser.add_argument("--status", action="store_true", 
                        help="Show project status")
+    parser.add_argument("--search-backend", choices=["http", "playwright"], default="http",
+                       help="Search backend for URL discovery: lightweight HTTP (falls back to the browser) or full browser (default: http)")
+    parser.add_argument("--discovery-workers", type=int, default=4,
+                       help="Companies searched for concurrently by --scrape (default: 4)")
+    parser.add_argument("--scrape-workers", type=int, default=3,
+                       help="Companies whose job pages are scraped concurrently by --scrape (default: 3)")
+    parser.add_argument("--resume", action="store_true",
+                       help="With --enrich or --scrape: skip companies recorded in the run's journal in output/ and rebuild the Excel output from it")
+    parser.add_argument("--output-format", choices=["excel", "csv", "jsonl", "parquet"], default="excel",
+                       help="Format of the output written by --enrich, --scrape and --format; rows are streamed as companies finish (default: excel)")
+    parser.add_argument("--incremental", action="store_true",
+                       help="With --scrape: only reprocess companies that are new, edited or past their freshness policy (jobs daily, websites monthly)")
+    parser.add_argument("--prioritize", action="store_true",
+                       help="With --scrape: process companies by expected jobs per page load (known job boards, feeds, earlier runs) so the 200 job limit is reached sooner")
     
     args = parser.parse_args()
     
@@ -146,11 +170,12 @@ Examples:
         return
     
     if args.enrich:
-        await run_enrichment()
+        await run_enrichment(args.search_backend, args.resume, args.output_format)
     elif args.scrape:
-        await run_full_scraping()
+        await run_full_scraping(args.search_backend, args.discovery_workers, args.scrape_workers, args.resume,
+                                args.incremental, args.output_format, args.prioritize)
     elif args.format:
-        run_formatting()
+        run_formatting(args.output_format)
     elif args.example:
         run_example()
     else:
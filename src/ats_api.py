@@ -0,0 +1,349 @@
+# Job board adapters that read boards without a browser: public JSON/XML feeds and static HTML listings
+import asyncio
+import re
+import xml.etree.ElementTree as ElementTree
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urljoin, urlsplit, unquote
+import aiohttp
+from bs4 import BeautifulSoup
+
+from rate_limiter import DEFAULT_USER_AGENT
+
+class AtsApiError(Exception):
+    """Raised when a board's feed or listing page cannot return a usable listing"""
+    pass
+
+def _job(company_name, title, location, url, date, platform):
+    """Build a job in the same shape as the DOM scrapers return"""
+    return {
+        'company_name': company_name,
+        'job_title': (title or 'N/A').strip(),
+        'job_location': (location or 'N/A').strip(),
+        'job_url': url or '',
+        'posting_date': date or 'N/A',
+        'job_description': 'N/A',
+        'platform': platform
+    }
+
+def _parse_xml(text, platform):
+    try:
+        return ElementTree.fromstring(text)
+    except ElementTree.ParseError as e:
+        raise AtsApiError(f"{platform} feed is not valid XML: {e}") from e
+
+def _local_name(tag):
+    return tag.rsplit('}', 1)[-1]
+
+class AtsApiAdapter:
+    """Derives a board from a listing page URL and reads its postings with plain HTTP requests"""
+    platform_id = None
+    platform = None
+    tier = 'feed'  # 'feed' (JSON/XML endpoint) or 'html' (static listing page)
+    url_patterns = []  # Regexes with named groups for the board identifiers; the first match wins
+    default_api_base = None  # None: the feed lives on the board's own host
+
+    def board(self, url):
+        """Return the board identifiers (slug, tenant, ...) for url, or None when url is not a board"""
+        for pattern in self.url_patterns:
+            match = re.search(pattern, url)
+            if match:
+                parts = urlsplit(url)
+                board = {key: unquote(value) for key, value in match.groupdict().items() if value is not None}
+                board['origin'] = f"{parts.scheme}://{parts.netloc}"
+                board['api_base'] = self.default_api_base or board['origin']
+                return board
+        return None
+
+    async def fetch_jobs(self, client, board, company_name, limit):
+        """Return up to limit jobs from the board"""
+        raise NotImplementedError
+
+class LeverApi(AtsApiAdapter):
+    """jobs.lever.co/{slug} -> GET api.lever.co/v0/postings/{slug}?mode=json"""
+    platform_id = 'lever'
+    platform = 'Lever'
+    url_patterns = [r'^https?://jobs\.(?P<region>eu\.)?lever\.co/(?P<slug>[^/?#]+)']
+    default_api_base = 'https://api.lever.co'
+
+    def board(self, url):
+        board = super().board(url)
+        if board and board.get('region'):
+            board['api_base'] = 'https://api.eu.lever.co'  # EU boards have their own API host
+        return board
+
+    async def fetch_jobs(self, client, board, company_name, limit):
+        api_url = f"{client.api_base(self, board)}/v0/postings/{board['slug']}"
+        postings = await client.get_json(api_url, params={'mode': 'json', 'limit': limit})
+        if not isinstance(postings, list):
+            raise AtsApiError("Lever API returned no postings list")
+        jobs = []
+        for posting in postings[:limit]:
+            created = posting.get('createdAt')
+            date = datetime.fromtimestamp(created / 1000, timezone.utc).date().isoformat() if created else None
+            jobs.append(_job(company_name, posting.get('text'), (posting.get('categories') or {}).get('location'),
+                             posting.get('hostedUrl'), date, self.platform))
+        return jobs
+
+class GreenhouseApi(AtsApiAdapter):
+    """boards.greenhouse.io/{slug} -> GET boards-api.greenhouse.io/v1/boards/{slug}/jobs"""
+    platform_id = 'greenhouse'
+    platform = 'Greenhouse'
+    url_patterns = [
+        r'greenhouse\.io/embed/job_board\?(?:[^#]*&)?for=(?P<slug>[^&#]+)',  # Embedded boards name the board in ?for=
+        r'^https?://(?:boards|job-boards)(?:\.eu)?\.greenhouse\.io/(?!embed/)(?P<slug>[^/?#]+)',
+    ]
+    default_api_base = 'https://boards-api.greenhouse.io'
+
+    async def fetch_jobs(self, client, board, company_name, limit):
+        api_url = f"{client.api_base(self, board)}/v1/boards/{board['slug']}/jobs"
+        data = await client.get_json(api_url)
+        if not isinstance(data, dict) or not isinstance(data.get('jobs'), list):
+            raise AtsApiError("Greenhouse API returned no jobs list")
+        jobs = []
+        for posting in data['jobs'][:limit]:
+            date = posting.get('first_published') or posting.get('updated_at')
+            jobs.append(_job(company_name, posting.get('title'), (posting.get('location') or {}).get('name'),
+                             posting.get('absolute_url'), date[:10] if date else None, self.platform))
+        return jobs
+
+class SmartRecruitersApi(AtsApiAdapter):
+    """careers.smartrecruiters.com/{slug} -> GET api.smartrecruiters.com/v1/companies/{slug}/postings"""
+    platform_id = 'smartrecruiters'
+    platform = 'SmartRecruiters'
+    url_patterns = [r'^https?://(?:careers|jobs)\.smartrecruiters\.com/(?P<slug>[^/?#]+)']
+    default_api_base = 'https://api.smartrecruiters.com'
+
+    async def fetch_jobs(self, client, board, company_name, limit):
+        api_url = f"{client.api_base(self, board)}/v1/companies/{board['slug']}/postings"
+        data = await client.get_json(api_url, params={'limit': limit})
+        if not isinstance(data, dict) or not isinstance(data.get('content'), list):
+            raise AtsApiError("SmartRecruiters API returned no postings")
+        jobs = []
+        for posting in data['content'][:limit]:
+            location = posting.get('location') or {}
+            location_text = location.get('fullLocation') or ', '.join(
+                location[key] for key in ('city', 'region', 'country') if location.get(key))
+            date = posting.get('releasedDate')
+            job_url = f"https://jobs.smartrecruiters.com/{board['slug']}/{posting['id']}" if posting.get('id') else ''
+            jobs.append(_job(company_name, posting.get('name'), location_text, job_url,
+                             date[:10] if date else None, self.platform))
+        return jobs
+
+class WorkdayApi(AtsApiAdapter):
+    """{tenant}.wdN.myworkdayjobs.com/{site} -> POST {host}/wday/cxs/{tenant}/{site}/jobs"""
+    platform_id = 'workday'
+    platform = 'Workday'
+    url_patterns = [
+        r'^https?://(?P<tenant>[\w-]+)\.wd\d+\.myworkdayjobs\.com(?::\d+)?/(?:[a-z]{2}(?:-[A-Za-z]{2})?/)?(?P<site>[^/?#]+)'
+    ]
+
+    async def fetch_jobs(self, client, board, company_name, limit):
+        api_url = f"{client.api_base(self, board)}/wday/cxs/{board['tenant']}/{board['site']}/jobs"
+        data = await client.post_json(api_url, {'appliedFacets': {}, 'limit': min(limit, 20), 'offset': 0, 'searchText': ''})
+        if not isinstance(data, dict) or not isinstance(data.get('jobPostings'), list):
+            raise AtsApiError("Workday API returned no job postings")
+        jobs = []
+        for posting in data['jobPostings'][:limit]:
+            path = posting.get('externalPath')
+            job_url = f"{board['origin']}/{board['site']}{path}" if path else ''
+            jobs.append(_job(company_name, posting.get('title'), posting.get('locationsText'), job_url,
+                             posting.get('postedOn'), self.platform))
+        return jobs
+
+class BambooHrApi(AtsApiAdapter):
+    """{company}.bamboohr.com/careers -> GET {host}/careers/list"""
+    platform_id = 'bamboohr'
+    platform = 'BambooHR'
+    url_patterns = [r'^https?://(?P<company>[\w-]+)\.bamboohr\.com']
+
+    async def fetch_jobs(self, client, board, company_name, limit):
+        data = await client.get_json(f"{client.api_base(self, board)}/careers/list")
+        if not isinstance(data, dict) or not isinstance(data.get('result'), list):
+            raise AtsApiError("BambooHR returned no job openings")
+        jobs = []
+        for posting in data['result'][:limit]:
+            location = posting.get('atsLocation') or posting.get('location') or {}
+            location_text = ', '.join(location[key] for key in ('city', 'state', 'country') if location.get(key))
+            if not location_text and posting.get('isRemote'):
+                location_text = 'Remote'
+            job_url = f"{board['origin']}/careers/{posting['id']}" if posting.get('id') else ''
+            jobs.append(_job(company_name, posting.get('jobOpeningName'), location_text, job_url, None, self.platform))
+        return jobs
+
+class TeamtailorApi(AtsApiAdapter):
+    """{company}.teamtailor.com/jobs -> GET {host}/jobs.rss"""
+    platform_id = 'teamtailor'
+    platform = 'Teamtailor'
+    url_patterns = [r'^https?://(?P<company>[\w-]+)\.teamtailor\.com']
+
+    async def fetch_jobs(self, client, board, company_name, limit):
+        channel = _parse_xml(await client.get_text(f"{client.api_base(self, board)}/jobs.rss"), self.platform)
+        jobs = []
+        for item in channel.iter('item'):
+            if len(jobs) >= limit:
+                break
+            published = item.findtext('pubDate')
+            try:
+                date = parsedate_to_datetime(published).date().isoformat() if published else None
+            except (TypeError, ValueError):
+                date = None
+            # Locations come in the feed's own namespace (<tt:locations><tt:location><tt:city>)
+            cities = [element.text for element in item.iter() if _local_name(element.tag) == 'city' and element.text]
+            jobs.append(_job(company_name, item.findtext('title'), ', '.join(dict.fromkeys(cities)),
+                             item.findtext('link'), date, self.platform))
+        return jobs
+
+class PersonioApi(AtsApiAdapter):
+    """{company}.jobs.personio.de -> GET {host}/xml"""
+    platform_id = 'personio'
+    platform = 'Personio'
+    url_patterns = [r'^https?://(?P<company>[\w-]+)\.jobs\.personio\.(?:de|com)']
+
+    async def fetch_jobs(self, client, board, company_name, limit):
+        feed = _parse_xml(await client.get_text(f"{client.api_base(self, board)}/xml"), self.platform)
+        jobs = []
+        for position in feed.iter('position'):
+            if len(jobs) >= limit:
+                break
+            job_id = position.findtext('id')
+            created = position.findtext('createdAt')
+            jobs.append(_job(company_name, position.findtext('name'), position.findtext('office'),
+                             f"{board['origin']}/job/{job_id}" if job_id else '', created[:10] if created else None,
+                             self.platform))
+        return jobs
+
+class JobviteHtml(AtsApiAdapter):
+    """jobs.jobvite.com/{slug} -> static listing at jobs.jobvite.com/{slug}/jobs"""
+    platform_id = 'jobvite'
+    platform = 'Jobvite'
+    tier = 'html'
+    url_patterns = [r'^https?://jobs\.jobvite\.com/(?P<slug>[^/?#]+)']
+    default_api_base = 'https://jobs.jobvite.com'
+
+    async def fetch_jobs(self, client, board, company_name, limit):
+        listing_url = f"{client.api_base(self, board)}/{board['slug']}/jobs"
+        soup = BeautifulSoup(await client.get_text(listing_url), 'html.parser')
+        jobs = []
+        for link in soup.select(f'a[href*="/{board["slug"]}/job/"]'):
+            if len(jobs) >= limit:
+                break
+            # Rows are <tr> or <li>, with name and location cells
+            row = link.find_parent(['tr', 'li']) or link
+            title = row.select_one('.jv-job-list-name') or link
+            location = row.select_one('.jv-job-list-location')
+            jobs.append(_job(company_name, title.get_text(' ', strip=True), location.get_text(' ', strip=True) if location else None,
+                             urljoin(board['origin'] + '/', link['href']), None, self.platform))
+        return jobs
+
+class IcimsHtml(AtsApiAdapter):
+    """careers-{company}.icims.com -> static listing at {host}/jobs/search?ss=1&in_iframe=1"""
+    platform_id = 'icims'
+    platform = 'iCIMS'
+    tier = 'html'
+    url_patterns = [r'^https?://(?P<host>[\w.-]+)\.icims\.com']
+    job_path = re.compile(r'/jobs/\d+/')
+
+    async def fetch_jobs(self, client, board, company_name, limit):
+        # in_iframe=1 returns the bare listing instead of the framed career site
+        listing_url = f"{client.api_base(self, board)}/jobs/search"
+        soup = BeautifulSoup(await client.get_text(listing_url, params={'ss': 1, 'in_iframe': 1}), 'html.parser')
+        jobs = []
+        for link in soup.find_all('a', href=self.job_path):
+            if len(jobs) >= limit:
+                break
+            heading = link.find(['h2', 'h3'])
+            title = (heading or link).get_text(' ', strip=True) or link.get('title')
+            if not title:
+                continue
+            row = link.find_parent(class_='row') or link.parent
+            jobs.append(_job(company_name, title, self._location(row) if row else None,
+                             urljoin(board['origin'] + '/', link['href']), None, self.platform))
+        return jobs
+
+    @staticmethod
+    def _location(row):
+        """Read the row's location: the value next to its 'Location' field label, or a location-classed element"""
+        for label in row.select('.field-label'):
+            if label.get_text(strip=True).lower() == 'location':
+                value = label.find_next_sibling()
+                if value:
+                    return value.get_text(' ', strip=True)
+        location = row.select_one('[class*="location"]')
+        return location.get_text(' ', strip=True) if location else None
+
+# Adapters that read a board without a browser, cheapest first
+ATS_API_ADAPTERS = [
+    LeverApi(), GreenhouseApi(), SmartRecruitersApi(), WorkdayApi(),
+    BambooHrApi(), TeamtailorApi(), PersonioApi(), JobviteHtml(), IcimsHtml(),
+]
+
+class AtsApiClient:
+    """Pooled HTTP client for job board feeds; api_bases overrides a platform's base URL (e.g. a local fixture server)"""
+
+    def __init__(self, api_bases=None, max_connections=8, timeout=15, rate_limiter=None, user_agent=DEFAULT_USER_AGENT):
+        self.api_bases = dict(api_bases or {})  # platform ID -> base URL
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter
+        self.user_agent = user_agent
+        self.session = None
+        self.fetched = 0
+        self.failed = 0
+
+    def api_base(self, adapter, board):
+        """Return the feed base URL for a board, honouring overrides"""
+        return self.api_bases.get(adapter.platform_id, board['api_base']).rstrip('/')
+
+    async def start(self):
+        if self.session is None:
+            connector = aiohttp.TCPConnector(limit=self.max_connections, ttl_dns_cache=300)
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers={'User-Agent': self.user_agent}
+            )
+
+    async def fetch_jobs(self, adapter, board, company_name, limit):
+        """Read a board through its adapter, counting successes and failures"""
+        try:
+            jobs = await adapter.fetch_jobs(self, board, company_name, limit)
+        except Exception:
+            self.failed += 1
+            raise
+        self.fetched += 1
+        return jobs
+
+    async def get_json(self, url, params=None):
+        return await self._request('GET', url, params=params)
+
+    async def post_json(self, url, payload):
+        return await self._request('POST', url, json=payload)
+
+    async def get_text(self, url, params=None):
+        return await self._request('GET', url, as_json=False, params=params)
+
+    async def _request(self, method, url, as_json=True, **kwargs):
+        if self.session is None:
+            await self.start()
+        try:
+            if self.rate_limiter:
+                async with self.rate_limiter.limit(url):
+                    return await self._send(method, url, as_json, **kwargs)
+            return await self._send(method, url, as_json, **kwargs)
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            raise AtsApiError(f"{method} {url} failed: {e}") from e
+
+    async def _send(self, method, url, as_json, **kwargs):
+        headers = {'Accept': 'application/json'} if as_json else None
+        async with self.session.request(method, url, headers=headers, **kwargs) as response:
+            if response.status != 200:
+                raise AtsApiError(f"{method} {url} returned status {response.status}")
+            if as_json:
+                return await response.json(content_type=None)
+            return await response.text(errors='replace')
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
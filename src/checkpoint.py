@@ -0,0 +1,64 @@
+# Crash-safe checkpoint journal for long enrichment runs
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+
+DEFAULT_JOURNAL_DIR = Path(__file__).parent.parent / "output"
+
+class CheckpointJournal:
+    """Append-only JSONL journal with one line per completed company, flushed to disk as it is written"""
+
+    def __init__(self, path, resume=False):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # key -> latest entry; a fresh run starts an empty journal
+        self.entries = self._load() if resume else {}
+        self.file = open(self.path, 'a' if resume else 'w', encoding='utf-8')
+        if resume and self.entries:
+            print(f"Resuming from {self.path}: {len(self.entries)} companies already completed")
+
+    def _load(self):
+        """Read all complete lines, cutting off a line left half-written by a crash"""
+        if not self.path.exists():
+            return {}
+
+        data = self.path.read_bytes()
+        complete = data[:data.rfind(b'\n') + 1]
+        if len(complete) < len(data):
+            with open(self.path, 'r+b') as f:
+                f.truncate(len(complete))
+
+        entries = {}
+        for line in complete.decode('utf-8', errors='replace').splitlines():
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            entries[entry['key']] = entry
+        return entries
+
+    def is_done(self, key):
+        """Check if key was completed by this or an earlier run"""
+        return key in self.entries
+
+    def get(self, key):
+        """Return the latest entry for key, or None"""
+        return self.entries.get(key)
+
+    def record(self, key, **data):
+        """Append a completed entry and make sure it reaches the disk before returning"""
+        entry = {'key': key, 'completed_at': datetime.now().isoformat(timespec='seconds'), **data}
+        self.file.write(json.dumps(entry, ensure_ascii=False, default=str) + '\n')
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.entries[key] = entry
+        return entry
+
+    def __len__(self):
+        return len(self.entries)
+
+    def close(self):
+        """Close the journal file"""
+        if not self.file.closed:
+            self.file.close()
@@ -7,77 +7,43 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-def format_existing_data():
-    """Convert existing data to the exact format requested"""
+from output_writers import OutputWriter
+from data_stats import OUTPUT_COLUMNS, CoverageStats, normalize_columns, read_chunks
+
+def format_existing_data(output_format="excel", input_file=None, chunksize=100000):
+    """Convert existing data to the exact format requested (returns the first chunk when reading in chunks)"""
     
     try:
-        # Read the existing enriched data
-        input_file = project_root / "output" / "Data_enriched_final.xlsx"
-        df = pd.read_excel(input_file, sheet_name='Data')
-        print(f"Loaded {len(df)} companies from existing data")
+        # Read the existing enriched data; CSV, JSONL and Parquet inputs are processed a chunk at a time
+        input_file = Path(input_file) if input_file else project_root / "output" / "Data_enriched_final.xlsx"
         
         # Define the exact columns in the requested order
-        target_columns = [
-            'Company Name', 'Company Description', 'Website URL', 'Linkedin URL', 
-            'Careers Page URL', 'Job listings page URL', 'job post1 URL', 'job post1 title',
-            'job post2 URL', 'job post2 title', 'job post3 URL', 'job post3 title'
-        ]
-        
-        # Create new dataframe with exact columns needed
-        df_formatted = pd.DataFrame()
-        
-        for col in target_columns:
-            if col in df.columns:
-                df_formatted[col] = df[col]
-            else:
-                # Handle missing columns
-                if col == 'Company Description' and 'Company Description' in df.columns:
-                    df_formatted[col] = df['Company Description']
-                elif col == 'Job listings page URL' and 'Jobs Listings Page URL' in df.columns:
-                    df_formatted[col] = df['Jobs Listings Page URL']
-                else:
-                    df_formatted[col] = ''
-        
-        # Clean up the data
-        df_formatted = df_formatted.fillna('')
-        
-        # Replace 'nan' strings with empty strings
-        for col in df_formatted.columns:
-            df_formatted[col] = df_formatted[col].astype(str).replace('nan', '')
-        
-        # Save to new file
-        output_file = project_root / "output" / "Data_formatted_final.xlsx"
-        df_formatted.to_excel(output_file, index=False)
+        target_columns = OUTPUT_COLUMNS
+        
+        stats = CoverageStats()
+        df_formatted = None
+        with OutputWriter(project_root / "output" / "Data_formatted_final", output_format) as writer:
+            output_rows = writer.table('Data', target_columns)
+            for chunk in read_chunks(input_file, chunksize, sheet_name='Data'):
+                # Keep the target columns (resolving old column names), with NaN as empty strings
+                chunk_formatted = normalize_columns(chunk, target_columns)
+                output_rows.write_dataframe(chunk_formatted)
+                stats.add(chunk_formatted)
+                if df_formatted is None:
+                    df_formatted = chunk_formatted
+        output_file = writer.path
+        coverage = stats.result()
+        print(f"Loaded {coverage['companies']} companies from existing data")
         
         print(f"\n" + "="*60)
         print("DATA FORMATTING COMPLETED")
         print("="*60)
-        print(f"📊 Total companies: {len(df_formatted)}")
-        
-        # Count companies with data
-        companies_with_urls = 0
-        companies_with_jobs = 0
-        
-        for idx in range(len(df_formatted)):
-            has_urls = any([
-                df_formatted.iloc[idx]['Website URL'] != '',
-                df_formatted.iloc[idx]['Linkedin URL'] != '',
-                df_formatted.iloc[idx]['Careers Page URL'] != '',
-                df_formatted.iloc[idx]['Job listings page URL'] != ''
-            ])
-            if has_urls:
-                companies_with_urls += 1
-            
-            has_jobs = any([
-                df_formatted.iloc[idx]['job post1 URL'] != '',
-                df_formatted.iloc[idx]['job post2 URL'] != '',
-                df_formatted.iloc[idx]['job post3 URL'] != ''
-            ])
-            if has_jobs:
-                companies_with_jobs += 1
-        
-        print(f"✅ Companies with URL data: {companies_with_urls}")
-        print(f"💼 Companies with job postings: {companies_with_jobs}")
+        print(f"📊 Total companies: {coverage['companies']}")
+        print(f"✅ Companies with URL data: {coverage['with_urls']}")
+        print(f"💼 Companies with job postings: {coverage['with_jobs']}")
+        print("📈 Fill rates: " + ", ".join(f"{column} {rate:.0%}" for column, rate in coverage['fill_rates'].items()
+                                           if column not in ('Company Name', 'Company Description')))
+        print("🏷️ Job listing platforms: " + ", ".join(f"{platform} {count}" for platform, count in coverage['platforms'].items()))
         print(f"💾 Output saved to: {output_file}")
         print("="*60)
         
@@ -0,0 +1,111 @@
+# Vectorized column normalization and coverage statistics for enrichment output
+from pathlib import Path
+import pandas as pd
+
+from url_classifier import default_classifier
+
+# Columns of the requested output format, in order
+OUTPUT_COLUMNS = [
+    'Company Name', 'Company Description', 'Website URL', 'Linkedin URL',
+    'Careers Page URL', 'Job listings page URL', 'job post1 URL', 'job post1 title',
+    'job post2 URL', 'job post2 title', 'job post3 URL', 'job post3 title'
+]
+
+# Output column -> other names it has in older exports
+COLUMN_ALIASES = {
+    'Job listings page URL': ['Jobs Listings Page URL'],
+}
+
+URL_COLUMNS = ['Website URL', 'Linkedin URL', 'Careers Page URL', 'Job listings page URL']
+JOB_URL_COLUMNS = ['job post1 URL', 'job post2 URL', 'job post3 URL']
+
+HOST_PATTERN = r'^[a-zA-Z][a-zA-Z0-9+.-]*://(?:www\.)?([^/:?#]+)'
+
+def normalize_columns(df, columns=OUTPUT_COLUMNS, aliases=COLUMN_ALIASES):
+    """Return df reduced to columns in order, with aliases resolved and missing/NaN values as empty strings"""
+    normalized = {}
+    for column in columns:
+        source = column if column in df.columns else next(
+            (alias for alias in aliases.get(column, []) if alias in df.columns), None)
+        if source is None:
+            normalized[column] = pd.Series('', index=df.index, dtype=object)
+        else:
+            values = df[source]
+            normalized[column] = values.where(values.notna(), '').astype(str)
+    return pd.DataFrame(normalized, index=df.index)
+
+def _filled(frame):
+    """Boolean frame of cells holding a value (neither NaN nor empty)"""
+    return frame.notna() & frame.astype(str).ne('')
+
+def platform_of_urls(urls):
+    """Map a Series of URLs to platform IDs ('other' for non-ATS URLs, 'none' for empty ones)"""
+    hosts = urls.astype(str).str.extract(HOST_PATTERN, expand=False).str.lower()
+    # Classify each distinct host once instead of every row
+    platforms = {}
+    for host in hosts.dropna().unique():
+        _, entry = default_classifier.lookup_domain(host)
+        platforms[host] = (entry[0] if entry else None) or 'other'
+    return hosts.map(platforms).fillna('none')
+
+class CoverageStats:
+    """Accumulate coverage counts, fill rates and a per-platform breakdown over one or more chunks"""
+
+    def __init__(self, url_columns=URL_COLUMNS, job_columns=JOB_URL_COLUMNS, platform_column='Job listings page URL'):
+        self.url_columns = url_columns
+        self.job_columns = job_columns
+        self.platform_column = platform_column
+        self.companies = 0
+        self.with_urls = 0
+        self.with_jobs = 0
+        self.columns = []  # In the order they were first seen, since Series.add sorts its index
+        self.filled = pd.Series(dtype='int64')
+        self.platforms = pd.Series(dtype='int64')
+
+    def add(self, df):
+        """Add a chunk of rows"""
+        filled = _filled(df)
+        self.companies += len(df)
+        url_columns = [column for column in self.url_columns if column in df.columns]
+        job_columns = [column for column in self.job_columns if column in df.columns]
+        self.with_urls += int(filled[url_columns].any(axis=1).sum()) if url_columns else 0
+        self.with_jobs += int(filled[job_columns].any(axis=1).sum()) if job_columns else 0
+        self.columns.extend(column for column in df.columns if column not in self.columns)
+        self.filled = self.filled.add(filled.sum(), fill_value=0)
+        if self.platform_column in df.columns:
+            counts = platform_of_urls(df[self.platform_column].where(filled[self.platform_column], '')).value_counts()
+            self.platforms = self.platforms.add(counts, fill_value=0)
+        return self
+
+    def result(self):
+        """Return the totals as a dict"""
+        return {
+            'companies': self.companies,
+            'with_urls': self.with_urls,
+            'with_jobs': self.with_jobs,
+            'fill_rates': {column: round(float(self.filled[column]) / self.companies, 3) if self.companies else 0.0
+                           for column in self.columns},
+            'platforms': {platform: int(count) for platform, count in self.platforms.sort_values(ascending=False).items()},
+        }
+
+def coverage_stats(data):
+    """Compute coverage stats for a DataFrame or an iterable of DataFrame chunks"""
+    stats = CoverageStats()
+    for chunk in ([data] if isinstance(data, pd.DataFrame) else data):
+        stats.add(chunk)
+    return stats.result()
+
+def read_chunks(path, chunksize=100000, sheet_name=0):
+    """Yield DataFrame chunks from a CSV, JSONL or Parquet file; Excel files come back whole"""
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix == '.csv':
+        yield from pd.read_csv(path, chunksize=chunksize, dtype=str, keep_default_na=False)
+    elif suffix == '.jsonl':
+        yield from pd.read_json(path, lines=True, chunksize=chunksize, dtype=False)
+    elif suffix == '.parquet':
+        import pyarrow.parquet
+        for batch in pyarrow.parquet.ParquetFile(path).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+    else:
+        yield pd.read_excel(path, sheet_name=sheet_name)
@@ -0,0 +1,97 @@
+# Batched in-page DOM extraction: one page.evaluate per page instead of an IPC round-trip per element
+import html
+
+# For each item selector (in order), the first spec.limit matching elements become records with one value
+# per field: the field's element is the item itself, its closest(field.closest) ancestor and/or its
+# querySelector(field.selector); the value is that element's attribute field.attr or its innerText.
+# Returns one list of records per item selector, stopping after the first non-empty one when spec.stopAtFirst
+EXTRACT_RECORDS_JS = """
+(spec) => {
+    const read = (item, field) => {
+        let element = item;
+        if (field.closest) element = element.closest(field.closest);
+        if (element && field.selector) element = element.querySelector(field.selector);
+        if (!element) return null;
+        return field.attr ? element.getAttribute(field.attr) : element.innerText;
+    };
+    const groups = [];
+    for (const selector of spec.items) {
+        let items;
+        try {
+            items = Array.from(document.querySelectorAll(selector)).slice(0, spec.limit);
+        } catch (e) {
+            items = [];  // Invalid selector for this engine
+        }
+        const records = items.map(item => {
+            const record = {};
+            for (const [name, field] of Object.entries(spec.fields)) record[name] = read(item, field);
+            if (!record.url && spec.onclickUrl) {
+                // Rows that open the posting from an onclick handler instead of a link
+                const match = /window\\.open\\('([^']+)'/.exec(item.getAttribute('onclick') || '');
+                if (match) record.url = match[1];
+            }
+            return record;
+        });
+        groups.push(records);
+        if (records.length && spec.stopAtFirst) break;
+    }
+    return groups;
+}
+"""
+
+# Anchors of a DuckDuckGo results page: those inside the first result container (the whole page when there
+# is none), plus the anchors of the first result-title selector that matches; text is joined from stripped
+# text nodes like the SERP parser does
+SERP_ANCHORS_JS = """
+(titleSelectors) => {
+    const container = document.querySelector("[data-testid='mainline'], ol.react-results--main, #links") || document;
+    const inContainer = new Set(container.querySelectorAll('a[href]'));
+    let titles = new Set();
+    for (const selector of titleSelectors) {
+        titles = new Set(document.querySelectorAll(selector));
+        if (titles.size) break;
+    }
+    return [...new Set([...inContainer, ...titles])].map(anchor => {
+        const parts = [];
+        const walker = document.createTreeWalker(anchor, NodeFilter.SHOW_TEXT);
+        while (walker.nextNode()) parts.push(walker.currentNode.nodeValue.trim());
+        return {
+            href: anchor.getAttribute('href') || '',
+            text: parts.join(''),
+            title: anchor.getAttribute('title') || '',
+            inContainer: inContainer.has(anchor),
+            resultTitle: titles.has(anchor),
+        };
+    });
+}
+"""
+
+# Result-title anchors, tried in order like serp_parser.RESULT_TITLE_XPATHS
+SERP_TITLE_SELECTORS = ['a[data-testid="result-title-a"]', 'a.result__a', 'h2.result__title a', '.results .result a']
+
+def field(selector=None, attr=None, closest=None):
+    """Describe where a record value comes from, relative to the item element"""
+    return {'selector': selector, 'attr': attr, 'closest': closest}
+
+async def extract_record_groups(page, items, fields, limit, stop_at_first=True, onclick_url=False):
+    """Return one list of {field: value} records per item selector, read in a single evaluation"""
+    spec = {'items': list(items), 'fields': fields, 'limit': limit, 'stopAtFirst': stop_at_first,
+            'onclickUrl': onclick_url}
+    return await page.evaluate(EXTRACT_RECORDS_JS, spec)
+
+async def extract_records(page, items, fields, limit, onclick_url=False):
+    """Return the records of the first item selector that matches anything"""
+    groups = await extract_record_groups(page, items, fields, limit, stop_at_first=True, onclick_url=onclick_url)
+    return next((records for records in groups if records), [])
+
+async def extract_serp_html(page):
+    """Collect the results page anchors in one evaluation and return them as a compact HTML document"""
+    anchors = await page.evaluate(SERP_ANCHORS_JS, SERP_TITLE_SELECTORS)
+    # The SERP parser reads this like the full page: container anchors in #links, result titles marked as such
+    container, outside = [], []
+    for anchor in anchors:
+        testid = ' data-testid="result-title-a"' if anchor['resultTitle'] else ''
+        markup = (f'<a href="{html.escape(anchor["href"])}" title="{html.escape(anchor["title"])}"{testid}>'
+                  f'{html.escape(anchor["text"])}</a>')
+        (container if anchor['inContainer'] else outside).append(markup)
+    return f'<html><body><div id="links">{"".join(container)}</div>{"".join(outside)}</body></html>'
@@ -9,6 +9,10 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 from scrapper import BrowserManager
+from query_planner import DiscoveryPlanner
+from query_compiler import QueryCompiler
+from checkpoint import CheckpointJournal, DEFAULT_JOURNAL_DIR
+from output_writers import OutputWriter
 
 # Read the Excel file
 data_file = project_root / "data" / "Data.xlsx"
@@ -51,115 +55,74 @@ def extract_industry_keywords(description):
     
     return keywords[:2]  # Return max 2 keywords to keep queries focused
 
-async def process_companies():
+async def process_companies(search_backend="http", resume=False, output_format="excel"):
     # Initialize browser manager once with headless mode
-    browser_manager = BrowserManager(max_concurrent_tabs=2, headless=True)
+    browser_manager = BrowserManager(max_concurrent_tabs=2, headless=True, search_backend=search_backend)
+    planner = DiscoveryPlanner(window=browser_manager.max_concurrent_tabs, compiler=QueryCompiler())
+    # Each company's URLs are journaled as soon as they are found, so a crashed run can be resumed
+    journal = CheckpointJournal(DEFAULT_JOURNAL_DIR / "enricher_journal.jsonl", resume=resume)
+    # Each row is written out as soon as its company is done
+    writer = OutputWriter(project_root / "output" / "Data_enriched", output_format)
+    output_rows = writer.table('Data', df.columns)
     try:
         await browser_manager.initialize()
         print("Browser initialized successfully!")
         
         count = 0
         for idx, row in df.iterrows():
-            print("searching for ",str(row['Company Name']))
             company = str(row['Company Name'])
             desc = str(row['Company Description'])
             
-            # Create DuckDuckGo-optimized search queries
-            search_queries = [
-                # Simple company name search for official website
-                f'{company}',
-                
-                # LinkedIn company page search
-                f'{company} linkedin company',
-                
-                # Careers page searches - multiple variations
-                f'{company} careers',
-                f'{company} jobs',
-                f'{company} careers page',
-                f'{company} employment opportunities',
-                
-                # Job platform specific searches (more direct)
-                f'{company} lever jobs',
-                f'{company} greenhouse careers',
-                f'{company} zoho recruit',
-                f'{company} smartrecruiters',
-                f'{company} workday jobs',
-                
-                # Alternative job listing searches
-                f'{company} current openings',
-                f'{company} job openings',
-                f'{company} hiring now'
-            ]
-            
-            # Perform all searches using the enhanced browser with company context
+            # Search incrementally, most productive queries first, until every column has a confident answer
             try:
-                all_links = await browser_manager.search_multiple(search_queries, company)
-
-                # Links are already deduplicated and filtered by BeautifulSoup
-                links = list(set(all_links))
+                if journal.is_done(company):
+                    continue  # Finished by an earlier run; written from the journal below
+                print("searching for ",company)
                 
-                # Assign links to columns with DuckDuckGo-optimized categorization
-                for link in links:
-                    link_lower = link.lower()
-                    
-                    # Priority 1: Job listing platforms (highest priority) - more flexible matching
-                    job_platforms = ['lever.co', 'greenhouse.io', 'zohorecruit.com', 'zoho.recruit', 'smartrecruiters.com', 'workday.com', 'bamboohr.com', 'jobvite.com', 'icims.com']
-                    if any(platform in link_lower for platform in job_platforms) and not df.at[idx, 'Jobs Listings Page URL']:
-                        df.at[idx, 'Jobs Listings Page URL'] = link
-                        continue
-                    
-                    # Priority 2: LinkedIn company pages - more flexible matching
-                    if ('linkedin.com' in link_lower and ('company' in link_lower or '/in/' in link_lower)) and not df.at[idx, 'Linkedin URL']:
-                        df.at[idx, 'Linkedin URL'] = link
-                        continue
-                    
-                    # Priority 3: Careers pages - broader matching
-                    career_keywords = ['careers', 'jobs', 'employment', 'opportunities', 'hiring', 'openings', 'join-us', 'work-with-us']
-                    if any(keyword in link_lower for keyword in career_keywords) and not df.at[idx, 'Careers Page URL']:
-                        # Exclude generic job sites but be less restrictive
-                        excluded_job_sites = ['glassdoor.com', 'indeed.com', 'monster.com', 'ziprecruiter.com', 'simplyhired.com']
-                        if not any(site in link_lower for site in excluded_job_sites):
-                            # Also exclude if it's already categorized as a job platform
-                            if not any(platform in link_lower for platform in job_platforms):
-                                df.at[idx, 'Careers Page URL'] = link
-                                continue
-                    
-                    # Priority 4: Company websites (official domains) - more flexible
-                    if not df.at[idx, 'Website URL']:
-                        # Exclude social media and generic sites
-                        excluded_domains = ['linkedin.com', 'facebook.com', 'twitter.com', 'youtube.com', 'instagram.com', 
-                                          'glassdoor.com', 'indeed.com', 'monster.com', 'ziprecruiter.com', 'wikipedia.org',
-                                          'crunchbase.com', 'bloomberg.com', 'reuters.com']
-                        
-                        if not any(excluded in link_lower for excluded in excluded_domains):
-                            # More flexible company name matching
-                            company_clean = company.lower().replace(' ', '').replace('-', '').replace('_', '').replace('.', '')[:8]
-                            link_clean = link_lower.replace('https://', '').replace('http://', '').replace('www.', '').replace('-', '').replace('_', '')
-                            
-                            # Check if company name appears in domain or if it's a .com/.org domain
-                            if company_clean in link_clean or any(tld in link for tld in ['.com', '.org', '.net']) and len(link_clean.split('/')[0]) < 50:
-                                df.at[idx, 'Website URL'] = link
+                # Links come back already filtered, scored and categorized from one page load per query
+                categorized_links = await planner.discover(browser_manager, company)
+                best_urls = browser_manager.best_urls(categorized_links)
+                
+                # Best link of each category for its column
+                journal.record(company, updates={
+                    'Jobs Listings Page URL': best_urls['jobs_platform'],
+                    'Linkedin URL': best_urls['linkedin'],
+                    'Careers Page URL': best_urls['careers'],
+                    'Website URL': best_urls['website'],
+                })
                         
             except Exception as e:
                 print(f"Error processing {company}: {e}")
+            finally:
+                # Fill the columns from the journal, including companies finished by earlier runs
+                entry = journal.get(company)
+                for column, value in (entry['updates'] if entry else {}).items():
+                    df.at[idx, column] = value
+                output_rows.write_row(df.loc[idx])
             
             count += 1
             # Process all companies (remove the break to handle all ~150 companies)
             # if count >= 5:
             #     break
                 
+        planner_stats = planner.stats()
+        print(f"Discovery planner issued {planner_stats['issued']} of {planner_stats['planned']} planned searches "
+              f"({planner_stats['saved']} saved: {planner_stats['merged']} by merging queries, "
+              f"{planner_stats['stopped_early']} by stopping early)")
+                
     finally:
         # Always close the browser when done
+        journal.close()
         await browser_manager.close()
         print("Browser closed successfully!")
-    
-    # Save the enriched data after processing
-    try:
-        output_file = project_root / "output" / "Data_enriched.xlsx"
-        df.to_excel(output_file, index=False)
-        print(f"Data enrichment completed successfully! Output saved to {output_file}")
-    except Exception as e:
-        print(f"Error saving enriched data: {e}")
+        
+        # Save the rows written so far, even after a crash
+        try:
+            writer.close()
+            print(f"Data enrichment completed successfully! Output saved to {writer.path}")
+        except Exception as e:
+            print(f"Error saving enriched data: {e}")
 
 # Run the async function
-asyncio.run(process_companies())
+if __name__ == "__main__":
+    asyncio.run(process_companies())
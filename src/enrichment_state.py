@@ -0,0 +1,102 @@
+# Cross-run enrichment state for incremental re-enrichment
+import hashlib
+import json
+import sqlite3
+import time
+from pathlib import Path
+
+DEFAULT_STATE_PATH = Path(__file__).parent.parent / "output" / "enrichment_state.db"
+
+DAY = 24 * 3600
+
+# Maximum age of each output field before it has to be verified again
+DEFAULT_FRESHNESS = {
+    'Website URL': 30 * DAY,
+    'Linkedin URL': 30 * DAY,
+    'Careers Page URL': 30 * DAY,
+    'Job listings page URL': 7 * DAY,
+    'job post1 URL': DAY, 'job post1 title': DAY,
+    'job post2 URL': DAY, 'job post2 title': DAY,
+    'job post3 URL': DAY, 'job post3 title': DAY,
+}
+
+class EnrichmentState:
+    """SQLite store of each company's input fingerprint, last output values and per-field verification times"""
+
+    def __init__(self, db_path=DEFAULT_STATE_PATH, freshness=DEFAULT_FRESHNESS):
+        self.db_path = str(db_path) if db_path else ':memory:'
+        self.freshness = freshness
+
+        if db_path:
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.db_path)
+        self.conn.execute(
+            """CREATE TABLE IF NOT EXISTS enrichment_state (
+                   key TEXT PRIMARY KEY,
+                   fingerprint TEXT NOT NULL,
+                   field_values TEXT NOT NULL,
+                   verified_at TEXT NOT NULL
+               )"""
+        )
+
+    @staticmethod
+    def make_key(company_name):
+        """Identify a company by its normalized name"""
+        return ' '.join(str(company_name).lower().split())
+
+    @staticmethod
+    def fingerprint(company_name, description):
+        """Hash the input columns that enrichment depends on; an edited row gets a new fingerprint"""
+        normalized = '|'.join(' '.join(str(value).split()) for value in (company_name, description))
+        return hashlib.sha1(normalized.encode('utf-8')).hexdigest()
+
+    def _load(self, key):
+        row = self.conn.execute(
+            "SELECT fingerprint, field_values, verified_at FROM enrichment_state WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        return row[0], json.loads(row[1]), json.loads(row[2])
+
+    def check(self, key, fingerprint, fields=None, now=None):
+        """Return (status, stale fields) for a company: status is 'new', 'changed', 'stale' or 'fresh'"""
+        fields = list(fields or self.freshness)
+        stored = self._load(key)
+        if stored is None:
+            return 'new', fields
+        if stored[0] != fingerprint:
+            return 'changed', fields
+
+        now = now or time.time()
+        verified_at = stored[2]
+        stale = [field for field in fields
+                 if now - verified_at.get(field, 0) > self.freshness.get(field, 0)]
+        return ('stale' if stale else 'fresh'), stale
+
+    def values(self, key):
+        """Return the last stored output values for a company"""
+        stored = self._load(key)
+        return stored[1] if stored else {}
+
+    def update(self, key, fingerprint, values, verified_fields, now=None):
+        """Store new output values and mark verified_fields as checked now"""
+        now = now or time.time()
+        stored = self._load(key)
+        if stored is None or stored[0] != fingerprint:
+            field_values, verified_at = {}, {}  # An edited row starts over
+        else:
+            _, field_values, verified_at = stored
+
+        field_values.update(values)
+        for field in verified_fields:
+            verified_at[field] = now
+
+        self.conn.execute(
+            "INSERT OR REPLACE INTO enrichment_state (key, fingerprint, field_values, verified_at) VALUES (?, ?, ?, ?)",
+            (key, fingerprint, json.dumps(field_values, default=str), json.dumps(verified_at))
+        )
+        self.conn.commit()
+
+    def close(self):
+        """Close the database connection"""
+        self.conn.close()
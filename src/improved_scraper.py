@@ -5,7 +5,7 @@ import pandas as pd
 import asyncio
 from datetime import datetime
 import re
-from urllib.parse import urlparse, urljoin
+from urllib.parse import urlparse
 import sys
 from pathlib import Path
 
@@ -15,6 +15,23 @@ sys.path.insert(0, str(project_root))
 
 from scrapper import BrowserManager
 from job_scraper import JobScraper
+from query_planner import DiscoveryPlanner
+from query_compiler import QueryCompiler
+from page_readiness import WaitForAnySelector
+from pipeline import Pipeline
+from checkpoint import CheckpointJournal, DEFAULT_JOURNAL_DIR
+from enrichment_state import EnrichmentState, DEFAULT_STATE_PATH
+from company_priority import CompanyPrioritizer
+from output_writers import OutputWriter, OrderedRowWriter
+from url_canonical import canonicalize_url, url_key
+from dom_extract import extract_record_groups, field
+from data_stats import normalize_columns, coverage_stats
+
+# Output columns filled by URL discovery and by job scraping
+DISCOVERY_FIELDS = ['Website URL', 'Linkedin URL', 'Careers Page URL', 'Job listings page URL']
+JOB_FIELDS = [f'job post{i} {kind}' for i in range(1, 4) for kind in ('URL', 'title')]
+# Columns of the output file, in order
+FINAL_COLUMNS = ['Company Name', 'Company Description'] + DISCOVERY_FIELDS + JOB_FIELDS
 
 def extract_industry_keywords(description):
     """Extract relevant industry keywords from company description"""
@@ -46,10 +63,6 @@ async def scrape_individual_job_details(browser_manager, job_url, company_name):
         if not job_url or job_url == 'nan' or pd.isna(job_url):
             return None, None
             
-        page = await browser_manager._get_tab()
-        await page.goto(job_url, timeout=30000)
-        await page.wait_for_load_state('networkidle', timeout=10000)
-        
         # Try different selectors for job titles
         title_selectors = [
             'h1', '.job-title', '.posting-headline', '.job-header h1',
@@ -57,19 +70,22 @@ async def scrape_individual_job_details(browser_manager, job_url, company_name):
             '.job-name', '.position-title', '.role-title'
         ]
         
-        job_title = None
-        for selector in title_selectors:
+        # The posting is ready as soon as any title element is rendered
+        page = await browser_manager._get_tab()
+        try:
+            await browser_manager.navigate(page, job_url, WaitForAnySelector(title_selectors))
+            
+            # First match of every selector in one evaluation; the first non-empty title wins
+            job_title = None
             try:
-                element = await page.query_selector(selector)
-                if element:
-                    title_text = await element.inner_text()
-                    if title_text and len(title_text.strip()) > 0:
-                        job_title = title_text.strip()
-                        break
-            except:
-                continue
-        
-        await browser_manager._return_tab(page)
+                groups = await extract_record_groups(page, title_selectors, {'title': field()}, 1, stop_at_first=False)
+                job_title = next((records[0]['title'].strip() for records in groups
+                                  if records and records[0]['title'] and records[0]['title'].strip()), None)
+            except Exception:
+                pass
+        finally:
+            # Back to the pool even when navigation fails, so timeouts do not leak tabs
+            await browser_manager._return_tab(page)
         return job_url, job_title or "Job Title Not Found"
         
     except Exception as e:
@@ -90,80 +106,193 @@ async def process_company_jobs(browser_manager, job_scraper, company_name, jobs_
     for url, url_type in urls_to_try:
         try:
             scraped_jobs = await job_scraper.scrape_jobs_from_url(company_name, url, url_type)
-            jobs.extend(scraped_jobs)
+            # The jobs and careers pages often list the same postings
+            jobs = job_scraper.dedupe_jobs(jobs + scraped_jobs)
             if len(jobs) >= 3:
                 break
         except Exception as e:
             print(f"Error scraping {url_type} for {company_name}: {e}")
             continue
     
-    # If we still don't have jobs, try a more aggressive search
+    # If we still don't have jobs, try a more aggressive search (only with slots left in the job budget)
     if len(jobs) == 0 and (jobs_url or careers_url):
-        # Try to find job links on the careers page
-        try:
-            search_url = jobs_url or careers_url
-            job_links = await find_job_links_on_page(browser_manager, search_url, company_name)
-            
-            # Get details for up to 3 job links
-            for job_link in job_links[:3]:
-                job_url, job_title = await scrape_individual_job_details(browser_manager, job_link, company_name)
-                if job_url:
-                    jobs.append({
-                        'company_name': company_name,
-                        'job_title': job_title,
-                        'job_location': 'N/A',
-                        'job_url': job_url,
-                        'posting_date': 'N/A',
-                        'job_description': 'N/A',
-                        'platform': 'Custom'
-                    })
-        except Exception as e:
-            print(f"Error in aggressive job search for {company_name}: {e}")
+        async with job_scraper.budget.slots(company_name) as reservation:
+            if reservation.slots:
+                jobs = reservation.use(await find_jobs_aggressively(browser_manager, company_name, jobs_url or careers_url,
+                                                                    reservation.slots))
     
     return jobs[:3]  # Return max 3 jobs
 
+async def find_jobs_aggressively(browser_manager, company_name, search_url, max_jobs):
+    """Find job links on a careers page and read the title of up to max_jobs postings"""
+    jobs = []
+    try:
+        job_links = await find_job_links_on_page(browser_manager, search_url, company_name)
+        
+        for job_link in job_links[:max_jobs]:
+            job_url, job_title = await scrape_individual_job_details(browser_manager, job_link, company_name)
+            if job_url:
+                jobs.append({
+                    'company_name': company_name,
+                    'job_title': job_title,
+                    'job_location': 'N/A',
+                    'job_url': job_url,
+                    'posting_date': 'N/A',
+                    'job_description': 'N/A',
+                    'platform': 'Custom'
+                })
+    except Exception as e:
+        print(f"Error in aggressive job search for {company_name}: {e}")
+    
+    return jobs
+
 async def find_job_links_on_page(browser_manager, url, company_name):
     """Find job posting links on a careers page"""
     try:
+        # Careers pages vary too much for a selector, so wait for the DOM to settle
         page = await browser_manager._get_tab()
-        await page.goto(url, timeout=30000)
-        await page.wait_for_load_state('networkidle', timeout=10000)
-        
-        # Look for links that might be job postings
-        job_selectors = [
-            'a[href*="job"]', 'a[href*="position"]', 'a[href*="opening"]',
-            'a[href*="career"]', 'a[href*="apply"]', '.job-link a',
-            '.position-link a', '.opening-link a', '.job-title a'
-        ]
-        
-        job_links = []
-        for selector in job_selectors:
-            try:
-                elements = await page.query_selector_all(selector)
-                for element in elements[:5]:  # Check first 5 matches per selector
-                    href = await element.get_attribute('href')
+        try:
+            await browser_manager.navigate(page, url)
+            
+            # Look for links that might be job postings
+            job_selectors = [
+                'a[href*="job"]', 'a[href*="position"]', 'a[href*="opening"]',
+                'a[href*="career"]', 'a[href*="apply"]', '.job-link a',
+                '.position-link a', '.opening-link a', '.job-title a'
+            ]
+            
+            # First 5 matches per selector, all read in one evaluation
+            groups = await extract_record_groups(page, job_selectors, {'url': field(attr='href')}, 5, stop_at_first=False)
+            
+            job_links = []
+            seen = set()
+            for records in groups:
+                for record in records:
+                    href = record['url']
                     if href:
-                        # Convert relative URLs to absolute
+                        # Absolute, canonical URLs; mailto:/javascript: links are skipped
+                        href = canonicalize_url(href, url)
                         if not href.startswith('http'):
-                            href = urljoin(url, href)
-                        if href not in job_links:
+                            continue
+                        if url_key(href) not in seen:
+                            seen.add(url_key(href))
                             job_links.append(href)
                         if len(job_links) >= 10:  # Limit to 10 potential job links
                             break
-            except:
-                continue
             
-            if len(job_links) >= 10:
-                break
+                if len(job_links) >= 10:
+                    break
+        finally:
+            # Back to the pool even when navigation fails, so timeouts do not leak tabs
+            await browser_manager._return_tab(page)
         
-        await browser_manager._return_tab(page)
         return job_links[:5]  # Return top 5 job links
         
     except Exception as e:
         print(f"Error finding job links on {url}: {e}")
         return []
 
-async def main():
+async def discover_company(browser_manager, planner, row, position, total, rediscover=None):
+    """Discovery stage: find a company's URLs unless already populated (or as rediscover says); return (row, column values found)"""
+    company_name = str(row['Company Name'])
+    updates = {}
+    
+    print(f"\n--- Processing Company {position}/{total}: {company_name} ---")
+    
+    # Phase 1: URL Discovery (if not already populated)
+    if rediscover is None:
+        rediscover = not row['Website URL'] or pd.isna(row['Website URL']) or row['Website URL'] == ''
+    if rediscover:
+        print(f"Discovering company URLs for {company_name}...")
+        
+        try:
+            # Most productive queries first, stopping once every slot has a confident answer
+            categorized_links = await planner.discover(browser_manager, company_name)
+            best_urls = browser_manager.best_urls(categorized_links)
+            
+            updates['Website URL'] = best_urls['website']
+            updates['Linkedin URL'] = best_urls['linkedin']
+            updates['Careers Page URL'] = best_urls['careers']
+            updates['Job listings page URL'] = best_urls['jobs_platform']
+            
+            print(f"Found URLs for {company_name} - Website: {bool(best_urls['website'])}, LinkedIn: {bool(best_urls['linkedin'])}, "
+                  f"Careers: {bool(best_urls['careers'])}, Jobs: {bool(best_urls['jobs_platform'])}")
+            
+        except Exception as e:
+            print(f"Error during URL discovery for {company_name}: {e}")
+    
+    return row, updates
+
+async def scrape_company(browser_manager, job_scraper, row, updates, rescrape=None):
+    """Scraping stage: collect up to 3 job postings for a company (unless it has some, or as rescrape says); return all column values to update"""
+    company_name = str(row['Company Name'])
+    updates = dict(updates)
+    
+    # Phase 2: Job Scraping
+    current_jobs_url = updates.get('Job listings page URL', row['Job listings page URL'])
+    current_careers_url = updates.get('Careers Page URL', row['Careers Page URL'])
+    
+    # Check if we already have job data
+    if rescrape is None:
+        rescrape = not any(
+            row[column] and not pd.isna(row[column]) and row[column] != ''
+            for column in ['job post1 URL', 'job post2 URL', 'job post3 URL']
+        )
+    
+    if rescrape and (current_jobs_url or current_careers_url) and job_scraper.has_reached_limit():
+        # The job budget is spent: no careers page visits for the remaining companies
+        job_scraper.budget.skip()
+        print(f"Job limit reached, skipping job scraping for {company_name}")
+    elif rescrape and (current_jobs_url or current_careers_url):
+        print(f"Scraping job postings for {company_name}...")
+        try:
+            jobs = await process_company_jobs(browser_manager, job_scraper, company_name, current_jobs_url, current_careers_url)
+            
+            # Populate job data, clearing slots left over from an earlier run
+            updates.update({column: '' for column in JOB_FIELDS})
+            for i, job in enumerate(jobs[:3]):
+                updates[f'job post{i+1} URL'] = job.get('job_url', '')
+                updates[f'job post{i+1} title'] = job.get('job_title', '')
+            
+            print(f"Found {len(jobs)} job postings for {company_name}")
+            
+        except Exception as e:
+            print(f"Error during job scraping for {company_name}: {e}")
+    
+    return updates
+
+def plan_incremental(df, state, candidates, plans):
+    """Fill fresh values from the state store and plan the stages each row needs; return the rows to process"""
+    counts = {'new': 0, 'changed': 0, 'stale': 0, 'fresh': 0}
+    pending = []
+    
+    for idx in candidates:
+        name = df.at[idx, 'Company Name']
+        key = state.make_key(name)
+        status, stale_fields = state.check(key, state.fingerprint(name, df.at[idx, 'Company Description']))
+        counts[status] += 1
+        
+        if status in ('new', 'changed'):
+            plans[idx] = (True, True)
+            pending.append(idx)
+            continue
+        
+        for column, value in state.values(key).items():
+            df.at[idx, column] = value
+        
+        # New URLs may point at different job pages, so rediscovery implies rescraping
+        rediscover = any(field in DISCOVERY_FIELDS for field in stale_fields)
+        rescrape = rediscover or any(field in JOB_FIELDS for field in stale_fields)
+        if rediscover or rescrape:
+            plans[idx] = (rediscover, rescrape)
+            pending.append(idx)
+    
+    print(f"Incremental run: {counts['new']} new, {counts['changed']} changed, {counts['stale']} stale, "
+          f"{counts['fresh']} fresh companies skipped")
+    return pending
+
+async def main(search_backend="http", discovery_workers=4, scrape_workers=3, resume=False, incremental=False,
+               output_format="excel", prioritize=False):
     """Main function to create the exact format requested"""
     
     # Read the Excel file
@@ -179,183 +308,140 @@ async def main():
         return
 
     # Initialize new columns if they don't exist
-    required_columns = [
-        'Website URL', 'Linkedin URL', 'Careers Page URL', 'Job listings page URL',
-        'job post1 URL', 'job post1 title', 'job post2 URL', 'job post2 title', 
-        'job post3 URL', 'job post3 title'
-    ]
+    required_columns = DISCOVERY_FIELDS + JOB_FIELDS
     
     for col in required_columns:
         if col not in df.columns:
             df[col] = ''
 
     # Initialize browser manager and job scraper
-    browser_manager = BrowserManager(max_concurrent_tabs=2, headless=True)
-    job_scraper = JobScraper(browser_manager, max_concurrent_scrapes=1)
+    browser_manager = BrowserManager(max_concurrent_tabs=2, headless=True, search_backend=search_backend)
+    job_scraper = JobScraper(browser_manager, max_concurrent_scrapes=scrape_workers)
+    planner = DiscoveryPlanner(window=browser_manager.max_concurrent_tabs, compiler=QueryCompiler())
+    # Every finished company is written here at once, so a crashed run can be resumed
+    journal = CheckpointJournal(DEFAULT_JOURNAL_DIR / "improved_scraper_journal.jsonl", resume=resume)
+    # Jobs collected by an earlier run count toward the 200 job limit
+    job_scraper.total_jobs_scraped = sum(
+        1 for entry in journal.entries.values()
+        for column, value in entry['updates'].items() if column.startswith('job post') and column.endswith('URL') and value
+    )
+    max_companies = len(df)
+    # Incremental mode: what each row needs redone, from its fingerprint and per-field freshness
+    state = EnrichmentState() if incremental else None
+    plans = {}  # Row index -> (rediscover, rescrape); rows without a plan use the populated-column checks
+    # Prioritized mode: companies whose jobs are cheapest to collect go first, so the job budget is met sooner
+    history = None
+    if prioritize:
+        history = state or (EnrichmentState() if DEFAULT_STATE_PATH.exists() else None)
+    prioritizer = CompanyPrioritizer(max_per_company=job_scraper.max_jobs_per_company, history=history) if prioritize else None
+    # Rows are streamed out in input order as soon as every earlier company is finished
+    writer = OutputWriter(project_root / "output" / "Data_enriched_improved", output_format)
+    output_rows = OrderedRowWriter(writer.table('Data', FINAL_COLUMNS))
+    
+    async def discovery_stage(idx):
+        rediscover, _ = plans.get(idx, (None, None))
+        row, updates = await discover_company(browser_manager, planner, df.iloc[idx], idx + 1, max_companies, rediscover)
+        return idx, row, updates
+    
+    def scraping_priority(discovered):
+        _, row, updates = discovered
+        return prioritizer.score(str(row['Company Name']),
+                                 updates.get('Job listings page URL', row['Job listings page URL']),
+                                 updates.get('Careers Page URL', row['Careers Page URL']))
+    
+    async def scraping_stage(discovered):
+        idx, row, updates = discovered
+        _, rescrape = plans.get(idx, (None, None))
+        updates = await scrape_company(browser_manager, job_scraper, row, updates, rescrape)
+        journal.record(str(row['Company Name']), updates=updates)
+        for column, value in updates.items():
+            df.at[idx, column] = value
+        output_rows.add(idx, df.loc[idx])
+        if state:
+            # Only fields that were actually looked up count as verified
+            state.update(
+                state.make_key(row['Company Name']), state.fingerprint(row['Company Name'], row['Company Description']),
+                updates, [field for field in DISCOVERY_FIELDS + JOB_FIELDS if field in updates]
+            )
+        return updates
     
     try:
+        pending = [idx for idx in range(max_companies) if not journal.is_done(str(df.at[idx, 'Company Name']))]
+        if state:
+            pending = plan_incremental(df, state, pending, plans)
+        if prioritizer:
+            # Discovery starts with the companies whose known URLs and history promise the most jobs per page load
+            pending = prioritizer.order(pending, lambda idx: (str(df.at[idx, 'Company Name']),
+                                                              df.at[idx, 'Job listings page URL'], df.at[idx, 'Careers Page URL']))
+        
+        # Companies finished by an earlier run come from the journal and are written out right away
+        for idx in range(max_companies):
+            entry = journal.get(str(df.at[idx, 'Company Name']))
+            for column, value in (entry['updates'] if entry else {}).items():
+                df.at[idx, column] = value
+        queued = set(pending)
+        for idx in range(max_companies):
+            if idx not in queued:
+                output_rows.add(idx, df.loc[idx])
+        
         await browser_manager.initialize()
         print("Browser initialized successfully!")
         
-        # Process companies (limit to first 10 for demonstration)
-        max_companies = len(df)
-        print(f"Processing first {max_companies} companies...")
+        print(f"Processing {len(pending)} of {max_companies} companies ({discovery_workers} discovery / {scrape_workers} scraping workers)...")
+        
+        # Searching and scraping run in separate worker pools, so a slow careers page never stalls discovery;
+        # the rate limiter, not the pipeline, keeps the load on each host polite
+        pipeline = Pipeline()
+        pipeline.add_stage('discovery', discovery_stage, workers=discovery_workers)
+        if prioritizer:
+            # Discovery runs ahead and the scraping workers take the most promising discovered company next
+            pipeline.add_stage('scraping', scraping_stage, workers=scrape_workers, queue_size=len(pending),
+                               priority=scraping_priority)
+        else:
+            pipeline.add_stage('scraping', scraping_stage, workers=scrape_workers)
+        await pipeline.run(pending)
+        pipeline.print_stats()
         
+        # Companies that failed in the pipeline keep their input values
         for idx in range(max_companies):
-            row = df.iloc[idx]
-            company_name = str(row['Company Name'])
-            company_desc = str(row['Company Description'])
-            
-            print(f"\n--- Processing Company {idx+1}/{max_companies}: {company_name} ---")
-            
-            # Phase 1: URL Discovery (if not already populated)
-            if not row['Website URL'] or pd.isna(row['Website URL']) or row['Website URL'] == '':
-                print("Discovering company URLs...")
-                
-                # Create search queries
-                search_queries = [
-                    f'{company_name}',
-                    f'{company_name} official website',
-                    f'{company_name} linkedin company',
-                    f'{company_name} careers',
-                    f'{company_name} jobs',
-                    f'{company_name} careers page',
-                    f'{company_name} job openings'
-                ]
-                
-                try:
-                    all_links = await browser_manager.search_multiple(search_queries, company_name)
-                    
-                    # Categorize links
-                    website_url = ''
-                    linkedin_url = ''
-                    careers_url = ''
-                    jobs_url = ''
-                    
-                    for link in all_links:
-                        link_lower = link.lower()
-                        
-                        # Job platforms (highest priority)
-                        job_platforms = ['lever.co', 'greenhouse.io', 'zohorecruit.com', 'zoho.recruit', 
-                                       'smartrecruiters.com', 'workday.com', 'bamboohr.com', 'jobvite.com', 
-                                       'icims.com', 'teamtailor.com', 'personio.com']
-                        if any(platform in link_lower for platform in job_platforms) and not jobs_url:
-                            jobs_url = link
-                            continue
-                        
-                        # LinkedIn
-                        if 'linkedin.com' in link_lower and 'company' in link_lower and not linkedin_url:
-                            linkedin_url = link
-                            continue
-                        
-                        # Careers pages
-                        career_keywords = ['careers', 'jobs', 'employment', 'opportunities', 'hiring', 'openings']
-                        if any(keyword in link_lower for keyword in career_keywords) and not careers_url:
-                            excluded_sites = ['glassdoor.com', 'indeed.com', 'monster.com', 'ziprecruiter.com']
-                            if not any(site in link_lower for site in excluded_sites):
-                                careers_url = link
-                                continue
-                        
-                        # Company website
-                        if not website_url:
-                            excluded_domains = ['linkedin.com', 'facebook.com', 'twitter.com', 'youtube.com', 
-                                              'glassdoor.com', 'indeed.com', 'wikipedia.org', 'crunchbase.com']
-                            if not any(excluded in link_lower for excluded in excluded_domains):
-                                website_url = link
-                    
-                    # Update DataFrame
-                    df.at[idx, 'Website URL'] = website_url
-                    df.at[idx, 'Linkedin URL'] = linkedin_url
-                    df.at[idx, 'Careers Page URL'] = careers_url
-                    df.at[idx, 'Job listings page URL'] = jobs_url
-                    
-                    print(f"Found URLs - Website: {bool(website_url)}, LinkedIn: {bool(linkedin_url)}, Careers: {bool(careers_url)}, Jobs: {bool(jobs_url)}")
-                    
-                except Exception as e:
-                    print(f"Error during URL discovery: {e}")
-            
-            # Phase 2: Job Scraping
-            current_jobs_url = df.at[idx, 'Job listings page URL']
-            current_careers_url = df.at[idx, 'Careers Page URL']
-            
-            # Check if we already have job data
-            has_existing_jobs = any([
-                df.at[idx, 'job post1 URL'] and not pd.isna(df.at[idx, 'job post1 URL']) and df.at[idx, 'job post1 URL'] != '',
-                df.at[idx, 'job post2 URL'] and not pd.isna(df.at[idx, 'job post2 URL']) and df.at[idx, 'job post2 URL'] != '',
-                df.at[idx, 'job post3 URL'] and not pd.isna(df.at[idx, 'job post3 URL']) and df.at[idx, 'job post3 URL'] != ''
-            ])
-            
-            if not has_existing_jobs and (current_jobs_url or current_careers_url):
-                print("Scraping job postings...")
-                try:
-                    jobs = await process_company_jobs(browser_manager, job_scraper, company_name, current_jobs_url, current_careers_url)
-                    
-                    # Populate job data
-                    for i, job in enumerate(jobs[:3]):
-                        df.at[idx, f'job post{i+1} URL'] = job.get('job_url', '')
-                        df.at[idx, f'job post{i+1} title'] = job.get('job_title', '')
-                    
-                    print(f"Found {len(jobs)} job postings")
-                    
-                except Exception as e:
-                    print(f"Error during job scraping: {e}")
-            
-            # Small delay between companies
-            await asyncio.sleep(2)
+            output_rows.add(idx, df.loc[idx])
+        
+        planner_stats = planner.stats()
+        print(f"Discovery planner issued {planner_stats['issued']} of {planner_stats['planned']} planned searches "
+              f"({planner_stats['saved']} saved: {planner_stats['merged']} by merging queries, "
+              f"{planner_stats['stopped_early']} by stopping early)")
+        if prioritizer:
+            print("Prioritized companies by expected jobs per page load: "
+                  + ", ".join(f"{kind} {count}" for kind, count in prioritizer.stats().items()))
+        budget_stats = job_scraper.budget.stats()
+        print(f"Job budget: {budget_stats['jobs']}/{budget_stats['max_total']} jobs, {budget_stats['skipped']} scrapes skipped "
+              f"(~{budget_stats['time_saved']}s saved)")
         
     finally:
+        # Closing saves whatever rows are complete, even after a crash
+        writer.close()
+        journal.close()
+        if state:
+            state.close()
+        elif history:
+            history.close()
         await job_scraper.cleanup_scraper_tabs()
         await browser_manager.close()
         print("Browser closed successfully!")
     
-    # Save the results
-    output_file = project_root / "output" / "Data_enriched_improved.xlsx"
-    
-    # Clean up the data - remove extra columns and ensure proper format
-    final_columns = [
-        'Company Name', 'Company Description', 'Website URL', 'Linkedin URL', 
-        'Careers Page URL', 'Job listings page URL', 'job post1 URL', 'job post1 title',
-        'job post2 URL', 'job post2 title', 'job post3 URL', 'job post3 title'
-    ]
-    
-    # Create final dataframe with only the required columns
-    df_final = df[final_columns].copy()
-    
-    # Replace NaN values with empty strings for cleaner output
-    df_final = df_final.fillna('')
+    output_file = writer.path
     
-    # Save to Excel
-    df_final.to_excel(output_file, index=False)
+    # Final dataframe with only the output columns, for the summary below
+    df_final = normalize_columns(df, FINAL_COLUMNS)
+    coverage = coverage_stats(df_final)
     
     print(f"\n" + "="*60)
     print("IMPROVED DATA ENRICHMENT COMPLETED")
     print("="*60)
     print(f"📊 Total companies processed: {max_companies}")
-    
-    # Count companies with data
-    companies_with_urls = 0
-    companies_with_jobs = 0
-    
-    for idx in range(max_companies):
-        has_urls = any([
-            df_final.iloc[idx]['Website URL'] != '',
-            df_final.iloc[idx]['Linkedin URL'] != '',
-            df_final.iloc[idx]['Careers Page URL'] != '',
-            df_final.iloc[idx]['Job listings page URL'] != ''
-        ])
-        if has_urls:
-            companies_with_urls += 1
-        
-        has_jobs = any([
-            df_final.iloc[idx]['job post1 URL'] != '',
-            df_final.iloc[idx]['job post2 URL'] != '',
-            df_final.iloc[idx]['job post3 URL'] != ''
-        ])
-        if has_jobs:
-            companies_with_jobs += 1
-    
-    print(f"✅ Companies with URL data: {companies_with_urls}")
-    print(f"💼 Companies with job postings: {companies_with_jobs}")
+    print(f"✅ Companies with URL data: {coverage['with_urls']}")
+    print(f"💼 Companies with job postings: {coverage['with_jobs']}")
+    print("🏷️ Job listing platforms: " + ", ".join(f"{platform} {count}" for platform, count in coverage['platforms'].items()))
     print(f"💾 Output saved to: {output_file}")
     print("="*60)
     
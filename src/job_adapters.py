@@ -0,0 +1,74 @@
+# Job board adapter registry: which adapters can read a listing URL, cheapest fetch tier first
+import re
+
+from url_classifier import default_classifier
+from page_readiness import WaitForSelector, WaitForAnySelector
+from ats_api import ATS_API_ADAPTERS
+
+# Fetch tiers, cheapest first: a JSON/XML feed, a static HTML page, a rendered browser page
+FETCH_TIERS = ['feed', 'html', 'browser']
+
+# Zoho Recruit boards use one of several list layouts
+ZOHO_JOB_SELECTORS = ['.job-item', '.job-listing', '.career-item', 'tr[onclick]']
+
+class BrowserAdapter:
+    """Render the board in a browser tab and extract jobs with one of JobScraper's DOM scrapers"""
+    tier = 'browser'
+
+    def __init__(self, platform_id, platform, readiness, scrape, url_patterns=None):
+        self.platform_id = platform_id
+        self.platform = platform
+        self.readiness = readiness  # What the page needs before its jobs can be extracted
+        self.scrape = scrape  # Name of the JobScraper method: scrape(page, company_name, url)
+        self.url_patterns = url_patterns or []  # Empty: every URL of the platform
+
+    def board(self, url):
+        """Return {} when the adapter handles url, else None"""
+        if not self.url_patterns or any(re.search(pattern, url) for pattern in self.url_patterns):
+            return {}
+        return None
+
+    async def extract(self, job_scraper, page, company_name, url):
+        return await getattr(job_scraper, self.scrape)(page, company_name, url)
+
+class JobBoardRegistry:
+    """Adapters indexed by the platform ID the URL classifier's domain index assigns to a host"""
+
+    def __init__(self, classifier=default_classifier):
+        self.classifier = classifier
+        self.adapters = {}  # platform ID -> adapters, cheapest tier first
+
+    def register(self, adapter):
+        """Add an adapter; a platform can have one per tier, tried in tier order"""
+        adapters = self.adapters.setdefault(adapter.platform_id, [])
+        adapters.append(adapter)
+        adapters.sort(key=lambda item: FETCH_TIERS.index(item.tier))
+        return adapter
+
+    def lookup(self, url):
+        """Return (adapter, board) pairs able to read url, cheapest tier first"""
+        matches = []
+        for adapter in self.adapters.get(self.classifier.platform_id(url), []):
+            board = adapter.board(url)
+            if board is not None:
+                matches.append((adapter, board))
+        return matches
+
+    def platforms(self):
+        """Return platform ID -> tiers that can read it"""
+        return {platform_id: [adapter.tier for adapter in adapters] for platform_id, adapters in self.adapters.items()}
+
+default_registry = JobBoardRegistry()
+for adapter in ATS_API_ADAPTERS:
+    default_registry.register(adapter)
+for adapter in [
+    BrowserAdapter('lever', 'Lever', WaitForSelector('.posting'), '_scrape_lever_jobs'),
+    BrowserAdapter('greenhouse', 'Greenhouse', WaitForSelector('.opening'), '_scrape_greenhouse_jobs'),
+    BrowserAdapter('zoho_recruit', 'Zoho Recruit', WaitForAnySelector(ZOHO_JOB_SELECTORS), '_scrape_zoho_jobs'),
+    BrowserAdapter('smartrecruiters', 'SmartRecruiters', WaitForSelector('.opening-job'), '_scrape_smartrecruiters_jobs'),
+    BrowserAdapter('workday', 'Workday', WaitForSelector('[data-automation-id="jobTitle"]'), '_scrape_workday_jobs'),
+    # SuccessFactors career sites are rendered client-side and have no public feed
+    BrowserAdapter('successfactors', 'SuccessFactors',
+                   WaitForAnySelector(['a.jobTitle-link', 'a[href*="career_job_req_id"]']), '_scrape_successfactors_jobs'),
+]:
+    default_registry.register(adapter)
@@ -0,0 +1,99 @@
+# Global and per-company job budget shared by every scraper
+import asyncio
+from collections import Counter
+from contextlib import asynccontextmanager
+
+class Reservation:
+    """Job slots held by one piece of scraping work"""
+
+    def __init__(self, company_name, slots):
+        self.company_name = company_name
+        self.slots = slots
+        self.used = 0
+
+    def use(self, jobs):
+        """Keep as many jobs as the reservation allows and return them"""
+        jobs = jobs[:self.slots]
+        self.used = len(jobs)
+        return jobs
+
+class JobBudget:
+    """Reserve job slots before scraping so concurrent work never overshoots the global or per-company limit.
+    Nothing in flight is ever over budget, so spent budget means skipping work, not cancelling it."""
+
+    def __init__(self, max_total=200, max_per_company=3):
+        self.max_total = max_total
+        self.max_per_company = max_per_company
+        self.committed = 0
+        self.reserved = 0
+        self.company_committed = Counter()
+        self.company_reserved = Counter()
+        self.changed = asyncio.Event()  # Replaced on every change; waiters re-check the budget when it is set
+        self.work_count = 0
+        self.work_time = 0.0
+        self.skipped = 0
+
+    def is_exhausted(self, company_name=None):
+        """Check if the global budget, or company_name's share of it, is used up"""
+        if self.committed >= self.max_total:
+            return True
+        return company_name is not None and self.company_committed[company_name] >= self.max_per_company
+
+    def _available(self, company_name):
+        return min(self.max_total - self.committed - self.reserved,
+                   self.max_per_company - self.company_committed[company_name] - self.company_reserved[company_name])
+
+    async def reserve(self, company_name, wanted=None):
+        """Reserve up to wanted slots (default: the per-company limit); 0 means the work should be skipped"""
+        wanted = wanted or self.max_per_company
+        while True:
+            # No await between the check and the update, so concurrent callers cannot both take the last slot
+            available = self._available(company_name)
+            if available > 0:
+                slots = min(wanted, available)
+                self.reserved += slots
+                self.company_reserved[company_name] += slots
+                return slots
+            if self.is_exhausted(company_name) or not self.reserved:
+                return 0
+            # Slots held by work in flight may come back unused; wait for it to settle
+            await self.changed.wait()
+
+    def settle(self, reservation):
+        """Return a reservation: used slots are committed, the rest become available again"""
+        self.reserved -= reservation.slots
+        self.company_reserved[reservation.company_name] -= reservation.slots
+        self.committed += reservation.used
+        self.company_committed[reservation.company_name] += reservation.used
+        self.changed.set()
+        self.changed = asyncio.Event()
+
+    @asynccontextmanager
+    async def slots(self, company_name, wanted=None):
+        """Hold a reservation for one piece of work; reservation.slots is 0 when the work should be skipped"""
+        reservation = Reservation(company_name, await self.reserve(company_name, wanted))
+        if not reservation.slots:
+            self.skip()
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        try:
+            yield reservation
+        finally:
+            if reservation.slots:
+                self.work_count += 1
+                self.work_time += loop.time() - started
+            self.settle(reservation)
+
+    def skip(self):
+        """Count work skipped because of the budget"""
+        self.skipped += 1
+
+    def stats(self):
+        """Return jobs committed and the work skipped, with the time that saved"""
+        average = self.work_time / self.work_count if self.work_count else 0.0
+        return {
+            'jobs': self.committed,
+            'max_total': self.max_total,
+            'skipped': self.skipped,
+            'time_saved': round(average * self.skipped, 1),  # Estimated from the average scrape
+        }
@@ -1,27 +1,55 @@
 import asyncio
-import re
 from datetime import datetime
 from urllib.parse import urljoin, urlparse
 import pandas as pd
 from collections import deque
 
+from url_canonical import canonicalize_url, url_key
+from page_readiness import DomStable
+from ats_api import AtsApiClient, AtsApiError
+from job_adapters import ZOHO_JOB_SELECTORS, default_registry
+from dom_extract import extract_records, extract_record_groups, field
+from job_budget import JobBudget
+
+# Unknown careers pages: wait until client-side rendering settles
+GENERIC_READINESS = DomStable()
+
 class JobScraper:
-    def __init__(self, browser_manager, max_concurrent_scrapes=3):
+    def __init__(self, browser_manager, max_concurrent_scrapes=3, api_client=None, registry=default_registry, budget=None):
         self.browser_manager = browser_manager
-        self.total_jobs_scraped = 0
-        self.max_total_jobs = 200
-        self.max_jobs_per_company = 3
+        # Job slots are reserved from the shared budget before a page is fetched (200 total, 3 per company)
+        self.budget = budget or JobBudget(max_total=200, max_per_company=3)
         self.max_concurrent_scrapes = max_concurrent_scrapes
         self.scrape_semaphore = asyncio.Semaphore(max_concurrent_scrapes)
         self.scraper_tab_pool = deque()
         self.active_scraper_tabs = set()
+        # Known job boards are read through their cheapest adapter (feed, static HTML, then browser)
+        self.registry = registry
+        self.api_client = api_client or AtsApiClient(rate_limiter=browser_manager.rate_limiter)
+    
+    @property
+    def total_jobs_scraped(self):
+        return self.budget.committed
+    
+    @total_jobs_scraped.setter
+    def total_jobs_scraped(self, count):
+        # Jobs kept from an earlier run count against the global budget
+        self.budget.committed = count
+    
+    @property
+    def max_total_jobs(self):
+        return self.budget.max_total
+    
+    @property
+    def max_jobs_per_company(self):
+        return self.budget.max_per_company
         
     async def _get_scraper_tab(self):
         """Get a tab for scraping from the pool or create a new one"""
         if self.scraper_tab_pool:
             return self.scraper_tab_pool.popleft()
         else:
-            return await self.browser_manager.browser.new_page()
+            return await self.browser_manager.new_page()
     
     async def _return_scraper_tab(self, page):
         """Return a scraper tab to the pool for reuse"""
@@ -38,41 +66,43 @@ class JobScraper:
     
     async def scrape_jobs_from_url(self, company_name, url, url_type="careers"):
         """Scrape job postings from a given URL"""
-        if not url or self.total_jobs_scraped >= self.max_total_jobs:
+        if not url:
             return []
-            
+        async with self.budget.slots(company_name) as reservation:
+            if not reservation.slots:
+                # Global or per-company limit already met (or taken by scrapes in flight)
+                return []
+            return await self._scrape_reserved(company_name, canonicalize_url(url), url_type, reservation)
+    
+    async def _scrape_reserved(self, company_name, url, url_type, reservation):
+        """Scrape a URL and keep no more jobs than the reservation holds"""
         print(f"Scraping {url_type} page for {company_name}: {url}")
         
+        # Fast path: one feed or static page request instead of rendering the board
+        adapters = self.registry.lookup(url)
+        for adapter, board in adapters:
+            if adapter.tier == 'browser':
+                break
+            jobs = await self._fetch_jobs_without_browser(adapter, board, company_name, reservation.slots)
+            if jobs is not None:
+                return self._finish_jobs(company_name, jobs, url, reservation)
+        browser_adapter = next((adapter for adapter, _ in adapters if adapter.tier == 'browser'), None)
+        
         async with self.scrape_semaphore:  # Limit concurrent scraping
             page = await self._get_scraper_tab()
             self.active_scraper_tabs.add(page)
             jobs = []
             
             try:
-                await page.goto(url, timeout=30000)
-                await page.wait_for_load_state('networkidle', timeout=10000)
-                
-                # Check for common job board platforms and scrape accordingly
-                if 'lever.co' in url:
-                    jobs = await self._scrape_lever_jobs(page, company_name, url)
-                elif 'greenhouse.io' in url:
-                    jobs = await self._scrape_greenhouse_jobs(page, company_name, url)
-                elif 'zoho.recruit' in url or 'zohorecruit.com' in url:
-                    jobs = await self._scrape_zoho_jobs(page, company_name, url)
-                elif 'smartrecruiters.com' in url:
-                    jobs = await self._scrape_smartrecruiters_jobs(page, company_name, url)
-                elif 'workday.com' in url:
-                    jobs = await self._scrape_workday_jobs(page, company_name, url)
+                # Known job board platforms have their own scraper; generic scraping for other platforms
+                if browser_adapter:
+                    await self.browser_manager.navigate(page, url, browser_adapter.readiness)
+                    jobs = await browser_adapter.extract(self, page, company_name, url)
                 else:
-                    # Generic scraping for other platforms
+                    await self.browser_manager.navigate(page, url, GENERIC_READINESS)
                     jobs = await self._scrape_generic_jobs(page, company_name, url)
                     
-                # Limit jobs per company and update total count
-                jobs = jobs[:self.max_jobs_per_company]
-                self.total_jobs_scraped += len(jobs)
-                
-                print(f"Found {len(jobs)} jobs for {company_name}")
-                return jobs
+                return self._finish_jobs(company_name, jobs, url, reservation)
                 
             except Exception as e:
                 print(f"Error scraping {url}: {e}")
@@ -81,200 +111,140 @@ class JobScraper:
                 self.active_scraper_tabs.discard(page)
                 await self._return_scraper_tab(page)
     
+    async def _fetch_jobs_without_browser(self, adapter, board, company_name, max_jobs):
+        """Return the board's jobs from a feed or static page adapter, or None when it failed"""
+        try:
+            return await self.api_client.fetch_jobs(adapter, board, company_name, max_jobs)
+        except AtsApiError as e:
+            print(f"{adapter.platform} {adapter.tier} failed for {company_name}, trying the next way to read the board: {e}")
+            return None
+        except Exception as e:
+            # A payload in an unexpected shape (a field of the wrong type) is a failure too, not a crash
+            print(f"{adapter.platform} {adapter.tier} returned an unexpected payload for {company_name}, "
+                  f"trying the next way to read the board: {type(e).__name__}: {e}")
+            return None
+    
+    def _finish_jobs(self, company_name, jobs, url, reservation):
+        """Keep the jobs the reservation has slots for; they are committed to the budget when it settles"""
+        jobs = reservation.use(self.dedupe_jobs(jobs, url))
+        
+        print(f"Found {len(jobs)} jobs for {company_name}")
+        return jobs
+    
+    @staticmethod
+    def dedupe_jobs(jobs, base_url=None):
+        """Canonicalize job URLs and drop postings whose URL was already seen; a job is identified by its canonical URL"""
+        unique = []
+        seen = set()
+        for job in jobs:
+            job = {**job, 'job_url': canonicalize_url(job.get('job_url') or '', base_url)}
+            if job['job_url']:
+                key = url_key(job['job_url'])
+                if key in seen:
+                    continue
+                seen.add(key)
+            unique.append(job)
+        return unique
+    
+    def _jobs_from_records(self, records, company_name, base_url, platform, title_length=None):
+        """Turn extracted {title, url, location, date} records into job dicts"""
+        jobs = []
+        for record in records:
+            job_url = record.get('url') or ""
+            if job_url and not job_url.startswith('http'):
+                job_url = urljoin(base_url, job_url)
+            title_text = (record.get('title') or "N/A").strip()
+            
+            jobs.append({
+                'company_name': company_name,
+                'job_title': title_text[:title_length] if title_length else title_text,
+                'job_location': (record.get('location') or "N/A").strip(),
+                'job_url': job_url,
+                'posting_date': (record.get('date') or "N/A").strip(),
+                'job_description': 'N/A',
+                'platform': platform
+            })
+        return jobs
+    
     async def _scrape_lever_jobs(self, page, company_name, base_url):
         """Scrape jobs from Lever platform"""
-        jobs = []
         try:
-            # Wait for job listings to load
-            await page.wait_for_selector('.posting', timeout=5000)
-            job_elements = await page.query_selector_all('.posting')
-            
-            for job_elem in job_elements[:self.max_jobs_per_company]:
-                try:
-                    title = await job_elem.query_selector('.posting-title')
-                    title_text = await title.inner_text() if title else "N/A"
-                    
-                    location = await job_elem.query_selector('.posting-categories .location')
-                    location_text = await location.inner_text() if location else "N/A"
-                    
-                    link = await job_elem.query_selector('a')
-                    job_url = await link.get_attribute('href') if link else ""
-                    if job_url and not job_url.startswith('http'):
-                        job_url = urljoin(base_url, job_url)
-                    
-                    jobs.append({
-                        'company_name': company_name,
-                        'job_title': title_text.strip(),
-                        'job_location': location_text.strip(),
-                        'job_url': job_url,
-                        'posting_date': 'N/A',
-                        'job_description': 'N/A',
-                        'platform': 'Lever'
-                    })
-                except Exception as e:
-                    continue
-                    
+            records = await extract_records(page, ['.posting'], {
+                'title': field('.posting-title'),
+                'location': field('.posting-categories .location'),
+                'url': field('a', 'href'),
+            }, self.max_jobs_per_company)
+            return self._jobs_from_records(records, company_name, base_url, 'Lever')
         except Exception as e:
             print(f"Error scraping Lever jobs: {e}")
-        
-        return jobs
+            return []
     
     async def _scrape_greenhouse_jobs(self, page, company_name, base_url):
         """Scrape jobs from Greenhouse platform"""
-        jobs = []
         try:
-            await page.wait_for_selector('.opening', timeout=5000)
-            job_elements = await page.query_selector_all('.opening')
-            
-            for job_elem in job_elements[:self.max_jobs_per_company]:
-                try:
-                    title = await job_elem.query_selector('a')
-                    title_text = await title.inner_text() if title else "N/A"
-                    job_url = await title.get_attribute('href') if title else ""
-                    
-                    location = await job_elem.query_selector('.location')
-                    location_text = await location.inner_text() if location else "N/A"
-                    
-                    if job_url and not job_url.startswith('http'):
-                        job_url = urljoin(base_url, job_url)
-                    
-                    jobs.append({
-                        'company_name': company_name,
-                        'job_title': title_text.strip(),
-                        'job_location': location_text.strip(),
-                        'job_url': job_url,
-                        'posting_date': 'N/A',
-                        'job_description': 'N/A',
-                        'platform': 'Greenhouse'
-                    })
-                except Exception as e:
-                    continue
-                    
+            records = await extract_records(page, ['.opening'], {
+                'title': field('a'),
+                'url': field('a', 'href'),
+                'location': field('.location'),
+            }, self.max_jobs_per_company)
+            return self._jobs_from_records(records, company_name, base_url, 'Greenhouse')
         except Exception as e:
             print(f"Error scraping Greenhouse jobs: {e}")
-        
-        return jobs
+            return []
     
     async def _scrape_zoho_jobs(self, page, company_name, base_url):
         """Scrape jobs from Zoho Recruit platform"""
-        jobs = []
         try:
-            # Try multiple selectors for Zoho
-            selectors = ['.job-item', '.job-listing', '.career-item', 'tr[onclick]']
-            
-            for selector in selectors:
-                try:
-                    await page.wait_for_selector(selector, timeout=3000)
-                    job_elements = await page.query_selector_all(selector)
-                    
-                    if job_elements:
-                        for job_elem in job_elements[:self.max_jobs_per_company]:
-                            try:
-                                # Extract job details based on Zoho structure
-                                title_elem = await job_elem.query_selector('a, .job-title, td:first-child')
-                                title_text = await title_elem.inner_text() if title_elem else "N/A"
-                                
-                                # Try to get job URL
-                                link_elem = await job_elem.query_selector('a')
-                                job_url = await link_elem.get_attribute('href') if link_elem else ""
-                                if not job_url and job_elem.get_attribute:
-                                    onclick = await job_elem.get_attribute('onclick')
-                                    if onclick and 'window.open' in onclick:
-                                        import re
-                                        url_match = re.search(r"window\.open\('([^']+)'", onclick)
-                                        if url_match:
-                                            job_url = url_match.group(1)
-                                
-                                if job_url and not job_url.startswith('http'):
-                                    job_url = urljoin(base_url, job_url)
-                                
-                                jobs.append({
-                                    'company_name': company_name,
-                                    'job_title': title_text.strip(),
-                                    'job_location': 'N/A',
-                                    'job_url': job_url,
-                                    'posting_date': 'N/A',
-                                    'job_description': 'N/A',
-                                    'platform': 'Zoho Recruit'
-                                })
-                            except Exception as e:
-                                continue
-                        break
-                except Exception as e:
-                    continue
-                    
+            # Try multiple selectors for Zoho (the first one with rows wins); table rows link via onclick
+            records = await extract_records(page, ZOHO_JOB_SELECTORS, {
+                'title': field('a, .job-title, td:first-child'),
+                'url': field('a', 'href'),
+            }, self.max_jobs_per_company, onclick_url=True)
+            return self._jobs_from_records(records, company_name, base_url, 'Zoho Recruit')
         except Exception as e:
             print(f"Error scraping Zoho jobs: {e}")
-        
-        return jobs
+            return []
     
     async def _scrape_smartrecruiters_jobs(self, page, company_name, base_url):
         """Scrape jobs from SmartRecruiters platform"""
-        jobs = []
         try:
-            await page.wait_for_selector('.opening-job', timeout=5000)
-            job_elements = await page.query_selector_all('.opening-job')
-            
-            for job_elem in job_elements[:self.max_jobs_per_company]:
-                try:
-                    title = await job_elem.query_selector('.job-title a, h4 a')
-                    title_text = await title.inner_text() if title else "N/A"
-                    job_url = await title.get_attribute('href') if title else ""
-                    
-                    location = await job_elem.query_selector('.job-location')
-                    location_text = await location.inner_text() if location else "N/A"
-                    
-                    if job_url and not job_url.startswith('http'):
-                        job_url = urljoin(base_url, job_url)
-                    
-                    jobs.append({
-                        'company_name': company_name,
-                        'job_title': title_text.strip(),
-                        'job_location': location_text.strip(),
-                        'job_url': job_url,
-                        'posting_date': 'N/A',
-                        'job_description': 'N/A',
-                        'platform': 'SmartRecruiters'
-                    })
-                except Exception as e:
-                    continue
-                    
+            records = await extract_records(page, ['.opening-job'], {
+                'title': field('.job-title a, h4 a'),
+                'url': field('.job-title a, h4 a', 'href'),
+                'location': field('.job-location'),
+            }, self.max_jobs_per_company)
+            return self._jobs_from_records(records, company_name, base_url, 'SmartRecruiters')
         except Exception as e:
             print(f"Error scraping SmartRecruiters jobs: {e}")
-        
-        return jobs
+            return []
     
     async def _scrape_workday_jobs(self, page, company_name, base_url):
         """Scrape jobs from Workday platform"""
-        jobs = []
         try:
-            await page.wait_for_selector('[data-automation-id="jobTitle"]', timeout=5000)
-            job_elements = await page.query_selector_all('[data-automation-id="jobTitle"]')
-            
-            for job_elem in job_elements[:self.max_jobs_per_company]:
-                try:
-                    title_text = await job_elem.inner_text()
-                    job_url = await job_elem.get_attribute('href')
-                    
-                    if job_url and not job_url.startswith('http'):
-                        job_url = urljoin(base_url, job_url)
-                    
-                    jobs.append({
-                        'company_name': company_name,
-                        'job_title': title_text.strip(),
-                        'job_location': 'N/A',
-                        'job_url': job_url,
-                        'posting_date': 'N/A',
-                        'job_description': 'N/A',
-                        'platform': 'Workday'
-                    })
-                except Exception as e:
-                    continue
-                    
+            records = await extract_records(page, ['[data-automation-id="jobTitle"]'], {
+                'title': field(),
+                'url': field(attr='href'),
+                'location': field('[data-automation-id="locations"] dd', closest='li'),
+                'date': field('[data-automation-id="postedOn"] dd', closest='li'),
+            }, self.max_jobs_per_company)
+            return self._jobs_from_records(records, company_name, base_url, 'Workday')
         except Exception as e:
             print(f"Error scraping Workday jobs: {e}")
-        
-        return jobs
+            return []
+    
+    async def _scrape_successfactors_jobs(self, page, company_name, base_url):
+        """Scrape jobs from SuccessFactors career sites"""
+        try:
+            # Career site builder pages keep the location in the same result row
+            records = await extract_records(page, ['a.jobTitle-link, a[href*="career_job_req_id"]'], {
+                'title': field(),
+                'url': field(attr='href'),
+                'location': field('.jobLocation', closest='tr, li'),
+            }, self.max_jobs_per_company)
+            return self._jobs_from_records(records, company_name, base_url, 'SuccessFactors')
+        except Exception as e:
+            print(f"Error scraping SuccessFactors jobs: {e}")
+            return []
     
     async def _scrape_generic_jobs(self, page, company_name, base_url):
         """Generic job scraping for unknown platforms"""
@@ -287,81 +257,29 @@ class JobScraper:
                 '[class*="job"]', '[class*="career"]', '[class*="position"]'
             ]
             
-            for selector in selectors:
-                try:
-                    elements = await page.query_selector_all(selector)
-                    if elements:
-                        for elem in elements[:self.max_jobs_per_company]:
-                            try:
-                                title_text = await elem.inner_text()
-                                job_url = await elem.get_attribute('href')
-                                
-                                # Filter out non-job links
-                                if not any(keyword in title_text.lower() for keyword in ['job', 'career', 'position', 'opening', 'role']):
-                                    continue
-                                
-                                if job_url and not job_url.startswith('http'):
-                                    job_url = urljoin(base_url, job_url)
-                                
-                                jobs.append({
-                                    'company_name': company_name,
-                                    'job_title': title_text.strip()[:100],  # Limit title length
-                                    'job_location': 'N/A',
-                                    'job_url': job_url,
-                                    'posting_date': 'N/A',
-                                    'job_description': 'N/A',
-                                    'platform': 'Generic'
-                                })
-                            except Exception as e:
-                                continue
-                        
-                        if jobs:  # If we found jobs with this selector, break
-                            break
-                except Exception as e:
-                    continue
+            # Every selector's candidates in one evaluation; the first selector that yields jobs wins
+            groups = await extract_record_groups(page, selectors, {
+                'title': field(),
+                'url': field(attr='href'),
+            }, self.max_jobs_per_company, stop_at_first=False)
+            
+            for records in groups:
+                # Filter out non-job links
+                records = [record for record in records
+                           if any(keyword in (record['title'] or '').lower() for keyword in ['job', 'career', 'position', 'opening', 'role'])]
+                jobs = self._jobs_from_records(records, company_name, base_url, 'Generic', title_length=100)  # Limit title length
+                if jobs:  # If we found jobs with this selector, break
+                    break
                     
         except Exception as e:
             print(f"Error in generic job scraping: {e}")
         
         return jobs
     
-    async def scrape_multiple_urls(self, urls_data):
-        """Scrape multiple URLs concurrently
-        Args:
-            urls_data: List of tuples (company_name, url, url_type)
-        """
-        if not urls_data or self.total_jobs_scraped >= self.max_total_jobs:
-            return []
-        
-        # Filter out URLs if we've reached the limit
-        remaining_slots = self.max_total_jobs - self.total_jobs_scraped
-        if remaining_slots <= 0:
-            return []
-        
-        tasks = []
-        for company_name, url, url_type in urls_data:
-            if self.total_jobs_scraped >= self.max_total_jobs:
-                break
-            tasks.append(self.scrape_jobs_from_url(company_name, url, url_type))
-        
-        if not tasks:
-            return []
-        
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        # Flatten results and handle exceptions
-        all_jobs = []
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
-                company_name, url, url_type = urls_data[i]
-                print(f"Error scraping {company_name} ({url_type}): {result}")
-            else:
-                all_jobs.extend(result)
-        
-        return all_jobs
-    
     async def cleanup_scraper_tabs(self):
-        """Clean up all scraper tabs"""
+        """Clean up all scraper tabs and the ATS API session"""
+        await self.api_client.close()
+        
         # Close all tabs in the pool
         while self.scraper_tab_pool:
             page = self.scraper_tab_pool.popleft()
@@ -380,4 +298,4 @@ class JobScraper:
     
     def has_reached_limit(self):
         """Check if we've reached the 200 job limit"""
-        return self.total_jobs_scraped >= self.max_total_jobs
\ No newline at end of file
+        return self.budget.is_exhausted()
\ No newline at end of file
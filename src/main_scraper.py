@@ -2,7 +2,6 @@
 import pandas as pd
 import asyncio
 from datetime import datetime
-import requests
 from urllib.parse import urlparse
 import sys
 from pathlib import Path
@@ -13,6 +12,12 @@ sys.path.insert(0, str(project_root))
 
 from scrapper import BrowserManager
 from job_scraper import JobScraper
+from query_planner import DiscoveryPlanner
+from query_compiler import QueryCompiler
+from pipeline import Pipeline
+from checkpoint import CheckpointJournal, DEFAULT_JOURNAL_DIR
+from output_writers import OutputWriter
+from url_validator import UrlValidator
 
 def extract_industry_keywords(description):
     """Extract relevant industry keywords from company description"""
@@ -38,7 +43,21 @@ def extract_industry_keywords(description):
     
     return keywords[:2]  # Return max 2 keywords to keep queries focused
 
-async def main():
+async def discover_company(browser_manager, planner, company):
+    """Discovery stage: return the best URL per slot for a company"""
+    # Categorized searches (one page load per query), stopping once every slot is filled
+    categorized_links = await planner.discover(browser_manager, company)
+    return browser_manager.best_urls(categorized_links)
+
+async def scrape_company(job_scraper, company, best_urls, validator=None):
+    """Scraping stage: scrape the job listings page, or the careers page when there is none (or it is dead)"""
+    if best_urls['jobs_platform'] and not (validator and validator.is_dead(best_urls['jobs_platform'])):
+        return await job_scraper.scrape_jobs_from_url(company, best_urls['jobs_platform'], "jobs")
+    if best_urls['careers']:
+        return await job_scraper.scrape_jobs_from_url(company, best_urls['careers'], "careers")
+    return []
+
+async def main(search_backend="http", discovery_workers=3, scrape_workers=2, resume=False, output_format="excel"):
     """Main function to orchestrate the entire data enrichment and job scraping process"""
     
     # Read the Excel file
@@ -61,195 +80,138 @@ async def main():
     df['Data Quality Score'] = 0  # Score out of 4 (website, linkedin, careers, jobs)
 
     # Initialize browser manager and job scraper with controlled settings
-    browser_manager = BrowserManager(max_concurrent_tabs=3, headless=True)  # Use headless mode to avoid multiple windows
-    job_scraper = JobScraper(browser_manager, max_concurrent_scrapes=2)  # Limit concurrent operations
+    browser_manager = BrowserManager(max_concurrent_tabs=3, headless=True, search_backend=search_backend)  # Use headless mode to avoid multiple windows
+    job_scraper = JobScraper(browser_manager, max_concurrent_scrapes=scrape_workers)  # Limit concurrent operations
+    planner = DiscoveryPlanner(window=browser_manager.max_concurrent_tabs, compiler=QueryCompiler())
+    # Links are checked as soon as they are discovered; the final validation pass reuses the results
+    validator = UrlValidator(rate_limiter=browser_manager.rate_limiter)
+    discovered = {}  # Row index -> best URL per slot
     all_jobs = []
+    # Each company is journaled once its jobs are scraped, so a crashed run can be resumed
+    journal = CheckpointJournal(DEFAULT_JOURNAL_DIR / "main_scraper_journal.jsonl", resume=resume)
+    # Jobs collected by an earlier run count toward the 200 job limit
+    job_scraper.total_jobs_scraped = sum(len(entry['jobs']) for entry in journal.entries.values())
+    
+    # Process only first 6 companies
+    max_companies = min(len(df), 6)
+    
+    async def discovery_stage(idx):
+        company = str(df.at[idx, 'Company Name'])
+        print(f"Processing company {idx+1}/{max_companies}: {company}")
+        try:
+            discovered[idx] = await discover_company(browser_manager, planner, company)
+            await validator.validate_many(discovered[idx].values())
+        except Exception as e:
+            print(f"Error processing {company}: {e}")
+        return idx
+    
+    async def scraping_stage(idx):
+        if idx not in discovered:
+            return []  # Not journaled, so a resumed run retries the discovery
+        company = str(df.at[idx, 'Company Name'])
+        best_urls = discovered[idx]
+        # Once the job budget is spent, the scraper skips the page without opening it
+        jobs = await scrape_company(job_scraper, company, best_urls, validator)
+        
+        # Assign the best link of each category to its column; score out of 4, one point per filled slot
+        journal.record(company, updates={
+            'Jobs Listings Page URL': best_urls['jobs_platform'],
+            'Linkedin URL': best_urls['linkedin'],
+            'Careers Page URL': best_urls['careers'],
+            'Website URL': best_urls['website'],
+            'Data Quality Score': sum(1 for url in best_urls.values() if url),
+        }, jobs=jobs)
+        return jobs
     
     try:
         await browser_manager.initialize()
         print("Browser initialized successfully!")
         
-        print("Phase 1: Enriching company data...")
-        # Process only first 6 companies for basic enrichment
-        max_companies = 6
-        for idx, row in df.iterrows():
-            if idx >= max_companies:
-                print(f"Reached company limit of {max_companies}!")
-                break
-            if job_scraper.has_reached_limit():
-                print("Reached 200 job postings limit!")
-                break
-                
-            print(f"Processing company {idx+1}/{max_companies}: {row['Company Name']}")
-            company = str(row['Company Name'])
-            desc = str(row['Company Description'])
-            
-            # Create optimized search queries for better targeting
-            # Extract key industry keywords from description
-            industry_keywords = extract_industry_keywords(desc)
-            
-            # Build DuckDuckGo-optimized search queries
-            try:
-                search_queries = [
-                    # Simple company name search for official website
-                    f'{company}',
-                    
-                    # LinkedIn company page search
-                    f'{company} linkedin company',
-                    
-                    # Careers page searches - multiple variations
-                    f'{company} careers',
-                    f'{company} jobs',
-                    f'{company} careers page',
-                    f'{company} employment opportunities',
-                    
-                    # Job platform specific searches (more direct)
-                    f'{company} lever jobs',
-                    f'{company} greenhouse careers',
-                    f'{company} zoho recruit',
-                    f'{company} smartrecruiters',
-                    f'{company} workday jobs',
-                    
-                    # Alternative job listing searches
-                    f'{company} current openings',
-                    f'{company} job openings',
-                    f'{company} hiring now',
-                    f'{company} apply jobs'
-                ]
-                
-                # Use the enhanced search with company context for better filtering
-                all_links = await browser_manager.search_multiple(search_queries, company)
-                links = all_links  # Already deduplicated in search_multiple
-                
-                quality_score = 0
-                
-                # Assign links to columns with DuckDuckGo-optimized categorization
-                for link in links:
-                    link_lower = link.lower()
-                    
-                    # Priority 1: Job listing platforms (highest priority) - more flexible matching
-                    job_platforms = ['lever.co', 'greenhouse.io', 'zohorecruit.com', 'zoho.recruit', 'smartrecruiters.com', 'workday.com', 'bamboohr.com', 'jobvite.com', 'icims.com']
-                    if any(platform in link_lower for platform in job_platforms) and not df.at[idx, 'Jobs Listings Page URL']:
-                        df.at[idx, 'Jobs Listings Page URL'] = link
-                        quality_score += 1
-                        continue
-                    
-                    # Priority 2: LinkedIn company pages - more flexible matching
-                    if ('linkedin.com' in link_lower and ('company' in link_lower or '/in/' in link_lower)) and not df.at[idx, 'Linkedin URL']:
-                        df.at[idx, 'Linkedin URL'] = link
-                        quality_score += 1
-                        continue
-                    
-                    # Priority 3: Careers pages - broader matching
-                    career_keywords = ['careers', 'jobs', 'employment', 'opportunities', 'hiring', 'openings', 'join-us', 'work-with-us']
-                    if any(keyword in link_lower for keyword in career_keywords) and not df.at[idx, 'Careers Page URL']:
-                        # Exclude generic job sites but be less restrictive
-                        excluded_job_sites = ['glassdoor.com', 'indeed.com', 'monster.com', 'ziprecruiter.com', 'simplyhired.com']
-                        if not any(site in link_lower for site in excluded_job_sites):
-                            # Also exclude if it's already categorized as a job platform
-                            if not any(platform in link_lower for platform in job_platforms):
-                                df.at[idx, 'Careers Page URL'] = link
-                                quality_score += 1
-                                continue
-                    
-                    # Priority 4: Company websites (official domains) - more flexible
-                    if not df.at[idx, 'Website URL']:
-                        # Exclude social media and generic sites
-                        excluded_domains = ['linkedin.com', 'facebook.com', 'twitter.com', 'youtube.com', 'instagram.com', 
-                                          'glassdoor.com', 'indeed.com', 'monster.com', 'ziprecruiter.com', 'wikipedia.org',
-                                          'crunchbase.com', 'bloomberg.com', 'reuters.com']
-                        
-                        if not any(excluded in link_lower for excluded in excluded_domains):
-                            # More flexible company name matching
-                            company_clean = company.lower().replace(' ', '').replace('-', '').replace('_', '').replace('.', '')[:8]
-                            link_clean = link_lower.replace('https://', '').replace('http://', '').replace('www.', '').replace('-', '').replace('_', '')
-                            
-                            # Check if company name appears in domain or if it's a .com/.org domain
-                            if company_clean in link_clean or any(tld in link for tld in ['.com', '.org', '.net']) and len(link_clean.split('/')[0]) < 50:
-                                df.at[idx, 'Website URL'] = link
-                                quality_score += 1
-                
-                df.at[idx, 'Data Quality Score'] = quality_score
-                        
-            except Exception as e:
-                print(f"Error processing {company}: {e}")
-        
-        print("\nPhase 2: Scraping job postings...")
-        # Process companies for job scraping concurrently
-        df_limited = df.head(max_companies)
-        companies_with_jobs = df_limited[df_limited['Jobs Listings Page URL'] != ''].copy()
-        companies_with_careers = df_limited[(df_limited['Careers Page URL'] != '') & (df_limited['Jobs Listings Page URL'] == '')].copy()
-        
-        # Prepare URLs for concurrent scraping
-        urls_to_scrape = []
+        # Discovery and job scraping run as separate worker pools connected by a bounded queue,
+        # so a slow careers page never holds up searching for the next companies
+        print(f"Enriching company data and scraping job postings ({discovery_workers} discovery / {scrape_workers} scraping workers)...")
+        pipeline = Pipeline()
+        pipeline.add_stage('discovery', discovery_stage, workers=discovery_workers)
+        pipeline.add_stage('scraping', scraping_stage, workers=scrape_workers)
+        pending = [idx for idx in range(max_companies) if not journal.is_done(str(df.at[idx, 'Company Name']))]
+        await pipeline.run(pending)
         
-        # Add job listings pages first (higher priority)
-        for idx, row in companies_with_jobs.iterrows():
-            if len(urls_to_scrape) * job_scraper.max_jobs_per_company >= job_scraper.max_total_jobs:
-                break
-            company_name = str(row['Company Name'])
-            jobs_url = row['Jobs Listings Page URL']
-            urls_to_scrape.append((company_name, jobs_url, "jobs"))
+        # Build the output from the journal, including companies finished by earlier runs;
+        # jobs are listed in company order regardless of which page finished first
+        for idx in range(max_companies):
+            entry = journal.get(str(df.at[idx, 'Company Name']))
+            if entry:
+                for column, value in entry['updates'].items():
+                    df.at[idx, column] = value
+                all_jobs.extend(entry['jobs'])
         
-        # Add careers pages
-        for idx, row in companies_with_careers.iterrows():
-            if len(urls_to_scrape) * job_scraper.max_jobs_per_company >= job_scraper.max_total_jobs:
-                break
-            company_name = str(row['Company Name'])
-            careers_url = row['Careers Page URL']
-            urls_to_scrape.append((company_name, careers_url, "careers"))
-        
-        # Scrape all URLs concurrently
-        if urls_to_scrape:
-            print(f"Scraping {len(urls_to_scrape)} URLs concurrently...")
-            all_jobs = await job_scraper.scrape_multiple_urls(urls_to_scrape)
-        else:
-            all_jobs = []
+        planner_stats = planner.stats()
+        print(f"Discovery planner issued {planner_stats['issued']} of {planner_stats['planned']} planned searches "
+              f"({planner_stats['saved']} saved: {planner_stats['merged']} by merging queries, "
+              f"{planner_stats['stopped_early']} by stopping early)")
+        pipeline.print_stats()
+        budget_stats = job_scraper.budget.stats()
+        print(f"Job budget: {budget_stats['jobs']}/{budget_stats['max_total']} jobs, {budget_stats['skipped']} scrapes skipped "
+              f"(~{budget_stats['time_saved']}s saved)")
         
         print(f"\nTotal jobs scraped: {len(all_jobs)}")
         
+        # Validation step (companies from an earlier run are checked here for the first time)
+        await validate_urls(df, validator)
+        
     finally:
         # Clean up scraper tabs first, then close browser
+        journal.close()
+        await validator.close()
         await job_scraper.cleanup_scraper_tabs()
         await browser_manager.close()
         print("Browser closed successfully!")
     
     # Create comprehensive Excel output
-    create_final_excel_output(df, all_jobs)
+    create_final_excel_output(df, all_jobs, output_format)
 
-def validate_urls(df):
+async def validate_urls(df, validator=None):
     """Validate URLs and update data quality"""
     print("Validating URLs...")
     
     url_columns = ['Website URL', 'Linkedin URL', 'Careers Page URL', 'Jobs Listings Page URL']
+    own_validator = validator is None
+    validator = validator or UrlValidator()
+    
+    try:
+        # Every distinct URL is checked once, concurrently; URLs checked during discovery come from the cache
+        results = await validator.validate_many(url for col in url_columns for url in df[col] if isinstance(url, str))
+    finally:
+        if own_validator:
+            await validator.close()
     
     for idx, row in df.iterrows():
         working_urls = 0
         for col in url_columns:
-            url = row[col]
-            if url and url != '':
-                try:
-                    response = requests.head(url, timeout=10, allow_redirects=True)
-                    if response.status_code < 400:
-                        working_urls += 1
-                    else:
-                        print(f"Dead link found for {row['Company Name']}: {url}")
-                        df.at[idx, col] = ''  # Remove dead links
-                except:
-                    print(f"Cannot validate link for {row['Company Name']}: {url}")
-                    # Keep the link but note the validation issue
+            result = results.get(row[col])
+            if result is None:
+                continue
+            if result['ok']:
+                working_urls += 1
+            elif result['ok'] is False:
+                print(f"Dead link found for {row['Company Name']}: {row[col]}")
+                df.at[idx, col] = ''  # Remove dead links
+            else:
+                print(f"Cannot validate link for {row['Company Name']}: {row[col]}")
+                # Keep the link but note the validation issue
         
         # Update quality score based on working URLs
         df.at[idx, 'Validated URL Count'] = working_urls
+    
+    stats = validator.stats()
+    print(f"URL validation: {stats['checked']} URLs, {stats['requests']} requests, {stats['cache_hits']} cache hits, "
+          f"{stats['get_fallbacks']} HEAD->GET fallbacks, {stats['redirects']} redirects")
 
-def create_final_excel_output(companies_df, jobs_list):
-    """Create the final Excel file with proper structure"""
+def create_final_excel_output(companies_df, jobs_list, output_format="excel"):
+    """Create the final output (Excel sheets, or one file per table) with proper structure"""
     
     print("Creating final Excel output...")
     
-    # Validation step
-    validate_urls(companies_df)
-    
     # Create jobs DataFrame
     jobs_df = pd.DataFrame(jobs_list)
     
@@ -311,19 +273,17 @@ DATA ENRICHMENT AND JOB SCRAPING METHODOLOGY
 8. DATE OF EXECUTION: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 """
 
-    # Write to Excel with multiple sheets
-    output_file = project_root / "output" / "Data_enriched_final.xlsx"
-    with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
+    # Write every table through a streaming writer (sheets of one workbook for Excel)
+    with OutputWriter(project_root / "output" / "Data_enriched_final", output_format) as writer:
         # Data sheet with company information
-        companies_df.to_excel(writer, sheet_name='Data', index=False)
+        writer.table('Data', companies_df.columns).write_dataframe(companies_df)
         
         # Jobs sheet with job postings
         if not jobs_df.empty:
-            jobs_df.to_excel(writer, sheet_name='Job_Postings', index=False)
+            writer.table('Job_Postings', jobs_df.columns).write_dataframe(jobs_df)
         
         # Methodology sheet
-        methodology_df = pd.DataFrame({'Methodology': [methodology_text]})
-        methodology_df.to_excel(writer, sheet_name='Methodology', index=False)
+        writer.table('Methodology', ['Methodology']).write_row({'Methodology': methodology_text})
         
         # Summary statistics
         summary_data = {
@@ -338,7 +298,8 @@ DATA ENRICHMENT AND JOB SCRAPING METHODOLOGY
             ]
         }
         summary_df = pd.DataFrame(summary_data)
-        summary_df.to_excel(writer, sheet_name='Summary', index=False)
+        writer.table('Summary', summary_df.columns).write_dataframe(summary_df)
+    output_file = writer.path
     
     print("\n" + "="*50)
     print("FINAL RESULTS SUMMARY")
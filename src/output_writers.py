@@ -0,0 +1,244 @@
+# Streaming output writers: rows are written as they are produced instead of in one to_excel call
+import csv
+import json
+import math
+from pathlib import Path
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # pyarrow is only needed for Parquet output
+    pyarrow = None
+
+try:
+    from openpyxl import Workbook
+except ImportError:
+    Workbook = None
+
+OUTPUT_FORMATS = ['excel', 'csv', 'jsonl', 'parquet']
+
+FORMAT_EXTENSIONS = {'excel': '.xlsx', 'csv': '.csv', 'jsonl': '.jsonl', 'parquet': '.parquet'}
+
+# Raised when a chunk does not fit the Parquet schema
+ARROW_ERRORS = (pyarrow.ArrowInvalid, pyarrow.ArrowTypeError) if pyarrow else ()
+
+def _plain(value):
+    """Convert NaN/None to None and NumPy scalars to Python values"""
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return None
+    if hasattr(value, 'item'):
+        value = value.item()
+        if isinstance(value, float) and math.isnan(value):
+            return None
+    return value
+
+class _CsvTable:
+    def __init__(self, path, columns):
+        self.file = open(path, 'w', newline='', encoding='utf-8')
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(columns)
+
+    def write(self, values):
+        self.writer.writerow(['' if value is None else value for value in values])
+        self.file.flush()  # Readers can consume partial results
+
+    def write_frame(self, frame):
+        frame.to_csv(self.file, header=False, index=False, lineterminator='\r\n')  # Same line ends as csv.writer
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+class _JsonlTable:
+    def __init__(self, path, columns):
+        self.file = open(path, 'w', encoding='utf-8')
+        self.columns = columns
+
+    def write(self, values):
+        self.file.write(json.dumps(dict(zip(self.columns, values)), ensure_ascii=False, default=str) + '\n')
+        self.file.flush()
+
+    def write_frame(self, frame):
+        frame.to_json(self.file, orient='records', lines=True, force_ascii=False, default_handler=str)
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+class _ParquetTable:
+    def __init__(self, path, columns, batch_size=500):
+        if pyarrow is None:
+            raise RuntimeError("Parquet output needs pyarrow (pip install pyarrow)")
+        self.path = path
+        self.columns = columns
+        self.batch_size = batch_size
+        self.batch = []
+        self.writer = None  # Created with the schema of the first batch
+
+    def write(self, values):
+        self.batch.append(dict(zip(self.columns, values)))
+        if len(self.batch) >= self.batch_size:
+            self._flush()
+
+    def write_frame(self, frame):
+        self._flush()  # Rows written one at a time go first
+        if self.writer is None:
+            table = pyarrow.Table.from_pandas(frame, preserve_index=False)
+            # Columns with no values yet become strings, like _infer_schema does
+            schema = pyarrow.schema([(field.name, pyarrow.string() if pyarrow.types.is_null(field.type) else field.type)
+                                     for field in table.schema])
+            self.writer = pyarrow.parquet.ParquetWriter(self.path, schema)
+        self.writer.write_table(pyarrow.Table.from_pandas(frame, schema=self.writer.schema, preserve_index=False))
+
+    def _flush(self):
+        if not self.batch:
+            return
+        if self.writer is None:
+            self.writer = pyarrow.parquet.ParquetWriter(self.path, self._infer_schema())
+        schema = self.writer.schema
+        string_columns = [field.name for field in schema if pyarrow.types.is_string(field.type)]
+        for row in self.batch:
+            for column in string_columns:
+                if row[column] is not None and not isinstance(row[column], str):
+                    row[column] = str(row[column])
+        self.writer.write_table(pyarrow.Table.from_pylist(self.batch, schema=schema))  # One row group per batch
+        self.batch = []
+
+    def _infer_schema(self):
+        """Infer column types from the first batch; empty or mixed-type columns become strings"""
+        fields = []
+        for column in self.columns:
+            try:
+                field_type = pyarrow.array([row[column] for row in self.batch]).type
+            except (pyarrow.ArrowInvalid, pyarrow.ArrowTypeError):
+                field_type = pyarrow.string()
+            if pyarrow.types.is_null(field_type):
+                field_type = pyarrow.string()
+            fields.append((column, field_type))
+        return pyarrow.schema(fields)
+
+    def close(self):
+        self._flush()
+        if self.writer is None:
+            # No rows: still write the header as an all-string schema
+            schema = pyarrow.schema([(column, pyarrow.string()) for column in self.columns])
+            self.writer = pyarrow.parquet.ParquetWriter(self.path, schema)
+        self.writer.close()
+
+class _ExcelSheet:
+    def __init__(self, sheet, columns):
+        self.sheet = sheet
+        self.sheet.append(columns)
+
+    def write(self, values):
+        self.sheet.append(values)
+
+    def close(self):
+        pass  # Saved with the workbook
+
+class TableWriter:
+    """Writes rows of one table; row dicts are reduced to the table's columns"""
+
+    def __init__(self, backend, columns):
+        self.backend = backend
+        self.columns = list(columns)
+        self.rows_written = 0
+
+    def write_row(self, row):
+        """Write one row given as a dict (or pandas Series); missing columns are left empty"""
+        self.backend.write([_plain(row.get(column)) for column in self.columns])
+        self.rows_written += 1
+
+    def write_rows(self, rows):
+        """Write an iterable of rows"""
+        for row in rows:
+            self.write_row(row)
+
+    def write_dataframe(self, df, chunk_size=10000):
+        """Write a DataFrame a chunk at a time; file formats write each chunk in one call"""
+        df = df.reindex(columns=self.columns)
+        write_frame = getattr(self.backend, 'write_frame', None)
+        for start in range(0, len(df), chunk_size):
+            chunk = df.iloc[start:start + chunk_size]
+            if write_frame:
+                try:
+                    write_frame(chunk)
+                    self.rows_written += len(chunk)
+                    continue
+                except ARROW_ERRORS:
+                    pass  # Types that do not fit the Parquet schema: convert row by row instead
+            for values in chunk.itertuples(index=False, name=None):
+                self.backend.write([_plain(value) for value in values])
+            self.rows_written += len(chunk)
+
+class OutputWriter:
+    """Stream one or more tables to Excel (write-only workbook), CSV, JSONL or Parquet files"""
+
+    def __init__(self, path, output_format='excel', parquet_batch_size=500):
+        if output_format not in FORMAT_EXTENSIONS:
+            raise ValueError(f"Unknown output format '{output_format}', expected one of {OUTPUT_FORMATS}")
+        self.output_format = output_format
+        self.path = Path(path).with_suffix(FORMAT_EXTENSIONS[output_format])
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.parquet_batch_size = parquet_batch_size
+        self.tables = {}
+        self.paths = []
+        if output_format == 'excel':
+            if Workbook is None:
+                raise RuntimeError("Excel output needs openpyxl (pip install openpyxl)")
+            # Write-only mode streams rows to temporary files instead of keeping the workbook in memory
+            self.workbook = Workbook(write_only=True)
+            self.paths.append(self.path)
+
+    def table(self, name, columns):
+        """Return the writer for a table, creating it on first use"""
+        # Excel: one sheet per table; file formats: the first table at self.path, later ones next to it
+        if name in self.tables:
+            return self.tables[name]
+
+        if self.output_format == 'excel':
+            backend = _ExcelSheet(self.workbook.create_sheet(name), list(columns))
+        else:
+            path = self.path if not self.tables else self.path.with_name(
+                f"{self.path.stem}_{name.lower()}{self.path.suffix}")
+            if self.output_format == 'csv':
+                backend = _CsvTable(path, list(columns))
+            elif self.output_format == 'jsonl':
+                backend = _JsonlTable(path, list(columns))
+            else:
+                backend = _ParquetTable(path, list(columns), self.parquet_batch_size)
+            self.paths.append(path)
+
+        self.tables[name] = TableWriter(backend, columns)
+        return self.tables[name]
+
+    def close(self):
+        """Finish every table and save the workbook"""
+        for table in self.tables.values():
+            table.backend.close()
+        if self.output_format == 'excel':
+            self.workbook.save(self.path)
+            self.workbook.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
+
+class OrderedRowWriter:
+    """Write rows that complete out of order in input order, as soon as every earlier row is done"""
+
+    def __init__(self, table):
+        self.table = table
+        self.next_position = 0
+        self.waiting = {}  # position -> row that finished before an earlier one
+
+    def add(self, position, row):
+        """Hand in the row for position; contiguous rows are written right away"""
+        if position < self.next_position or position in self.waiting:
+            return
+        self.waiting[position] = row
+        while self.next_position in self.waiting:
+            self.table.write_row(self.waiting.pop(self.next_position))
+            self.next_position += 1
@@ -0,0 +1,95 @@
+# Page-readiness strategies: how long to wait after navigation before extracting
+from playwright.async_api import Error as PlaywrightError, TimeoutError as PlaywrightTimeoutError
+
+# Resolves once the DOM has had no mutations for quietMs, or after timeoutMs at the latest
+DOM_STABLE_JS = """
+([quietMs, timeoutMs]) => new Promise(resolve => {
+    const root = document.documentElement || document;
+    let quietTimer = null;
+    let deadline = null;
+    const observer = new MutationObserver(() => {
+        clearTimeout(quietTimer);
+        quietTimer = setTimeout(done, quietMs);
+    });
+    function done() {
+        observer.disconnect();
+        clearTimeout(quietTimer);
+        clearTimeout(deadline);
+        resolve(true);
+    }
+    observer.observe(root, {childList: true, subtree: true, attributes: true, characterData: true});
+    quietTimer = setTimeout(done, quietMs);
+    deadline = setTimeout(done, timeoutMs);
+})
+"""
+
+class ReadinessStrategy:
+    """Wait for the DOM to be parsed; base class for the stricter strategies"""
+    wait_until = 'domcontentloaded'  # Load state page.goto() waits for
+
+    def __init__(self, timeout=10000):
+        self.timeout = timeout
+
+    async def wait(self, page):
+        """Wait until the page is ready for extraction"""
+        pass
+
+class DomContentLoaded(ReadinessStrategy):
+    """Ready as soon as the initial HTML is parsed (static pages)"""
+    pass
+
+class NetworkIdle(ReadinessStrategy):
+    """Wait for 500 ms without network activity; slow on pages with polling or beacons"""
+
+    async def wait(self, page):
+        await page.wait_for_load_state('networkidle', timeout=self.timeout)
+
+class WaitForSelector(ReadinessStrategy):
+    """Ready once an element matching selector is attached"""
+
+    def __init__(self, selector, timeout=10000):
+        super().__init__(timeout)
+        self.selector = selector
+
+    async def wait(self, page):
+        await page.wait_for_selector(self.selector, state='attached', timeout=self.timeout)
+
+class WaitForAnySelector(WaitForSelector):
+    """Ready once an element matching any of the CSS selectors is attached"""
+
+    def __init__(self, selectors, timeout=10000):
+        super().__init__(', '.join(selectors), timeout)
+        self.selectors = list(selectors)
+
+class DomStable(ReadinessStrategy):
+    """Ready once the DOM has stopped changing for quiet_ms (client-rendered pages of unknown shape)"""
+
+    def __init__(self, quiet_ms=500, timeout=5000):
+        super().__init__(timeout)
+        self.quiet_ms = quiet_ms
+
+    async def wait(self, page):
+        await page.evaluate(DOM_STABLE_JS, [self.quiet_ms, self.timeout])
+
+DEFAULT_READINESS = DomStable()
+
+async def navigate(page, url, readiness=None, timeout=30000):
+    """Go to url and wait for the page to be ready; returns False if readiness timed out or failed"""
+    readiness = readiness or DEFAULT_READINESS
+    await page.goto(url, timeout=timeout, wait_until=readiness.wait_until)
+
+    # Readiness is best effort: extract whatever is there once the wait times out or fails
+    for attempt in range(2):
+        try:
+            await readiness.wait(page)
+            return True
+        except PlaywrightTimeoutError:
+            return False
+        except PlaywrightError:
+            # A client-side redirect destroys the execution context mid-wait: wait for the new document, retry once
+            if attempt:
+                return False
+            try:
+                await page.wait_for_load_state(timeout=readiness.timeout)
+            except PlaywrightError:
+                return False
@@ -0,0 +1,144 @@
+# Staged async pipeline: worker pools per stage connected by bounded queues
+import asyncio
+
+# Marks the end of a stage's input; one per worker of the receiving stage
+_DONE = object()
+
+class Stage:
+    """One pipeline stage: a pool of workers running handler on items from a bounded input queue"""
+
+    def __init__(self, name, handler, workers=1, queue_size=None, priority=None):
+        self.name = name
+        self.handler = handler
+        self.workers = workers
+        # A full queue blocks the upstream stage, so a slow stage slows its producers instead of piling up work
+        queue_class = asyncio.PriorityQueue if priority else asyncio.Queue
+        self.queue = queue_class(maxsize=queue_size or workers * 2)
+        # priority(item) -> number; queued items with the highest priority are handled first
+        self.priority = priority
+        self.sequence = 0
+        self.processed = 0
+        self.errors = 0
+        self.busy_time = 0.0
+        self.max_depth = 0
+        self.depth_total = 0
+        self.depth_samples = 0
+        self.started_at = None
+        self.finished_at = None
+
+    async def put(self, entry):
+        """Queue an entry for this stage, recording the queue depth it finds"""
+        depth = self.queue.qsize()
+        self.max_depth = max(self.max_depth, depth)
+        self.depth_total += depth
+        self.depth_samples += 1
+        await self.queue.put(self._wrap(entry))
+
+    async def close(self):
+        """Queue one end marker per worker, behind every queued item"""
+        for _ in range(self.workers):
+            await self.queue.put(self._wrap(_DONE))
+
+    async def get(self):
+        """Return the next entry: the oldest, or the highest priority one"""
+        entry = await self.queue.get()
+        return entry[2] if self.priority else entry
+
+    def _wrap(self, entry):
+        if not self.priority:
+            return entry
+        # The sequence number keeps equal priorities in arrival order and entries themselves out of comparisons
+        self.sequence += 1
+        rank = float('inf') if entry is _DONE else -self.priority(entry[1])
+        return (rank, self.sequence, entry)
+
+    def stats(self):
+        """Return processed/error counts, queue depth and throughput for this stage"""
+        elapsed = (self.finished_at or 0) - (self.started_at or 0)
+        return {
+            'workers': self.workers,
+            'processed': self.processed,
+            'errors': self.errors,
+            'max_queue_depth': self.max_depth,
+            'avg_queue_depth': round(self.depth_total / self.depth_samples, 1) if self.depth_samples else 0,
+            'busy_time': round(self.busy_time, 1),
+            'throughput': round(self.processed / elapsed, 2) if elapsed > 0 else 0,  # Items per second
+        }
+
+class Pipeline:
+    """Run items through stages in order; every stage has its own concurrency"""
+
+    def __init__(self):
+        self.stages = []
+
+    def add_stage(self, name, handler, workers=1, queue_size=None, priority=None):
+        """Append a stage; handler(item) is awaited and its result is passed to the next stage"""
+        self.stages.append(Stage(name, handler, workers, queue_size, priority))
+        return self
+
+    async def run(self, items):
+        """Feed items through every stage and return the final results in input order"""
+        items = list(items)
+        results = [None] * len(items)
+        loop = asyncio.get_running_loop()
+
+        async def feed():
+            for position, item in enumerate(items):
+                await self.stages[0].put((position, item))
+            await self.stages[0].close()
+
+        async def work(index, stage, finished):
+            next_stage = self.stages[index + 1] if index + 1 < len(self.stages) else None
+            while True:
+                entry = await stage.get()
+                if entry is _DONE:
+                    break
+
+                position, item = entry
+                started = loop.time()
+                if stage.started_at is None:
+                    stage.started_at = started
+                try:
+                    result = await stage.handler(item)
+                except Exception as e:
+                    # A failed item leaves the pipeline; its result stays None
+                    stage.errors += 1
+                    print(f"Error in {stage.name} stage: {e}")
+                    continue
+                finally:
+                    stage.busy_time += loop.time() - started
+                stage.processed += 1
+
+                if next_stage:
+                    await next_stage.put((position, result))
+                else:
+                    results[position] = result
+
+            # The last worker to finish closes the next stage's input
+            finished[0] += 1
+            if finished[0] == stage.workers:
+                stage.finished_at = loop.time()
+                if next_stage:
+                    await next_stage.close()
+
+        tasks = [asyncio.ensure_future(feed())]
+        for index, stage in enumerate(self.stages):
+            finished = [0]
+            tasks.extend(asyncio.ensure_future(work(index, stage, finished)) for _ in range(stage.workers))
+
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+        return results
+
+    def stats(self):
+        """Return per-stage stats keyed by stage name"""
+        return {stage.name: stage.stats() for stage in self.stages}
+
+    def print_stats(self):
+        """Print one line of stats per stage"""
+        for name, stats in self.stats().items():
+            print(f"Stage {name}: {stats['processed']} done, {stats['errors']} errors, {stats['workers']} workers, "
+                  f"{stats['throughput']}/s, queue depth avg {stats['avg_queue_depth']} max {stats['max_queue_depth']}")
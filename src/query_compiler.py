@@ -0,0 +1,78 @@
+# Query compiler that merges near-identical per-company searches into fewer operator searches
+from collections import namedtuple
+
+# A search to run, the original queries it stands for, and the slots those queries target
+CompiledQuery = namedtuple('CompiledQuery', ['query', 'sources', 'slots'])
+
+# Query suffixes that all ask for the careers/jobs page and can be OR-ed together
+CAREERS_TERMS = [
+    'careers', 'jobs', 'careers page', 'job openings', 'employment opportunities',
+    'current openings', 'hiring now', 'apply jobs',
+]
+
+# Query suffixes that look for a board on one ATS, mapped to the domain to restrict with site:
+PLATFORM_SITES = {
+    'lever jobs': 'jobs.lever.co',
+    'greenhouse careers': 'boards.greenhouse.io',
+    'zoho recruit': 'zohorecruit.com',
+    'smartrecruiters': 'jobs.smartrecruiters.com',
+    'workday jobs': 'myworkdayjobs.com',
+}
+
+class QueryCompiler:
+    """Combine compatible search intents into OR / site: searches"""
+
+    def __init__(self, max_terms=4, max_sites=5):
+        self.max_terms = max_terms
+        self.max_sites = max_sites
+
+    @staticmethod
+    def _intent(query, company_name):
+        """Return the part of query after the company name, or None if it does not start with it"""
+        prefix = company_name.lower()
+        normalized = ' '.join(query.lower().split())
+        if not prefix or not normalized.startswith(prefix):
+            return None
+        return normalized[len(prefix):].strip()
+
+    @staticmethod
+    def _quote(term):
+        """Quote multi-word terms so the search engine keeps them together"""
+        return f'"{term}"' if ' ' in term else term
+
+    def compile(self, queries, company_name):
+        """Compile queries (strings or (query, slots) pairs) into a shorter list of CompiledQuery"""
+        # Merged searches take the position of their first member, so the yield order is kept
+        entries = [(query, []) if isinstance(query, str) else (query[0], list(query[1])) for query in queries]
+        groups = {'careers': [], 'platforms': []}  # group name -> list of (position, term, source query, slots)
+        positioned = []  # (position of first source query, CompiledQuery)
+
+        for position, (query, slots) in enumerate(entries):
+            intent = self._intent(query, company_name)
+            if intent in CAREERS_TERMS:
+                groups['careers'].append((position, intent, query, slots))
+            elif intent in PLATFORM_SITES:
+                groups['platforms'].append((position, PLATFORM_SITES[intent], query, slots))
+            else:
+                positioned.append((position, CompiledQuery(query, [query], slots)))
+
+        for group, members in groups.items():
+            chunk_size = self.max_terms if group == 'careers' else self.max_sites
+            for start in range(0, len(members), chunk_size):
+                chunk = members[start:start + chunk_size]
+                positioned.append((chunk[0][0], self._merge(group, chunk, company_name)))
+
+        return [compiled_query for _, compiled_query in sorted(positioned, key=lambda item: item[0])]
+
+    def _merge(self, group, members, company_name):
+        """Build one operator search for a chunk of same-group intents"""
+        sources = [query for _, _, query, _ in members]
+        slots = list(dict.fromkeys(slot for _, _, _, member_slots in members for slot in member_slots))
+        if len(members) == 1:
+            return CompiledQuery(sources[0], sources, slots)
+
+        if group == 'careers':
+            terms = ' OR '.join(self._quote(term) for _, term, _, _ in members)
+        else:
+            terms = ' OR '.join(f'site:{site}' for _, site, _, _ in members)
+        return CompiledQuery(f'"{company_name}" ({terms})', sources, slots)
@@ -0,0 +1,104 @@
+# Adaptive query planning for company URL discovery
+from contextlib import aclosing
+
+# Output slots that discovery tries to fill
+DISCOVERY_SLOTS = ['website', 'linkedin', 'careers', 'jobs_platform']
+
+# Query templates ordered by expected yield, each with the slots it mainly fills.
+# The long-tail platform queries at the end only run while their slots are still empty.
+DISCOVERY_QUERIES = [
+    ('{company}', ['website', 'linkedin', 'careers']),
+    ('{company} careers', ['careers', 'jobs_platform']),
+    ('{company} linkedin company', ['linkedin']),
+    ('{company} jobs', ['jobs_platform', 'careers']),
+    ('{company} official website', ['website']),
+    ('{company} job openings', ['jobs_platform', 'careers']),
+    ('{company} careers page', ['careers']),
+    ('{company} employment opportunities', ['careers']),
+    ('{company} lever jobs', ['jobs_platform']),
+    ('{company} greenhouse careers', ['jobs_platform']),
+    ('{company} zoho recruit', ['jobs_platform']),
+    ('{company} smartrecruiters', ['jobs_platform']),
+    ('{company} workday jobs', ['jobs_platform']),
+    ('{company} current openings', ['jobs_platform', 'careers']),
+    ('{company} hiring now', ['jobs_platform', 'careers']),
+]
+
+# Minimum relevance score for a slot's best link to count as a confident answer
+DEFAULT_MIN_SCORES = {
+    'website': 10,        # company name found in the link
+    'linkedin': 25,       # company name plus a /company/ page
+    'careers': 13,        # company name plus a careers keyword
+    'jobs_platform': 15,  # company name plus a jobs keyword
+}
+
+class DiscoveryPlanner:
+    """Issue discovery queries incrementally and stop once every slot has a confident answer"""
+
+    def __init__(self, queries=DISCOVERY_QUERIES, min_scores=DEFAULT_MIN_SCORES, window=2, compiler=None):
+        self.queries = queries
+        # Optional QueryCompiler that merges compatible queries before they are planned
+        self.compiler = compiler
+        self.min_scores = min_scores
+        # Searches kept in flight per company; pacing between searches is left to BrowserManager
+        self.window = window
+        self.queries_planned = 0
+        self.queries_issued = 0
+        self.queries_merged = 0  # Planned queries answered by an issued search they were merged into
+
+    def plan(self, company_name):
+        """Return (query, target slots, planned queries it answers) for a company, in the order they should run"""
+        planned = [(template.format(company=company_name), slots) for template, slots in self.queries]
+        if self.compiler:
+            # A merged search targets the union of its members' slots
+            return [(compiled.query, compiled.slots, len(compiled.sources))
+                    for compiled in self.compiler.compile(planned, company_name)]
+        return [(query, slots, 1) for query, slots in planned]
+
+    def missing_slots(self, categorized_links):
+        """Return the slots whose best link is missing or below its confidence threshold"""
+        missing = set()
+        for slot in DISCOVERY_SLOTS:
+            links = categorized_links.get(slot, [])
+            if not links or links[0]['score'] < self.min_scores.get(slot, 0):
+                missing.add(slot)
+        return missing
+
+    async def discover(self, browser_manager, company_name, top_n=3):
+        """Run planned searches in a sliding window until all slots are filled; return merged categorized links"""
+        pending = self.plan(company_name)
+        self.queries_planned += len(self.queries)
+        results = []
+        merged = browser_manager.merge_categorized(results, top_n)
+
+        def next_queries():
+            # Pulled lazily by the search window, so each pick sees every result merged so far
+            for query, slots, sources in pending:
+                if self.missing_slots(merged).intersection(slots):
+                    self.queries_issued += 1
+                    # Merging only saved searches when the merged search actually runs
+                    self.queries_merged += sources - 1
+                    yield query
+
+        searches = browser_manager.stream_searches(
+            next_queries(), lambda query: browser_manager.search_categorized(query, company_name), self.window
+        )
+        async with aclosing(searches):
+            async for _, categorized in searches:
+                results.append(categorized)
+                merged = browser_manager.merge_categorized(results, top_n)
+                if not self.missing_slots(merged):
+                    break  # Cancels searches still in flight
+
+        print(f"Discovery for {company_name}: {len(results)} queries, missing slots: {sorted(self.missing_slots(merged)) or 'none'}")
+        return merged
+
+    def stats(self):
+        """Return planned vs issued query counts across all companies; saved = merged + stopped early"""
+        return {
+            'planned': self.queries_planned,
+            'issued': self.queries_issued,
+            'saved': self.queries_planned - self.queries_issued,
+            'merged': self.queries_merged,
+            'stopped_early': self.queries_planned - self.queries_issued - self.queries_merged,
+        }
@@ -0,0 +1,169 @@
+# Per-host politeness: token-bucket rate limits, robots.txt crawl-delay and concurrency caps
+import asyncio
+from collections import Counter
+from contextlib import asynccontextmanager
+from urllib.parse import urlsplit
+from urllib.robotparser import RobotFileParser
+import aiohttp
+
+from url_classifier import UrlClassifier
+
+DEFAULT_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:128.0) Gecko/20100101 Firefox/128.0"
+
+# Requests per second for hosts that need a different pace (matched on domain suffix)
+DEFAULT_HOST_RATES = {
+    'duckduckgo.com': 1.0,
+}
+
+class TokenBucket:
+    """Allow rate requests per second on average with bursts of up to burst requests"""
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = burst
+        self.updated = None
+        self.lock = asyncio.Lock()  # Waiters are served in arrival order
+
+    async def acquire(self):
+        """Take one token, sleeping until one is available"""
+        async with self.lock:
+            loop = asyncio.get_running_loop()
+            now = loop.time()
+            if self.updated is not None:
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+            if self.tokens < 1:
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+                self.tokens = 1
+                self.updated = loop.time()
+
+            self.tokens -= 1
+
+class HostRateLimiter:
+    """Shared politeness scheduler: every request to a host waits for that host's bucket and caps"""
+
+    def __init__(self, default_rate=1.0, burst=1, host_rates=DEFAULT_HOST_RATES, max_concurrent=8,
+                 max_per_host=2, respect_robots=True, max_crawl_delay=30, user_agent=DEFAULT_USER_AGENT):
+        self.default_rate = default_rate
+        self.burst = burst
+        self.host_rates = dict(host_rates)
+        self.max_per_host = max_per_host
+        self.respect_robots = respect_robots
+        self.max_crawl_delay = max_crawl_delay
+        self.user_agent = user_agent
+        # Global cap and per-host caps are independent
+        self.global_semaphore = asyncio.Semaphore(max_concurrent)
+        self.host_semaphores = {}
+        self.buckets = {}
+        self.crawl_delays = {}  # host -> task fetching the robots.txt crawl-delay (None if absent)
+        self.session = None
+        self.requests = Counter()
+        self.wait_time = 0.0
+
+    def set_host_rate(self, domain, rate):
+        """Use rate requests per second for domain and its subdomains"""
+        self.host_rates[domain] = rate
+        for host, bucket in self.buckets.items():
+            if host == domain or host.endswith('.' + domain):
+                bucket.rate = min(bucket.rate, rate)
+
+    def _configured_rate(self, host):
+        """Return the rate of the longest configured domain suffix of host, or the default rate"""
+        labels = host.split('.')
+        for i in range(len(labels)):
+            rate = self.host_rates.get('.'.join(labels[i:]))
+            if rate is not None:
+                return rate
+        return self.default_rate
+
+    async def _get_bucket(self, host, url):
+        """Return the host's token bucket, creating it from its rate and robots.txt on first use"""
+        bucket = self.buckets.get(host)
+        if bucket is None:
+            rate = self._configured_rate(host)
+            crawl_delay = await self._crawl_delay(host, url)
+            if crawl_delay:
+                rate = min(rate, 1 / crawl_delay)
+            # Another request may have created it while robots.txt was loading
+            bucket = self.buckets.setdefault(host, TokenBucket(rate, self.burst))
+        return bucket
+
+    async def _crawl_delay(self, host, url):
+        """Return the cached robots.txt crawl-delay for host, fetching it once per run"""
+        if not self.respect_robots:
+            return None
+
+        # The fetch runs in its own task, so a cancelled caller neither stalls nor cancels it for the others
+        task = self.crawl_delays.get(host)
+        if task is None:
+            task = asyncio.ensure_future(self._load_crawl_delay(url))
+            self.crawl_delays[host] = task
+        return await asyncio.shield(task)
+
+    async def _load_crawl_delay(self, url):
+        """Fetch the crawl-delay, resolving to None on any failure or cancellation"""
+        try:
+            return await self._fetch_crawl_delay(url)
+        except (Exception, asyncio.CancelledError):
+            return None
+
+    async def _fetch_crawl_delay(self, url):
+        """Download robots.txt for url's host and read its crawl-delay; None when unavailable"""
+        parts = urlsplit(url)
+        try:
+            if self.session is None:
+                self.session = aiohttp.ClientSession(
+                    headers={"User-Agent": self.user_agent}, timeout=aiohttp.ClientTimeout(total=5)
+                )
+            async with self.session.get(f"{parts.scheme}://{parts.netloc}/robots.txt") as response:
+                if response.status != 200:
+                    return None
+                text = await response.text(errors='replace')
+        except Exception:
+            return None
+
+        parser = RobotFileParser()
+        parser.parse(text.splitlines())
+        delay = parser.crawl_delay(self.user_agent)
+        if delay is None:
+            request_rate = parser.request_rate(self.user_agent)
+            delay = request_rate.seconds / request_rate.requests if request_rate else None
+        return min(float(delay), self.max_crawl_delay) if delay else None
+
+    @asynccontextmanager
+    async def limit(self, url):
+        """Hold a politeness slot for one request to url"""
+        host = UrlClassifier.host_of(url)
+        if not host or urlsplit(url).scheme not in ('http', 'https'):
+            yield  # about:blank, data: URLs and the like never reach a server
+            return
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        host_semaphore = self.host_semaphores.setdefault(host, asyncio.Semaphore(self.max_per_host))
+        async with host_semaphore:
+            bucket = await self._get_bucket(host, url)
+            await bucket.acquire()
+            async with self.global_semaphore:
+                self.wait_time += loop.time() - started
+                self.requests[host] += 1
+                yield
+
+    async def close(self):
+        """Close the robots.txt HTTP session"""
+        if self.session:
+            await self.session.close()
+            self.session = None
+
+    def stats(self):
+        """Return request counts, time spent waiting for tokens and the busiest hosts"""
+        return {
+            'requests': sum(self.requests.values()),
+            'hosts': len(self.requests),
+            'wait_time': round(self.wait_time, 1),
+            'busiest_hosts': self.requests.most_common(3),
+            'crawl_delays': {host: task.result() for host, task in self.crawl_delays.items()
+                             if task.done() and not task.cancelled() and task.result()},
+        }
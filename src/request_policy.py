@@ -0,0 +1,96 @@
+# Network request routing policy applied to every pooled Playwright page
+from collections import Counter
+from urllib.parse import urlsplit
+
+# Resource types that link and job extraction never reads
+BLOCKED_RESOURCE_TYPES = {'image', 'font', 'media', 'stylesheet'}
+
+# Analytics, ads and session-recording hosts (matched on domain suffix)
+TRACKER_DOMAINS = {
+    'google-analytics.com', 'googletagmanager.com', 'googleadservices.com', 'doubleclick.net',
+    'googlesyndication.com', 'facebook.net', 'connect.facebook.net', 'hotjar.com', 'segment.io',
+    'segment.com', 'mixpanel.com', 'newrelic.com', 'nr-data.net', 'optimizely.com', 'hs-analytics.net',
+    'hs-scripts.com', 'clarity.ms', 'ads-twitter.com', 'quantserve.com', 'scorecardresearch.com',
+    'fullstory.com', 'crazyegg.com', 'adroll.com', 'bat.bing.com', 'snap.licdn.com', 'px.ads.linkedin.com',
+}
+
+# Page domain -> resource types to let through anyway, for sites that break without them
+DEFAULT_DOMAIN_OVERRIDES = {}
+
+# Typical transfer size per resource type, used to estimate the bytes saved by blocking
+ESTIMATED_BYTES = {
+    'image': 40_000, 'font': 35_000, 'media': 500_000, 'stylesheet': 25_000,
+    'script': 30_000, 'xhr': 5_000, 'fetch': 5_000, 'other': 5_000,
+}
+
+def _matches_domain(host, domains):
+    """Check if host is one of domains or a subdomain of one"""
+    labels = host.split('.')
+    return any('.'.join(labels[i:]) in domains for i in range(len(labels)))
+
+class RequestRoutingPolicy:
+    """Abort requests for resource types and tracker hosts that extraction never needs"""
+
+    def __init__(self, blocked_types=BLOCKED_RESOURCE_TYPES, blocked_hosts=TRACKER_DOMAINS,
+                 domain_overrides=DEFAULT_DOMAIN_OVERRIDES):
+        self.blocked_types = set(blocked_types)
+        self.blocked_hosts = set(blocked_hosts)
+        self.domain_overrides = {domain: set(types) for domain, types in domain_overrides.items()}
+        self.allowed_requests = 0
+        self.blocked_requests = 0
+        self.blocked_by_type = Counter()
+        self.bytes_saved = 0
+
+    def allow_for_domain(self, domain, *resource_types):
+        """Let the given resource types through on domain (and its subdomains)"""
+        self.domain_overrides.setdefault(domain, set()).update(resource_types)
+
+    def should_block(self, resource_type, request_url, page_url=''):
+        """Decide whether a request made while on page_url should be aborted"""
+        # Never block the navigation itself
+        if resource_type == 'document':
+            return False
+
+        request_host = urlsplit(request_url).hostname or ''
+        if _matches_domain(request_host, self.blocked_hosts):
+            return True
+
+        if resource_type not in self.blocked_types:
+            return False
+
+        page_host = urlsplit(page_url).hostname or ''
+        for domain, allowed_types in self.domain_overrides.items():
+            if resource_type in allowed_types and (
+                    _matches_domain(page_host, {domain}) or _matches_domain(request_host, {domain})):
+                return False
+        return True
+
+    async def apply(self, page):
+        """Install the policy on a page; every request it makes goes through _handle_route"""
+        await page.route("**/*", self._handle_route)
+
+    async def _handle_route(self, route):
+        """Abort or continue a single intercepted request"""
+        request = route.request
+        try:
+            page_url = request.frame.url
+        except Exception:
+            page_url = ''  # Service worker requests have no frame
+
+        if self.should_block(request.resource_type, request.url, page_url):
+            self.blocked_requests += 1
+            self.blocked_by_type[request.resource_type] += 1
+            self.bytes_saved += ESTIMATED_BYTES.get(request.resource_type, ESTIMATED_BYTES['other'])
+            await route.abort()
+        else:
+            self.allowed_requests += 1
+            await route.continue_()
+
+    def stats(self):
+        """Return request counters and the estimated bytes saved"""
+        return {
+            'allowed': self.allowed_requests,
+            'blocked': self.blocked_requests,
+            'blocked_by_type': dict(self.blocked_by_type),
+            'bytes_saved': self.bytes_saved
+        }
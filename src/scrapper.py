@@ -3,173 +3,70 @@ from playwright.async_api import async_playwright
 from playwright_stealth import Stealth
 import asyncio
 from collections import deque
-from bs4 import BeautifulSoup
+from contextlib import aclosing
 import re
-import urllib.parse
+from pathlib import Path
+
+from search_cache import SearchCache
+from search_backends import create_search_backend
+from serp_pool import LINK_CATEGORIES, SerpParserPool
+from url_classifier import default_classifier
+from url_canonical import url_key, dedupe_urls
+from request_policy import RequestRoutingPolicy
+from rate_limiter import HostRateLimiter
+import page_readiness
+
+DEFAULT_CACHE_PATH = Path(__file__).parent.parent / "output" / "search_cache.db"
+
+# Order in which categories are listed when flattening results
+CATEGORY_PRIORITY = ['jobs_platform', 'linkedin', 'careers', 'website', 'other']
 
 class BrowserManager:
-    def __init__(self, max_concurrent_tabs=2, headless=True):
+    def __init__(self, max_concurrent_tabs=2, headless=True, cache_path=DEFAULT_CACHE_PATH,
+                 cache_ttl=7 * 24 * 3600, cache_max_entries=5000,
+                 search_backend="http", fallback_backend="playwright", block_resources=True, routing_policy=None,
+                 rate_limiter=None, parse_workers=2, parse_executor="process"):
         self.playwright_context = None
         self.playwright = None
         self.browser = None
+        self.initialized = False
         self.max_concurrent_tabs = max_concurrent_tabs
         self.headless = headless
         self.semaphore = asyncio.Semaphore(max_concurrent_tabs)
         self.tab_pool = deque()
         self.active_tabs = set()
-        self.search_cache = {}  # Cache search results to avoid duplicate queries
-    
-    def filter_and_categorize_links(self, html_content, company_name, query_type="general"):
-        """Use BeautifulSoup to parse page and intelligently filter/categorize links"""
-        soup = BeautifulSoup(html_content, 'html.parser')
-        categorized_links = {
-            'website': [],
-            'linkedin': [],
-            'careers': [],
-            'jobs_platform': [],
-            'other': []
-        }
-        
-        # Find all links in the page
-        all_links = soup.find_all('a', href=True)
-        
-        company_clean = company_name.lower().replace(' ', '').replace('-', '').replace('_', '')
-        
-        for link_elem in all_links:
-            href = link_elem.get('href', '')
-            text = link_elem.get_text(strip=True).lower()
-            title = link_elem.get('title', '').lower()
-            
-            # Skip invalid links
-            if not href or not href.startswith('http') or 'duckduckgo.com' in href:
-                continue
-            
-            href_lower = href.lower()
-            
-            # Categorize links based on domain and content
-            if self._is_job_platform(href_lower):
-                categorized_links['jobs_platform'].append({
-                    'url': href,
-                    'text': text,
-                    'title': title,
-                    'score': self._calculate_relevance_score(href, text, title, company_name, 'jobs')
-                })
-            elif 'linkedin.com' in href_lower and ('company' in href_lower or 'in/' in href_lower):
-                categorized_links['linkedin'].append({
-                    'url': href,
-                    'text': text,
-                    'title': title,
-                    'score': self._calculate_relevance_score(href, text, title, company_name, 'linkedin')
-                })
-            elif self._is_careers_page(href_lower, text, title):
-                categorized_links['careers'].append({
-                    'url': href,
-                    'text': text,
-                    'title': title,
-                    'score': self._calculate_relevance_score(href, text, title, company_name, 'careers')
-                })
-            elif self._is_company_website(href_lower, company_name):
-                categorized_links['website'].append({
-                    'url': href,
-                    'text': text,
-                    'title': title,
-                    'score': self._calculate_relevance_score(href, text, title, company_name, 'website')
-                })
-            else:
-                # Only include other links if they seem relevant
-                if company_clean in href_lower or any(word in text for word in company_name.lower().split()):
-                    categorized_links['other'].append({
-                        'url': href,
-                        'text': text,
-                        'title': title,
-                        'score': self._calculate_relevance_score(href, text, title, company_name, 'other')
-                    })
-        
-        # Sort each category by relevance score and return top results
-        for category in categorized_links:
-            categorized_links[category] = sorted(
-                categorized_links[category], 
-                key=lambda x: x['score'], 
-                reverse=True
-            )[:5]  # Keep top 5 for each category
-        
-        return categorized_links
-    
-    def _is_job_platform(self, url):
-        """Check if URL is from a known job platform"""
-        job_platforms = [
-            'lever.co', 'greenhouse.io', 'zohorecruit.com', 'zoho.recruit',
-            'smartrecruiters.com', 'workday.com', 'bamboohr.com', 'jobvite.com',
-            'icims.com', 'successfactors.com', 'talentsoft.com', 'cornerstone.ondemand.com'
-        ]
-        return any(platform in url for platform in job_platforms)
-    
-    def _is_careers_page(self, url, text, title):
-        """Check if this appears to be a careers page"""
-        career_indicators = ['careers', 'jobs', 'employment', 'opportunities', 'hiring', 'openings', 'join-us', 'work-with-us', 'apply']
-        
-        # Check URL path
-        if any(indicator in url for indicator in career_indicators):
-            return True
-        
-        # Check link text and title
-        combined_text = f"{text} {title}".lower()
-        if any(indicator in combined_text for indicator in career_indicators):
-            return True
-            
-        return False
+        # Persistent cache of search results, shared across runs (cache_path=None keeps it in memory)
+        self.search_cache = SearchCache(cache_path, ttl=cache_ttl, max_entries=cache_max_entries)
+        # Searches go through the primary backend and fall back to the other one when it fails
+        self.search_backend = create_search_backend(search_backend, self)
+        self.fallback_backend = create_search_backend(fallback_backend, self) if fallback_backend else None
+        self.browser_lock = asyncio.Lock()
+        self.classifier = default_classifier
+        # Aborts images, fonts, media, stylesheets and trackers on every page this manager opens
+        self.routing_policy = routing_policy or (RequestRoutingPolicy() if block_resources else None)
+        # Per-host politeness shared by searches and every page navigation (pass one in to share it wider)
+        self.rate_limiter = rate_limiter or HostRateLimiter()
+        # Results pages are parsed and scored off the event loop (parse_workers=0 parses inline)
+        self.serp_pool = SerpParserPool(parse_workers, parse_executor)
     
-    def _is_company_website(self, url, company_name):
-        """Check if URL appears to be the company's official website"""
-        company_clean = company_name.lower().replace(' ', '').replace('-', '').replace('_', '').replace('.', '')
-        url_domain = url.replace('https://', '').replace('http://', '').replace('www.', '').split('/')[0]
-        
-        # Exclude known non-company domains
-        excluded_domains = [
-            'linkedin.com', 'facebook.com', 'twitter.com', 'youtube.com', 'instagram.com',
-            'glassdoor.com', 'indeed.com', 'monster.com', 'ziprecruiter.com', 'wikipedia.org',
-            'crunchbase.com', 'bloomberg.com', 'reuters.com', 'forbes.com'
-        ]
-        
-        if any(excluded in url for excluded in excluded_domains):
-            return False
+    async def initialize(self):
+        """Start the search backend, and the browser when the backend needs one"""
+        await self.search_backend.start()
         
-        # Check if company name appears in domain
-        return company_clean[:8] in url_domain.replace('-', '').replace('_', '')
+        # HTTP-only searching needs no browser; it is launched on demand for fallback searches or job scraping
+        if self.search_backend.needs_browser:
+            await self._ensure_browser()
+        self.initialized = True
     
-    def _calculate_relevance_score(self, url, text, title, company_name, category):
-        """Calculate relevance score for a link"""
-        score = 0
-        company_words = company_name.lower().split()
-        combined_text = f"{url} {text} {title}".lower()
-        
-        # Company name matching
-        for word in company_words:
-            if len(word) > 2:  # Skip very short words
-                if word in combined_text:
-                    score += 10
-        
-        # Category-specific scoring
-        if category == 'jobs':
-            job_keywords = ['jobs', 'careers', 'hiring', 'openings', 'apply', 'employment']
-            score += sum(5 for keyword in job_keywords if keyword in combined_text)
-        elif category == 'linkedin':
-            if 'company' in combined_text:
-                score += 15
-        elif category == 'careers':
-            career_keywords = ['careers', 'jobs', 'work', 'team', 'opportunities']
-            score += sum(3 for keyword in career_keywords if keyword in combined_text)
-        elif category == 'website':
-            # Prefer shorter, simpler URLs (likely official sites)
-            if len(url) < 50:
-                score += 5
-            if url.endswith('.com'):
-                score += 5
-        
-        return score
+    async def _ensure_browser(self):
+        """Launch the browser once, on first use"""
+        async with self.browser_lock:
+            if self.browser:
+                return
+            await self._launch_browser()
     
-    async def initialize(self):
-        """Initialize the browser once"""
+    async def _launch_browser(self):
+        """Launch the stealth Firefox instance"""
         stealth = Stealth()
         self.playwright_context = stealth.use_async(async_playwright())
         self.playwright = await self.playwright_context.__aenter__()
@@ -181,15 +78,32 @@ class BrowserManager:
         )
         
         # Pre-create only one tab initially to avoid too many windows
-        page = await self.browser.new_page()
+        page = await self._open_page()
         self.tab_pool.append(page)
     
+    async def new_page(self):
+        """Open a new browser page, launching the browser if needed"""
+        await self._ensure_browser()
+        return await self._open_page()
+    
+    async def _open_page(self):
+        """Open a page on the running browser with the request routing policy installed"""
+        page = await self.browser.new_page()
+        if self.routing_policy:
+            await self.routing_policy.apply(page)
+        return page
+    
+    async def navigate(self, page, url, readiness=None, timeout=30000):
+        """Load url in page once the host's rate limit allows it, then wait for the readiness strategy"""
+        async with self.rate_limiter.limit(url):
+            return await page_readiness.navigate(page, url, readiness, timeout)
+    
     async def _get_tab(self):
         """Get a tab from the pool or create a new one"""
         if self.tab_pool:
             return self.tab_pool.popleft()
         else:
-            return await self.browser.new_page()
+            return await self.new_page()
     
     async def _return_tab(self, page):
         """Return a tab to the pool for reuse"""
@@ -205,82 +119,116 @@ class BrowserManager:
                 pass
     
     async def search(self, query: str, company_name: str = ""):
-        """Perform search using existing browser with BeautifulSoup parsing and intelligent filtering"""
-        if not self.browser:
-            raise Exception("Browser not initialized. Call initialize() first.")
+        """Perform search through the configured backend and return a flat, priority-ordered link list"""
+        if company_name:
+            categorized_links = await self.search_categorized(query, company_name)
+            return self.flatten_categorized(categorized_links)
+        
+        return await self._cached_search(query, "", kind="links", empty=[])
+    
+    async def search_categorized(self, query, company_name):
+        """Fetch the results page once and return scored links per category (cached)"""
+        return await self._cached_search(query, company_name, kind="categorized", empty=self._empty_categories())
+    
+    async def _cached_search(self, query, company_name, kind, empty):
+        """Serve a search from the cache, or run it once for all concurrent callers"""
+        if not self.initialized:
+            raise Exception("BrowserManager not initialized. Call initialize() first.")
         
         # Check cache first to avoid duplicate searches
-        cache_key = f"{query}_{company_name}"
-        if cache_key in self.search_cache:
+        cache_key = SearchCache.make_key(query, company_name, kind)
+        cached_result = self.search_cache.get(cache_key)
+        if cached_result is not None:
             print(f"Using cached results for: {query[:50]}...")
-            return self.search_cache[cache_key]
+            return cached_result
         
-        async with self.semaphore:  # Limit concurrent tabs
-            page = await self._get_tab()
-            self.active_tabs.add(page)
-            
-            try:
-                # URL encode the query properly
-                encoded_query = urllib.parse.quote_plus(query)
-                search_url = f"https://duckduckgo.com/?q={encoded_query}"
-                
-                print(f"Searching: {query[:50]}...")
-                await page.goto(search_url, timeout=30000)
-                
-                # Wait for page to load and get full HTML content
-                await page.wait_for_load_state('networkidle', timeout=10000)
-                html_content = await page.content()
-                
-                # Use BeautifulSoup for intelligent parsing and filtering
-                if company_name:
-                    categorized_links = self.filter_and_categorize_links(html_content, company_name)
-                    
-                    # Extract URLs from categorized results, prioritizing by category
-                    links = []
-                    # Priority order: jobs_platform -> linkedin -> careers -> website -> other
-                    for category in ['jobs_platform', 'linkedin', 'careers', 'website', 'other']:
-                        for link_data in categorized_links[category]:
-                            if link_data['url'] not in links:  # Avoid duplicates
-                                links.append(link_data['url'])
-                else:
-                    # Fallback to basic link extraction if no company name provided
-                    soup = BeautifulSoup(html_content, 'html.parser')
-                    links = []
-                    
-                    # Try DuckDuckGo result selectors
-                    selectors = [
-                        'a[data-testid="result-title-a"]',
-                        'a.result__a',
-                        'h2.result__title a',
-                        '.results .result a'
-                    ]
-                    
-                    for selector in selectors:
-                        try:
-                            result_links = soup.select(selector)
-                            for link in result_links:
-                                url = link.get('href')
-                                if url and url.startswith("http") and "duckduckgo.com" not in url:
-                                    if url not in links:  # Avoid duplicates
-                                        links.append(url)
-                            if links:  # If we found links with this selector, stop trying others
-                                break
-                        except Exception as e:
-                            continue
-                
-                print(f"Found {len(links)} filtered links for: {query[:30]}...")
+        try:
+            # Identical searches already in flight share one page load
+            return await self.search_cache.coalesce(cache_key, lambda: self._search_uncached(query, company_name))
+        except Exception as e:
+            print(f"Error in search '{query}': {e}")
+            return empty
+    
+    async def _search_uncached(self, query, company_name=""):
+        """Load the search results page and extract links, without consulting the cache"""
+        async with self.semaphore:  # Limit concurrent searches
+            print(f"Searching: {query[:50]}...")
+            html_content = await self._fetch_results_page(query)
+        
+        # Parse and filter the results page in the parser pool; without a company name,
+        # fall back to basic result-title extraction
+        result, parse_time = await self.serp_pool.parse(html_content, company_name, self.classifier)
+        if company_name:
+            found = sum(len(links) for links in result.values())
+            print(f"Found {found} categorized links for: {query[:30]}... (parsed in {parse_time * 1000:.0f} ms)")
+            return result
+        
+        print(f"Found {len(result)} filtered links for: {query[:30]}... (parsed in {parse_time * 1000:.0f} ms)")
+        return result
+    
+    
+    async def _fetch_results_page(self, query):
+        """Fetch the results page HTML, falling back to the secondary backend on failure"""
+        try:
+            return await self._fetch_with(self.search_backend, query)
+        except Exception as e:
+            if not self.fallback_backend:
+                raise
+            print(f"{self.search_backend.name} search failed ({e}), falling back to {self.fallback_backend.name}")
+        
+        if self.fallback_backend.needs_browser:
+            await self._ensure_browser()
+        return await self._fetch_with(self.fallback_backend, query)
+    
+    async def _fetch_with(self, backend, query):
+        """Fetch a results page through the rate limiter"""
+        if backend.needs_browser:
+            return await backend.fetch(query)  # Browser backends load the page through navigate()
+        async with self.rate_limiter.limit(backend.base_url):
+            return await backend.fetch(query)
+    
+    async def stream_searches(self, queries, search_fn, window=None):
+        """Run search_fn over queries with up to window in flight and yield (query, result) as each completes"""
+        # queries is consumed lazily, so a generator can decide what to search next from earlier results
+        window = window or self.max_concurrent_tabs
+        queries = iter(queries)
+        in_flight = {}
+        exhausted = False
+        
+        try:
+            while True:
+                # Refill free slots as soon as a search finishes instead of waiting for a whole batch
+                while not exhausted and len(in_flight) < window:
+                    query = next(queries, None)
+                    if query is None:
+                        exhausted = True
+                    else:
+                        in_flight[asyncio.ensure_future(search_fn(query))] = query
+                if not in_flight:
+                    return
                 
-                # Cache the results
-                self.search_cache[cache_key] = links
-                return links
-            
-            except Exception as e:
-                print(f"Error in search '{query}': {e}")
-                return []
-            
-            finally:
-                self.active_tabs.discard(page)
-                await self._return_tab(page)
+                done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    query = in_flight.pop(task)
+                    try:
+                        result = task.result()
+                    except Exception as e:
+                        print(f"Error in search '{query}': {e}")
+                        continue
+                    yield query, result
+        finally:
+            # The caller stopped early: drop the searches it no longer needs
+            for task in in_flight:
+                task.cancel()
+    
+    async def _run_searches(self, queries, search_fn):
+        """Run search_fn over queries through the search window and return (query, result) pairs in query order"""
+        order = {query: position for position, query in enumerate(queries)}
+        query_results = []
+        async with aclosing(self.stream_searches(queries, search_fn)) as results:
+            async for query, result in results:
+                query_results.append((query, result))
+        return sorted(query_results, key=lambda item: order[item[0]])
     
     async def search_multiple(self, queries, company_name=""):
         """Perform multiple searches with controlled concurrency and intelligent filtering"""
@@ -291,105 +239,66 @@ class BrowserManager:
         unique_queries = list(dict.fromkeys(queries))  # Preserves order while removing duplicates
         print(f"Performing {len(unique_queries)} unique searches (was {len(queries)})")
         
-        # Process searches in smaller batches to avoid too many concurrent tabs
-        batch_size = min(self.max_concurrent_tabs, 2)  # Reduce batch size for more stable processing
-        all_links = []
+        query_results = await self._run_searches(unique_queries, lambda query: self.search(query, company_name))
+        all_links = [link for _, links in query_results for link in links]
         
-        for i in range(0, len(unique_queries), batch_size):
-            batch = unique_queries[i:i + batch_size]
-            print(f"Processing batch {i//batch_size + 1}/{(len(unique_queries) + batch_size - 1)//batch_size}")
-            
-            # Create tasks with company name context
-            tasks = [self.search(query, company_name) for query in batch]
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            
-            # Process results and handle exceptions
-            for j, result in enumerate(results):
-                if isinstance(result, Exception):
-                    print(f"Error in search '{batch[j]}': {result}")
-                else:
-                    all_links.extend(result)
-            
-            # Small delay between batches to be respectful to the search engine
-            if i + batch_size < len(unique_queries):
-                await asyncio.sleep(2)  # Slightly longer delay
-        
-        # Remove duplicates from final results while preserving order
-        seen = set()
-        unique_links = []
-        for link in all_links:
-            if link not in seen:
-                seen.add(link)
-                unique_links.append(link)
+        # Remove duplicates (including equivalent forms of one URL) from final results while preserving order
+        unique_links = dedupe_urls(all_links)
         
         print(f"Final result: {len(unique_links)} unique links from {len(all_links)} total")
         return unique_links
     
-    async def search_with_categorization(self, queries, company_name):
-        """Perform searches and return categorized results"""
-        if not queries or not company_name:
-            return {}
-        
-        all_categorized = {
-            'website': [],
-            'linkedin': [],
-            'careers': [],
-            'jobs_platform': [],
-            'other': []
-        }
-        
-        # Process queries in batches
-        batch_size = min(self.max_concurrent_tabs, 2)
+    @staticmethod
+    def _empty_categories():
+        """Return an empty result with one list per link category"""
+        return {category: [] for category in LINK_CATEGORIES}
+    
+    @staticmethod
+    def flatten_categorized(categorized_links):
+        """Flatten categorized links into a URL list ordered by category priority"""
+        links = []
+        for category in CATEGORY_PRIORITY:
+            for link_data in categorized_links.get(category, []):
+                links.append(link_data['url'])
+        return dedupe_urls(links)  # Avoid duplicates
+    
+    @staticmethod
+    def merge_categorized(categorized_results, top_n=3):
+        """Merge per-query categorized results, keeping the top_n unique links per category by score"""
+        merged = BrowserManager._empty_categories()
         
-        for i in range(0, len(queries), batch_size):
-            batch = queries[i:i + batch_size]
-            
-            for query in batch:
-                try:
-                    cache_key = f"{query}_{company_name}"
-                    
-                    if cache_key not in self.search_cache:
-                        # Perform search if not cached
-                        await self.search(query, company_name)
-                    
-                    # Get page content and categorize
-                    async with self.semaphore:
-                        page = await self._get_tab()
-                        try:
-                            encoded_query = urllib.parse.quote_plus(query)
-                            search_url = f"https://duckduckgo.com/?q={encoded_query}"
-                            await page.goto(search_url, timeout=30000)
-                            await page.wait_for_load_state('networkidle', timeout=10000)
-                            html_content = await page.content()
-                            
-                            categorized = self.filter_and_categorize_links(html_content, company_name)
-                            
-                            # Merge results
-                            for category in all_categorized:
-                                all_categorized[category].extend(categorized[category])
-                                
-                        finally:
-                            await self._return_tab(page)
-                
-                except Exception as e:
-                    print(f"Error in categorized search '{query}': {e}")
+        for category in merged:
+            best_by_url = {}
+            for categorized in categorized_results:
+                for link_data in categorized.get(category, []):
+                    key = url_key(link_data['url'])
+                    if key not in best_by_url or link_data['score'] > best_by_url[key]['score']:
+                        best_by_url[key] = link_data
             
-            # Delay between batches
-            if i + batch_size < len(queries):
-                await asyncio.sleep(2)
+            merged[category] = sorted(best_by_url.values(), key=lambda x: x['score'], reverse=True)[:top_n]
         
-        # Remove duplicates and sort by score
-        for category in all_categorized:
-            seen_urls = set()
-            unique_links = []
-            for link_data in all_categorized[category]:
-                if link_data['url'] not in seen_urls:
-                    seen_urls.add(link_data['url'])
-                    unique_links.append(link_data)
-            
-            all_categorized[category] = sorted(unique_links, key=lambda x: x['score'], reverse=True)[:3]
+        return merged
+    
+    def best_urls(self, categorized_links):
+        """Pick the best URL per output slot from categorized links ('' when nothing was found)"""
+        def top(category):
+            links = categorized_links.get(category, [])
+            return links[0]['url'] if links else ''
         
-        return all_categorized
+        # Relevant 'other' links stand in for the website, unless they are social/news/job-board pages
+        fallback_website = next(
+            (link_data['url'] for link_data in categorized_links.get('other', [])
+             if not self.classifier.is_excluded(link_data['url'])),
+            ''
+        )
+        
+        return {
+            'website': top('website') or fallback_website,
+            'linkedin': top('linkedin'),
+            'careers': top('careers'),
+            'jobs_platform': top('jobs_platform')
+        }
+    
     
     async def close(self):
         """Close the browser and cleanup"""
@@ -409,10 +318,32 @@ class BrowserManager:
                 pass
         self.active_tabs.clear()
         
+        await self.search_backend.close()
+        if self.fallback_backend:
+            await self.fallback_backend.close()
+        
         if self.browser:
             await self.browser.close()
         if self.playwright_context:
             await self.playwright_context.__aexit__(None, None, None)
+        
+        if self.routing_policy and self.routing_policy.blocked_requests:
+            routing_stats = self.routing_policy.stats()
+            print(f"Request routing: {routing_stats['blocked']} requests blocked, ~{routing_stats['bytes_saved'] // 1024} KB saved")
+        
+        await self.rate_limiter.close()
+        limiter_stats = self.rate_limiter.stats()
+        print(f"Rate limiter: {limiter_stats['requests']} requests to {limiter_stats['hosts']} hosts, {limiter_stats['wait_time']}s spent waiting")
+        
+        self.serp_pool.close()
+        if self.serp_pool.pages:
+            parse_stats = self.serp_pool.stats()
+            print(f"SERP parsing ({parse_stats['executor']}, {parse_stats['workers']} workers): {parse_stats['pages']} pages, "
+                  f"avg {parse_stats['avg_parse_ms']} ms, max {parse_stats['max_parse_ms']} ms, avg queue wait {parse_stats['avg_wait_ms']} ms")
+        
+        cache_stats = self.search_cache.stats()
+        print(f"Search cache: {cache_stats['hits']} hits, {cache_stats['coalesced']} coalesced, {cache_stats['entries']} entries")
+        self.search_cache.close()
 
 # Backward compatibility function
 async def duckduckgo_search(query: str, company_name: str = ""):
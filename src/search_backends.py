@@ -0,0 +1,117 @@
+# Search backends that fetch DuckDuckGo result pages for BrowserManager
+import asyncio
+import urllib.parse
+import aiohttp
+
+from page_readiness import WaitForAnySelector
+from dom_extract import extract_serp_html
+
+DEFAULT_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:128.0) Gecko/20100101 Firefox/128.0"
+)
+
+class SearchBackendError(Exception):
+    """Raised when a backend cannot return a usable results page"""
+    pass
+
+class SearchBackend:
+    """Interface for fetching the raw HTML of a search results page"""
+    name = "base"
+    needs_browser = False
+
+    async def start(self):
+        """Acquire any resources the backend needs"""
+        pass
+
+    async def fetch(self, query):
+        """Return the results page HTML for query"""
+        raise NotImplementedError
+
+    async def close(self):
+        """Release backend resources"""
+        pass
+
+class HttpSearchBackend(SearchBackend):
+    """Fetch DuckDuckGo's static HTML endpoint over a pooled HTTP session, no browser required"""
+    name = "http"
+
+    def __init__(self, base_url="https://html.duckduckgo.com/html/", max_connections=4, timeout=15,
+                 user_agent=DEFAULT_USER_AGENT):
+        # base_url can point at a local stand-in server for testing
+        self.base_url = base_url
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.user_agent = user_agent
+        self.session = None
+
+    async def start(self):
+        if self.session is None:
+            connector = aiohttp.TCPConnector(limit=self.max_connections, ttl_dns_cache=300)
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers={'User-Agent': self.user_agent, 'Accept-Language': 'en-US,en;q=0.9'}
+            )
+
+    async def fetch(self, query):
+        if self.session is None:
+            await self.start()
+
+        search_url = f"{self.base_url}?{urllib.parse.urlencode({'q': query})}"
+        try:
+            async with self.session.get(search_url) as response:
+                html_content = await response.text()
+                status = response.status
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise SearchBackendError(f"HTTP search failed: {e}") from e
+
+        # DuckDuckGo answers rate-limited clients with 202 and a challenge page instead of results
+        if status != 200:
+            raise SearchBackendError(f"HTTP search returned status {status}")
+        if 'result__a' not in html_content and 'no-results' not in html_content:
+            raise SearchBackendError("HTTP search returned no result markup")
+
+        return html_content
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+class PlaywrightSearchBackend(SearchBackend):
+    """Load the full DuckDuckGo page in a pooled browser tab"""
+    name = "playwright"
+    needs_browser = True
+    # The SERP is ready once a result title or the no-results notice is rendered
+    readiness = WaitForAnySelector([
+        '[data-testid="result-title-a"]', 'a.result__a', '.no-results', '[data-testid="no-results"]'
+    ])
+
+    def __init__(self, browser_manager, base_url="https://duckduckgo.com/"):
+        self.browser_manager = browser_manager
+        self.base_url = base_url
+
+    async def fetch(self, query):
+        page = await self.browser_manager._get_tab()
+        self.browser_manager.active_tabs.add(page)
+
+        try:
+            encoded_query = urllib.parse.quote_plus(query)
+            search_url = f"{self.base_url}?q={encoded_query}"
+
+            await self.browser_manager.navigate(page, search_url, self.readiness)
+            # Only the result anchors leave the page, collected in one evaluation instead of serializing the whole DOM
+            return await extract_serp_html(page)
+        finally:
+            self.browser_manager.active_tabs.discard(page)
+            await self.browser_manager._return_tab(page)
+
+def create_search_backend(backend, browser_manager):
+    """Build a search backend from its name, or return a ready-made backend instance unchanged"""
+    if isinstance(backend, SearchBackend):
+        return backend
+    if backend == "http":
+        return HttpSearchBackend(max_connections=browser_manager.max_concurrent_tabs)
+    if backend == "playwright":
+        return PlaywrightSearchBackend(browser_manager)
+    raise ValueError(f"Unknown search backend: {backend}")
@@ -0,0 +1,147 @@
+# Persistent search cache shared by BrowserManager searches
+import asyncio
+import json
+import sqlite3
+import time
+from pathlib import Path
+
+class SearchCache:
+    """SQLite-backed search cache with per-entry TTL, LRU eviction and in-flight deduplication"""
+
+    def __init__(self, db_path=None, ttl=7 * 24 * 3600, max_entries=5000, empty_ttl=600):
+        self.db_path = str(db_path) if db_path else ':memory:'
+        self.ttl = ttl
+        # Results without links are often a challenge page or a timed-out wait, so they expire quickly
+        self.empty_ttl = empty_ttl
+        self.max_entries = max_entries
+        self.in_flight = {}  # cache_key -> Future of the search currently running for that key
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+        if db_path:
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.db_path)
+        self.conn.execute(
+            """CREATE TABLE IF NOT EXISTS search_cache (
+                   key TEXT PRIMARY KEY,
+                   value TEXT NOT NULL,
+                   expires_at REAL NOT NULL,
+                   last_used REAL NOT NULL
+               )"""
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_search_cache_last_used ON search_cache(last_used)")
+        self.purge_expired()
+
+    @staticmethod
+    def make_key(query, company_name="", kind="links"):
+        """Build a cache key from the result kind and the normalized query and company name"""
+        normalized_query = ' '.join(query.lower().split())
+        normalized_company = ' '.join(company_name.lower().split())
+        return f"{kind}|{normalized_query}|{normalized_company}"
+
+    @staticmethod
+    def is_empty(value):
+        """Check if a search result holds no links (a list, or a dict of lists per category)"""
+        if isinstance(value, dict):
+            return not any(value.values())
+        return not value
+
+    def get(self, key):
+        """Return the cached value for key, or None if missing or expired"""
+        value = self._lookup(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def _lookup(self, key):
+        row = self.conn.execute(
+            "SELECT value, expires_at FROM search_cache WHERE key = ?", (key,)
+        ).fetchone()
+        now = time.time()
+
+        if row is None or row[1] < now:
+            if row is not None:
+                self.conn.execute("DELETE FROM search_cache WHERE key = ?", (key,))
+                self.conn.commit()
+            return None
+
+        self.conn.execute("UPDATE search_cache SET last_used = ? WHERE key = ?", (now, key))
+        self.conn.commit()
+        return json.loads(row[0])
+
+    def set(self, key, value, ttl=None):
+        """Store value under key and evict least recently used entries above the size cap"""
+        now = time.time()
+        if ttl is None:
+            ttl = self.empty_ttl if self.is_empty(value) else self.ttl
+        expires_at = now + ttl
+        self.conn.execute(
+            "INSERT OR REPLACE INTO search_cache (key, value, expires_at, last_used) VALUES (?, ?, ?, ?)",
+            (key, json.dumps(value), expires_at, now)
+        )
+
+        count = self.conn.execute("SELECT COUNT(*) FROM search_cache").fetchone()[0]
+        if count > self.max_entries:
+            self.conn.execute(
+                "DELETE FROM search_cache WHERE key IN "
+                "(SELECT key FROM search_cache ORDER BY last_used ASC LIMIT ?)",
+                (count - self.max_entries,)
+            )
+        self.conn.commit()
+
+    def purge_expired(self):
+        """Remove all expired entries"""
+        self.conn.execute("DELETE FROM search_cache WHERE expires_at < ?", (time.time(),))
+        self.conn.commit()
+
+    async def coalesce(self, key, fetch):
+        """Run fetch() once per key; concurrent callers for the same key share its result"""
+        while key in self.in_flight:
+            self.coalesced += 1
+            future = self.in_flight[key]
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled() or asyncio.current_task().cancelling():
+                    raise
+                # The search we were waiting for was cancelled, not us: run it again (or join a new one)
+                self.coalesced -= 1
+
+        # Another caller may have filled the cache while we were waiting for our turn (already counted as a miss)
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+
+        future = asyncio.get_running_loop().create_future()
+        self.in_flight[key] = future
+        try:
+            value = await fetch()
+            self.set(key, value)
+            future.set_result(value)
+            return value
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Retrieve the exception so an unawaited future does not log a warning
+            future.exception()
+            raise
+        finally:
+            del self.in_flight[key]
+
+    def stats(self):
+        """Return cache hit/miss counters"""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'coalesced': self.coalesced,
+            'entries': self.conn.execute("SELECT COUNT(*) FROM search_cache").fetchone()[0]
+        }
+
+    def close(self):
+        """Close the underlying database connection"""
+        self.conn.close()
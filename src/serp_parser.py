@@ -0,0 +1,120 @@
+# Fast link extraction for DuckDuckGo result pages
+from bs4 import BeautifulSoup
+
+from url_canonical import canonicalize_url, dedupe_urls
+
+try:
+    import lxml.etree
+    import lxml.html
+except ImportError:  # lxml is optional; fall back to BeautifulSoup's html.parser
+    lxml = None
+
+# Containers holding the organic results, for the browser page and the HTML-only endpoint
+RESULT_CONTAINER_XPATH = (
+    "//*[@data-testid='mainline'] | //ol[contains(@class, 'react-results--main')] | //*[@id='links']"
+)
+
+# Anchors that are result titles, tried in order
+RESULT_TITLE_XPATHS = [
+    "//a[@data-testid='result-title-a']",
+    "//a[contains(concat(' ', normalize-space(@class), ' '), ' result__a ')]",
+    "//h2[contains(concat(' ', normalize-space(@class), ' '), ' result__title ')]//a",
+    "//*[contains(concat(' ', normalize-space(@class), ' '), ' results ')]"
+    "//*[contains(concat(' ', normalize-space(@class), ' '), ' result ')]//a",
+]
+
+def _is_external_link(href):
+    """Keep absolute links that do not point back at the search engine"""
+    return href.startswith('http') and 'duckduckgo.com' not in href
+
+def _parse_document(html_content):
+    """Parse HTML with lxml, or return None when lxml rejects it (e.g. an encoding declaration)"""
+    try:
+        return lxml.html.fromstring(html_content)
+    except (ValueError, lxml.etree.ParserError):
+        return None
+
+def extract_links(html_content):
+    """Return (canonical href, lowercased text, lowercased title) tuples for external links inside the result container"""
+    if lxml is None:
+        return _extract_links_bs4(html_content)
+    if not html_content or not html_content.strip():
+        return []
+
+    document = _parse_document(html_content)
+    if document is None:
+        return _extract_links_bs4(html_content)
+
+    # Only walk the first result container found; the whole page when there is none
+    containers = document.xpath(RESULT_CONTAINER_XPATH)
+    root = containers[0] if containers else document
+
+    candidates = []
+    for anchor in root.iter('a'):
+        href = anchor.get('href')
+        if not href:
+            continue
+        href = canonicalize_url(href)
+        if not _is_external_link(href):
+            continue
+
+        # Joined like BeautifulSoup's get_text(strip=True) so relevance scores stay the same
+        text = ''.join(part.strip() for part in anchor.itertext()).lower()
+        title = (anchor.get('title') or '').lower()
+        candidates.append((href, text, title))
+
+    return candidates
+
+def extract_result_title_links(html_content):
+    """Return the external result-title URLs in page order, using the first selector that matches"""
+    if lxml is None:
+        return _extract_result_title_links_bs4(html_content)
+    if not html_content or not html_content.strip():
+        return []
+
+    document = _parse_document(html_content)
+    if document is None:
+        return _extract_result_title_links_bs4(html_content)
+
+    for xpath in RESULT_TITLE_XPATHS:
+        links = []
+        for anchor in document.xpath(xpath):
+            url = canonicalize_url(anchor.get('href') or '')
+            if url and _is_external_link(url):
+                links.append(url)
+        if links:  # If we found links with this selector, stop trying others
+            return dedupe_urls(links)
+    return []
+
+def _extract_links_bs4(html_content):
+    """BeautifulSoup fallback for extract_links when lxml is not installed"""
+    soup = BeautifulSoup(html_content, 'html.parser')
+    root = soup.select_one("[data-testid='mainline'], ol.react-results--main, #links") or soup
+
+    candidates = []
+    for anchor in root.find_all('a', href=True):
+        href = canonicalize_url(anchor.get('href', ''))
+        if not _is_external_link(href):
+            continue
+        candidates.append((href, anchor.get_text(strip=True).lower(), anchor.get('title', '').lower()))
+    return candidates
+
+def _extract_result_title_links_bs4(html_content):
+    """BeautifulSoup fallback for extract_result_title_links when lxml is not installed"""
+    soup = BeautifulSoup(html_content, 'html.parser')
+    selectors = [
+        'a[data-testid="result-title-a"]',
+        'a.result__a',
+        'h2.result__title a',
+        '.results .result a'
+    ]
+
+    for selector in selectors:
+        links = []
+        for link in soup.select(selector):
+            url = canonicalize_url(link.get('href') or '')
+            if url and _is_external_link(url):
+                links.append(url)
+        if links:
+            return dedupe_urls(links)
+    return []
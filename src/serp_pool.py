@@ -0,0 +1,137 @@
+# Executor-backed results page parsing, so CPU-bound parsing and scoring stay off the event loop
+import asyncio
+import heapq
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from serp_parser import extract_links, extract_result_title_links
+from url_classifier import default_classifier
+from url_canonical import url_key
+
+LINK_CATEGORIES = ['website', 'linkedin', 'careers', 'jobs_platform', 'other']
+
+PARSE_EXECUTORS = ['process', 'thread', 'inline']
+
+def relevance_score(url, text, title, company_name, category):
+    """Calculate relevance score for a link"""
+    score = 0
+    company_words = company_name.lower().split()
+    combined_text = f"{url} {text} {title}".lower()
+
+    # Company name matching
+    for word in company_words:
+        if len(word) > 2:  # Skip very short words
+            if word in combined_text:
+                score += 10
+
+    # Category-specific scoring
+    if category == 'jobs':
+        job_keywords = ['jobs', 'careers', 'hiring', 'openings', 'apply', 'employment']
+        score += sum(5 for keyword in job_keywords if keyword in combined_text)
+    elif category == 'linkedin':
+        if 'company' in combined_text:
+            score += 15
+    elif category == 'careers':
+        career_keywords = ['careers', 'jobs', 'work', 'team', 'opportunities']
+        score += sum(3 for keyword in career_keywords if keyword in combined_text)
+    elif category == 'website':
+        # Prefer shorter, simpler URLs (likely official sites)
+        if len(url) < 50:
+            score += 5
+        if url.endswith('.com'):
+            score += 5
+
+    return score
+
+def categorize_links(html_content, company_name, classifier=None):
+    """Extract result links with the fast SERP parser, categorize them and keep the top 5 scored per category"""
+    classifier = classifier or default_classifier
+    # Compact (href, text, title, platform) candidates; dicts are only built for links that get kept
+    candidates = {category: [] for category in LINK_CATEGORIES}
+
+    for href, text, title in extract_links(html_content):
+        category, platform_id = classifier.classify(href, text, title, company_name)
+        if category:
+            candidates[category].append((href, text, title, platform_id))
+
+    # Score the surviving links and keep the top 5 for each category
+    categorized_links = {}
+    for category, links in candidates.items():
+        scoring_category = 'jobs' if category == 'jobs_platform' else category
+        best_by_url = {}  # Keyed on the canonical URL, so http/https, www. and trailing-slash variants count once
+        for href, text, title, platform_id in links:
+            score = relevance_score(href, text, title, company_name, scoring_category)
+            key = url_key(href)
+            if key not in best_by_url or score > best_by_url[key]['score']:
+                best_by_url[key] = {'url': href, 'text': text, 'title': title, 'score': score}
+                if platform_id:
+                    best_by_url[key]['platform'] = platform_id
+
+        categorized_links[category] = heapq.nlargest(5, best_by_url.values(), key=lambda x: x['score'])
+
+    return categorized_links
+
+def parse_results_page(html_content, company_name='', classifier=None):
+    """Parse one results page and return (result, parse seconds); runs inside a pool worker"""
+    # Categorized links with a company name, otherwise the plain result-title URLs
+    started = time.perf_counter()
+    if company_name:
+        result = categorize_links(html_content, company_name, classifier)
+    else:
+        result = extract_result_title_links(html_content)
+    return result, time.perf_counter() - started
+
+class SerpParserPool:
+    """Parse results pages in a process pool (or a thread pool, or inline) and keep per-page parse times"""
+
+    def __init__(self, workers=2, executor='process', history=500):
+        if executor not in PARSE_EXECUTORS:
+            raise ValueError(f"Unknown parse executor '{executor}', expected one of {PARSE_EXECUTORS}")
+        self.workers = workers
+        self.executor_kind = executor if workers else 'inline'
+        self.executor = None  # Created on first use
+        self.parse_times = deque(maxlen=history)  # Seconds per parsed page, most recent last
+        self.pages = 0
+        self.total_parse_time = 0.0
+        self.total_wait_time = 0.0  # Time pages spent queued for a free worker, including transfer
+
+    def _get_executor(self):
+        if self.executor is None and self.executor_kind != 'inline':
+            pool_class = ProcessPoolExecutor if self.executor_kind == 'process' else ThreadPoolExecutor
+            self.executor = pool_class(max_workers=self.workers)
+        return self.executor
+
+    async def parse(self, html_content, company_name='', classifier=None):
+        """Return (categorized links or result-title URLs, parse seconds) for one page"""
+        # Only a custom classifier is shipped to the workers; they build the default one themselves
+        classifier = None if classifier is default_classifier else classifier
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        if self.executor_kind == 'inline':
+            result, parse_time = parse_results_page(html_content, company_name, classifier)
+        else:
+            result, parse_time = await loop.run_in_executor(
+                self._get_executor(), parse_results_page, html_content, company_name, classifier)
+        self.pages += 1
+        self.parse_times.append(parse_time)
+        self.total_parse_time += parse_time
+        self.total_wait_time += max(0.0, loop.time() - started - parse_time)
+        return result, parse_time
+
+    def close(self):
+        """Shut the pool down"""
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+    def stats(self):
+        """Return page count and parse/wait times in milliseconds"""
+        return {
+            'executor': self.executor_kind,
+            'workers': self.workers,
+            'pages': self.pages,
+            'avg_parse_ms': round(1000 * self.total_parse_time / self.pages, 1) if self.pages else 0,
+            'max_parse_ms': round(1000 * max(self.parse_times), 1) if self.parse_times else 0,
+            'avg_wait_ms': round(1000 * self.total_wait_time / self.pages, 1) if self.pages else 0,
+        }
@@ -0,0 +1,74 @@
+# URL canonicalization applied wherever links enter the system, so equivalent links dedupe and cache as one
+import urllib.parse
+
+# Query parameters that only track where a click came from
+TRACKING_PARAMS = {
+    'gclid', 'dclid', 'gbraid', 'wbraid', 'fbclid', 'msclkid', 'yclid', 'twclid', 'igshid', 'srsltid',
+    'mc_cid', 'mc_eid', '_ga', '_gl', '_hsenc', '_hsmi', 'mkt_tok', 'trk', 'trkinfo', 'refid', 'trackingid',
+    'gh_src', 'lever-source', 'lever-origin', 'ref',
+}
+TRACKING_PREFIXES = ('utm_', 'pk_', 'hsa_')
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+def unwrap_search_redirect(href):
+    """Return the target of a DuckDuckGo redirect link (//duckduckgo.com/l/?uddg=...), or href unchanged"""
+    if 'duckduckgo.com/l/' not in href:
+        return href
+    if href.startswith('//'):
+        href = 'https:' + href
+    target = urllib.parse.parse_qs(urllib.parse.urlparse(href).query).get('uddg')
+    return target[0] if target else href
+
+def _is_tracking_param(segment):
+    name = urllib.parse.unquote_plus(segment.split('=', 1)[0]).lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PREFIXES)
+
+def canonicalize_url(url, base_url=None):
+    """Return url made absolute, unwrapped from search redirects and stripped of tracking parameters and fragments"""
+    # Scheme and host are lowercased and default ports dropped; the path and remaining query stay as they were,
+    # so the result can still be visited. Non-http(s) links (mailto:, javascript:) come back unchanged
+    if not url:
+        return ''
+    url = url.strip()
+    if base_url:
+        url = urllib.parse.urljoin(base_url, url)
+    url = unwrap_search_redirect(url)
+
+    parts = urllib.parse.urlsplit(url)
+    scheme = parts.scheme.lower()
+    if scheme not in DEFAULT_PORTS or not parts.hostname:
+        return url
+    try:
+        port = parts.port
+    except ValueError:
+        return url
+
+    host = f'[{parts.hostname}]' if ':' in parts.hostname else parts.hostname
+    netloc = host if port in (None, DEFAULT_PORTS[scheme]) else f'{host}:{port}'
+    query = '&'.join(segment for segment in parts.query.split('&') if segment and not _is_tracking_param(segment))
+    # Fragments are dropped unless they are client-side routes (#/jobs, #!/jobs)
+    fragment = parts.fragment if parts.fragment.startswith(('/', '!')) else ''
+    return urllib.parse.urlunsplit((scheme, netloc, parts.path or '/', query, fragment))
+
+def url_key(url):
+    """Return the identity of a link: its canonical form without scheme, www., trailing slash or parameter order"""
+    canonical = canonicalize_url(url)
+    parts = urllib.parse.urlsplit(canonical)
+    if parts.scheme not in DEFAULT_PORTS:
+        return canonical
+    netloc = parts.netloc[4:] if parts.netloc.startswith('www.') else parts.netloc
+    key = netloc + (parts.path.rstrip('/') or '')
+    if parts.query:
+        key += '?' + '&'.join(sorted(parts.query.split('&')))
+    if parts.fragment:
+        key += '#' + parts.fragment
+    return key
+
+def dedupe_urls(urls):
+    """Drop empty links and links equivalent to an earlier one, keeping the first of each in order"""
+    unique = {}
+    for url in urls:
+        if url:
+            unique.setdefault(url_key(url), url)
+    return list(unique.values())
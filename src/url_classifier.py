@@ -0,0 +1,126 @@
+# Link classifier shared by every URL categorization path
+import re
+from functools import lru_cache
+from urllib.parse import urlsplit
+
+# Registrable domain -> platform ID for applicant tracking systems
+JOB_PLATFORM_DOMAINS = {
+    'lever.co': 'lever',
+    'greenhouse.io': 'greenhouse',
+    'zohorecruit.com': 'zoho_recruit',
+    'zohorecruit.in': 'zoho_recruit',
+    'zohorecruit.eu': 'zoho_recruit',
+    'smartrecruiters.com': 'smartrecruiters',
+    'workday.com': 'workday',
+    'myworkdayjobs.com': 'workday',
+    'bamboohr.com': 'bamboohr',
+    'jobvite.com': 'jobvite',
+    'icims.com': 'icims',
+    'successfactors.com': 'successfactors',
+    'successfactors.eu': 'successfactors',
+    'teamtailor.com': 'teamtailor',
+    'personio.de': 'personio',
+    'personio.com': 'personio',
+    'talentsoft.com': 'talentsoft',
+    'cornerstone.ondemand.com': 'cornerstone',
+    'csod.com': 'cornerstone',
+}
+
+# Job aggregators: they list other companies' jobs, so they are never a careers page or website
+JOB_BOARD_DOMAINS = {
+    'glassdoor.com', 'glassdoor.co.uk', 'indeed.com', 'monster.com', 'ziprecruiter.com', 'simplyhired.com',
+}
+
+# Domains that are never a company's own website
+EXCLUDED_DOMAINS = JOB_BOARD_DOMAINS | {
+    'linkedin.com', 'facebook.com', 'twitter.com', 'x.com', 'youtube.com', 'instagram.com',
+    'wikipedia.org', 'crunchbase.com', 'bloomberg.com', 'reuters.com', 'forbes.com',
+}
+
+CAREER_KEYWORDS = re.compile(
+    r'careers|jobs|employment|opportunities|hiring|openings|join-us|work-with-us|apply'
+)
+
+class UrlClassifier:
+    """Classify a link into a category and platform ID with one URL parse and suffix lookups"""
+
+    def __init__(self, job_platforms=JOB_PLATFORM_DOMAINS, excluded_domains=EXCLUDED_DOMAINS,
+                 job_boards=JOB_BOARD_DOMAINS, career_keywords=CAREER_KEYWORDS):
+        # Suffix index: every known domain maps to (platform ID, excluded, job board)
+        self.suffix_index = {}
+        for domain in excluded_domains:
+            self.suffix_index[domain] = (None, True, domain in job_boards)
+        for domain, platform_id in job_platforms.items():
+            self.suffix_index[domain] = (platform_id, False, False)
+        self.max_labels = max(domain.count('.') + 1 for domain in self.suffix_index)
+        self.career_keywords = career_keywords
+
+    @staticmethod
+    def host_of(url):
+        """Return the lowercased host without port and leading www."""
+        host = urlsplit(url.lower()).hostname or ''
+        return host[4:] if host.startswith('www.') else host
+
+    def lookup_domain(self, host):
+        """Return (matched domain, entry) for the longest known suffix of host, or (None, None)"""
+        labels = host.split('.')
+        # Longest suffix first, so 'cornerstone.ondemand.com' wins over shorter entries
+        for size in range(min(self.max_labels, len(labels)), 0, -1):
+            suffix = '.'.join(labels[-size:])
+            entry = self.suffix_index.get(suffix)
+            if entry is not None:
+                return suffix, entry
+        return None, None
+
+    def platform_id(self, url):
+        """Return the job platform ID for url, or None"""
+        _, entry = self.lookup_domain(self.host_of(url))
+        return entry[0] if entry else None
+
+    def is_excluded(self, url):
+        """Check if url belongs to a social, news or job-board domain that is never a company website"""
+        _, entry = self.lookup_domain(self.host_of(url))
+        return bool(entry and entry[1])
+
+    def classify(self, url, text='', title='', company_name=''):
+        """Return (category, platform ID) for a link; category is None when the link is irrelevant"""
+        # Categories are checked in priority order: jobs_platform, linkedin, careers, website, other
+        parts = urlsplit(url.lower())
+        host = parts.hostname or ''
+        if host.startswith('www.'):
+            host = host[4:]
+        path = parts.path
+
+        domain, entry = self.lookup_domain(host)
+        platform_id, excluded, _ = entry if entry else (None, False, False)
+
+        if platform_id:
+            return 'jobs_platform', platform_id
+
+        if domain == 'linkedin.com':
+            if 'company' in path or path.startswith('/in/'):
+                return 'linkedin', None
+
+        elif not excluded:
+            if self.career_keywords.search(host + path) or self.career_keywords.search(f"{text} {title}"):
+                return 'careers', None
+
+            company_clean, _ = company_tokens(company_name)
+            if company_clean and company_clean[:8] in host.replace('-', '').replace('_', ''):
+                return 'website', None
+
+        # Only keep other links if they seem relevant to the company
+        company_clean, company_words = company_tokens(company_name)
+        if company_clean and (company_clean in url.lower() or any(word in text for word in company_words)):
+            return 'other', None
+
+        return None, None
+
+@lru_cache(maxsize=1024)
+def company_tokens(company_name):
+    """Return the squashed company name and its lowercase words, as used for domain matching"""
+    name = company_name.lower()
+    company_clean = name.replace(' ', '').replace('-', '').replace('_', '').replace('.', '')
+    return company_clean, tuple(name.split())
+
+default_classifier = UrlClassifier()
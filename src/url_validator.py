@@ -0,0 +1,140 @@
+# Async URL validation over a pooled HTTP session, with per-host limits and a shared result cache
+import asyncio
+from urllib.parse import urlsplit
+import aiohttp
+
+from rate_limiter import DEFAULT_USER_AGENT
+from url_canonical import canonicalize_url
+
+# HEAD answers that usually mean the server refuses HEAD rather than a dead link; retried with GET
+HEAD_REFUSED_STATUSES = {403, 405, 501}
+
+class UrlValidator:
+    """Check URLs concurrently; each distinct URL is requested once and its redirect chain is remembered"""
+
+    def __init__(self, max_connections=20, max_per_host=2, timeout=10, rate_limiter=None,
+                 user_agent=DEFAULT_USER_AGENT):
+        self.max_connections = max_connections
+        self.max_per_host = max_per_host
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter  # Optional HostRateLimiter shared with the rest of the run
+        self.user_agent = user_agent
+        self.session = None
+        # Keyed on canonical URLs, which keep the scheme and host as they are: http:// and https:// (or www. and
+        # bare) variants can answer differently, so each is checked on its own (url_key is for deduplication only).
+        # Canonical URL -> future of its result; every hop of a redirect chain shares the final result
+        self.results = {}
+        self.redirects = {}  # Canonical URL -> final URL it redirects to
+        self.requests = 0
+        self.get_fallbacks = 0
+        self.cache_hits = 0
+
+    async def start(self):
+        if self.session is None:
+            # The connector pools connections and caps concurrent requests overall and per host
+            connector = aiohttp.TCPConnector(limit=self.max_connections, limit_per_host=self.max_per_host,
+                                             ttl_dns_cache=300)
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers={'User-Agent': self.user_agent}
+            )
+
+    async def validate(self, url):
+        """Return {'url', 'ok', 'status', 'final_url', 'error'} for url; ok is None when it could not be checked"""
+        key = canonicalize_url(url)
+        while key in self.results:
+            # Shielded, so a waiter that is cancelled does not cancel the check the other waiters share
+            result = await asyncio.shield(self.results[key])
+            if result is not None:
+                self.cache_hits += 1
+                return {**result, 'url': url}
+            # The caller running the check was cancelled; one of the waiters checks the URL instead
+
+        future = asyncio.get_running_loop().create_future()
+        self.results[key] = future
+        try:
+            result = await self._check(url)
+        except asyncio.CancelledError:
+            # Forget the URL so a later call checks it again, and wake the waiters with None so they retry
+            del self.results[key]
+            future.set_result(None)
+            raise
+        except Exception as e:
+            result = {'url': url, 'ok': None, 'status': None, 'final_url': url, 'error': str(e) or type(e).__name__}
+        future.set_result(result)
+        return result
+
+    async def validate_many(self, urls):
+        """Validate non-empty URLs concurrently and return {url: result}; equivalent URLs share one check"""
+        urls = list(dict.fromkeys(url for url in urls if url))
+        results = await asyncio.gather(*(self.validate(url) for url in urls))
+        return dict(zip(urls, results))
+
+    def is_dead(self, url):
+        """Check if url was already found to answer with an error status"""
+        future = self.results.get(canonicalize_url(url))
+        result = future.result() if future and future.done() else None
+        return bool(result and result['ok'] is False)
+
+    def final_url(self, url):
+        """Return the URL that url redirected to when it was checked, or url itself"""
+        return self.redirects.get(canonicalize_url(url), url)
+
+    async def _check(self, url):
+        """Request url with HEAD, falling back to GET when HEAD is refused"""
+        if urlsplit(url).scheme not in ('http', 'https'):
+            return {'url': url, 'ok': None, 'status': None, 'final_url': url, 'error': 'not an http(s) URL'}
+        if self.session is None:
+            await self.start()
+
+        try:
+            status, final_url, history = await self._request('HEAD', url)
+            if status in HEAD_REFUSED_STATUSES:
+                self.get_fallbacks += 1
+                status, final_url, history = await self._request('GET', url)
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            return {'url': url, 'ok': None, 'status': None, 'final_url': url, 'error': str(e) or type(e).__name__}
+
+        result = {'url': url, 'ok': status < 400, 'status': status, 'final_url': final_url, 'error': None}
+        self._remember_redirects(url, history, result)
+        return result
+
+    async def _request(self, method, url):
+        """Return (status, final URL, redirect hops) without reading the body"""
+        if self.rate_limiter:
+            async with self.rate_limiter.limit(url):
+                return await self._send(method, url)
+        return await self._send(method, url)
+
+    async def _send(self, method, url):
+        self.requests += 1
+        async with self.session.request(method, url, allow_redirects=True) as response:
+            return response.status, str(response.url), [str(hop.url) for hop in response.history]
+
+    def _remember_redirects(self, url, history, result):
+        """Point every hop of the redirect chain, and the final URL, at this result"""
+        final_url = result['final_url']
+        for hop in [url, *history, final_url]:
+            key = canonicalize_url(hop)
+            if key != canonicalize_url(final_url):
+                self.redirects[key] = final_url
+            if key not in self.results:
+                future = asyncio.get_running_loop().create_future()
+                future.set_result({**result, 'url': hop})
+                self.results[key] = future
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    def stats(self):
+        """Return request counts, cache hits, GET fallbacks and redirects seen"""
+        return {
+            'checked': len(self.results),
+            'requests': self.requests,
+            'cache_hits': self.cache_hits,
+            'get_fallbacks': self.get_fallbacks,
+            'redirects': len(self.redirects),
+        }
@@ -0,0 +1,16 @@
+# Shared test setup: the modules under src/ import each other by name, and the tests read recorded pages
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+FIXTURE_DIR = Path(__file__).parent / "fixtures"
+
+def fixture_path(kind, name):
+    """Path of a recorded page or response under tests/fixtures/{kind}"""
+    return FIXTURE_DIR / kind / name
+
+def read_fixture(kind, name):
+    """Text of a recorded page or response"""
+    return fixture_path(kind, name).read_text(encoding='utf-8')
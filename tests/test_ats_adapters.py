@@ -0,0 +1,171 @@
+# Feed and static HTML job board adapters, read from recorded responses served locally
+import asyncio
+import pytest
+from aiohttp import web
+
+from conftest import fixture_path
+from ats_api import AtsApiClient
+from job_adapters import default_registry
+from job_budget import JobBudget
+from job_scraper import JobScraper
+
+LIMIT = 3
+
+# (platform ID, board URL, adapter, board identifiers, method, path, recorded response, content type)
+BOARDS = [
+    ('lever', 'https://jobs.lever.co/acme?lever-origin=applied', 'LeverApi', {'slug': 'acme'},
+     'GET', '/v0/postings/acme', 'lever_postings.json', 'application/json'),
+    ('greenhouse', 'https://boards.greenhouse.io/embed/job_board?for=acme&b=https%3A%2F%2Facme.com%2Fcareers',
+     'GreenhouseApi', {'slug': 'acme'}, 'GET', '/v1/boards/acme/jobs', 'greenhouse_jobs.json', 'application/json'),
+    ('smartrecruiters', 'https://careers.smartrecruiters.com/Acme', 'SmartRecruitersApi', {'slug': 'Acme'},
+     'GET', '/v1/companies/Acme/postings', 'smartrecruiters_postings.json', 'application/json'),
+    ('workday', 'https://acme.wd5.myworkdayjobs.com/en-US/External_Careers/details/Data-Analyst_R-104233',
+     'WorkdayApi', {'tenant': 'acme', 'site': 'External_Careers'},
+     'POST', '/wday/cxs/acme/External_Careers/jobs', 'workday_jobs.json', 'application/json'),
+    ('bamboohr', 'https://acme.bamboohr.com/careers', 'BambooHrApi', {'company': 'acme'},
+     'GET', '/careers/list', 'bamboohr_list.json', 'application/json'),
+    ('teamtailor', 'https://acme.teamtailor.com/jobs', 'TeamtailorApi', {'company': 'acme'},
+     'GET', '/jobs.rss', 'teamtailor_jobs.rss', 'application/rss+xml'),
+    ('personio', 'https://acme.jobs.personio.de/', 'PersonioApi', {'company': 'acme'},
+     'GET', '/xml', 'personio.xml', 'text/xml'),
+    ('jobvite', 'https://jobs.jobvite.com/acme', 'JobviteHtml', {'slug': 'acme'},
+     'GET', '/acme/jobs', 'jobvite_jobs.html', 'text/html'),
+    ('icims', 'https://careers-acme.icims.com/jobs/intro', 'IcimsHtml', {'host': 'careers-acme'},
+     'GET', '/jobs/search', 'icims_search.html', 'text/html'),
+]
+
+# The first job each board must give: (title, location, URL, posting date)
+FIRST_JOBS = {
+    'lever': ('Senior Backend Engineer', 'London, UK',
+              'https://jobs.lever.co/acme/5ac21346-8e0c-4494-8e7a-3eb92ff77902', '2024-06-03'),
+    'greenhouse': ('Site Reliability Engineer', 'New York, NY',
+                   'https://boards.greenhouse.io/acme/jobs/4012345006', '2024-05-02'),
+    'smartrecruiters': ('Sous Chef', 'Paris, Île-de-France, France',
+                        'https://jobs.smartrecruiters.com/Acme/744000012345678', '2024-04-18'),
+    'workday': ('Data Analyst', 'New York, NY',
+                'https://acme.wd5.myworkdayjobs.com/External_Careers/job/New-York-NY/Data-Analyst_R-104233',
+                'Posted Today'),
+    'bamboohr': ('Office Manager', 'Austin, Texas, United States', 'https://acme.bamboohr.com/careers/112', 'N/A'),
+    'teamtailor': ('Backend Developer', 'Stockholm, Göteborg',
+                   'https://acme.teamtailor.com/jobs/4100123-backend-developer', '2024-06-03'),
+    'personio': ('Frontend Entwickler (m/w/d)', 'Berlin', 'https://acme.jobs.personio.de/job/1398201', '2024-05-14'),
+    'jobvite': ('QA Engineer', 'Toronto, Ontario', 'https://jobs.jobvite.com/acme/job/oAbC1fwq', 'N/A'),
+    'icims': ('Maintenance Technician', 'US-OH-Columbus',
+              'https://careers-acme.icims.com/jobs/2231/maintenance-technician/job?in_iframe=1', 'N/A'),
+}
+
+# Jobs each recorded response holds, when fewer than LIMIT
+JOB_COUNTS = {'lever': 3}
+
+def feed_adapter(url):
+    """The cheapest adapter for a board URL that does not need a browser, with its board"""
+    matches = [(adapter, board) for adapter, board in default_registry.lookup(url) if adapter.tier != 'browser']
+    assert matches, f"no feed or HTML adapter for {url}"
+    return matches[0]
+
+async def serve(routes, requests):
+    """Serve recorded responses for (platform ID, method, path, fixture, content type) routes under
+    /{platform ID}{path}; returns the runner and the base URL"""
+    app = web.Application()
+    for platform_id, method, path, fixture, content_type in routes:
+        async def handler(request, platform_id=platform_id, fixture=fixture, content_type=content_type):
+            body = await request.json() if request.can_read_body else None
+            requests[platform_id] = {'method': request.method, 'path': request.path,
+                                     'query': dict(request.query), 'body': body}
+            return web.Response(body=fixture_path('ats', fixture).read_bytes(), content_type=content_type)
+        app.router.add_route(method, f"/{platform_id}{path}", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, '127.0.0.1', 0).start()
+    host, port = runner.addresses[0][:2]
+    return runner, f"http://{host}:{port}"
+
+async def fetch_board(platform_id, url, method, path, fixture, content_type):
+    requests = {}
+    runner, base = await serve([(platform_id, method, path, fixture, content_type)], requests)
+    client = AtsApiClient(api_bases={platform_id: f"{base}/{platform_id}"})
+    try:
+        adapter, board = feed_adapter(url)
+        jobs = await client.fetch_jobs(adapter, board, 'Acme', LIMIT)
+    finally:
+        await client.close()
+        await runner.cleanup()
+    return jobs, requests.get(platform_id)
+
+@pytest.mark.parametrize('platform_id, url, adapter_name, identifiers', [case[:4] for case in BOARDS],
+                         ids=[case[0] for case in BOARDS])
+def test_board_url_routes_to_adapter(platform_id, url, adapter_name, identifiers):
+    adapter, board = feed_adapter(url)
+    assert type(adapter).__name__ == adapter_name
+    assert {key: value for key, value in board.items() if key not in ('origin', 'api_base')} == identifiers
+
+@pytest.mark.parametrize('case', BOARDS, ids=[case[0] for case in BOARDS])
+def test_adapter_maps_recorded_response(case):
+    platform_id, url, _, _, method, path, fixture, content_type = case
+    jobs, request = asyncio.run(fetch_board(platform_id, url, method, path, fixture, content_type))
+
+    assert request['method'] == method
+    assert request['path'] == f"/{platform_id}{path}"
+    assert 0 < len(jobs) <= LIMIT
+    assert len(jobs) == JOB_COUNTS.get(platform_id, len(jobs))
+    first = jobs[0]
+    assert (first['job_title'], first['job_location'], first['job_url'], first['posting_date']) == FIRST_JOBS[platform_id]
+    assert all(job['company_name'] == 'Acme' and job['job_description'] == 'N/A' for job in jobs)
+
+def test_request_carries_limit():
+    _, request = asyncio.run(fetch_board(*(BOARDS[0][:2] + BOARDS[0][4:])))
+    assert request['query'] == {'mode': 'json', 'limit': str(LIMIT)}
+    _, request = asyncio.run(fetch_board(*(BOARDS[3][:2] + BOARDS[3][4:])))
+    assert request['body'] == {'appliedFacets': {}, 'limit': LIMIT, 'offset': 0, 'searchText': ''}
+
+class FakePage:
+    """A tab whose listing extraction returns fixed records"""
+
+    def __init__(self, records):
+        self.records = records
+
+    async def goto(self, url, **kwargs):
+        pass
+
+    async def evaluate(self, script, spec):
+        return [self.records]
+
+    async def close(self):
+        pass
+
+class FakeBrowserManager:
+    rate_limiter = None
+
+    def __init__(self, page):
+        self.page = page
+        self.navigated = []
+
+    async def new_page(self):
+        return self.page
+
+    async def navigate(self, page, url, readiness=None):
+        self.navigated.append(url)
+
+def test_malformed_feed_falls_back_to_browser():
+    records = [{'title': 'Senior Backend Engineer', 'location': 'London, UK',
+                'url': 'https://jobs.lever.co/acme/5ac21346-8e0c-4494-8e7a-3eb92ff77902'}]
+
+    async def scrape():
+        requests = {}
+        runner, base = await serve([('lever', 'GET', '/v0/postings/acme', 'lever_postings_malformed.json',
+                                     'application/json')], requests)
+        browser_manager = FakeBrowserManager(FakePage(records))
+        client = AtsApiClient(api_bases={'lever': f"{base}/lever"})
+        scraper = JobScraper(browser_manager, api_client=client, budget=JobBudget())
+        try:
+            jobs = await scraper.scrape_jobs_from_url('Acme', 'https://jobs.lever.co/acme')
+        finally:
+            await client.close()
+            await runner.cleanup()
+        return jobs, requests, browser_manager, client
+
+    jobs, requests, browser_manager, client = asyncio.run(scrape())
+    assert 'lever' in requests  # The feed was tried first
+    assert client.failed == 1
+    assert browser_manager.navigated == ['https://jobs.lever.co/acme']
+    assert [(job['job_title'], job['job_location']) for job in jobs] == [('Senior Backend Engineer', 'London, UK')]
@@ -0,0 +1,41 @@
+# Readiness waits are best effort: they report failure instead of raising
+import asyncio
+from playwright.async_api import Error as PlaywrightError, TimeoutError as PlaywrightTimeoutError
+
+from page_readiness import DomStable, navigate
+
+class RedirectingPage:
+    """A page whose first evaluate() calls fail as if a JS redirect replaced the document"""
+
+    def __init__(self, failures, error=PlaywrightError):
+        self.failures = failures
+        self.error = error
+        self.evaluations = 0
+        self.load_waits = 0
+
+    async def goto(self, url, **kwargs):
+        pass
+
+    async def evaluate(self, script, arg=None):
+        self.evaluations += 1
+        if self.evaluations <= self.failures:
+            raise self.error("Execution context was destroyed, most likely because of a navigation")
+        return True
+
+    async def wait_for_load_state(self, state='load', timeout=None):
+        self.load_waits += 1
+
+def test_retries_once_after_redirect():
+    page = RedirectingPage(failures=1)
+    assert asyncio.run(navigate(page, 'https://acme.com/careers', DomStable())) is True
+    assert (page.evaluations, page.load_waits) == (2, 1)
+
+def test_repeated_failure_returns_false():
+    page = RedirectingPage(failures=2)
+    assert asyncio.run(navigate(page, 'https://acme.com/careers', DomStable())) is False
+    assert (page.evaluations, page.load_waits) == (2, 1)
+
+def test_timeout_returns_false_without_retry():
+    page = RedirectingPage(failures=1, error=PlaywrightTimeoutError)
+    assert asyncio.run(navigate(page, 'https://acme.com/careers', DomStable())) is False
+    assert (page.evaluations, page.load_waits) == (1, 0)
@@ -0,0 +1,100 @@
+# SERP parser against saved results pages: lxml/BeautifulSoup parity and the original categorizer's output
+import pytest
+
+from conftest import FIXTURE_DIR, read_fixture
+from serp_parser import (extract_links, extract_result_title_links, _extract_links_bs4,
+                         _extract_result_title_links_bs4)
+from serp_pool import categorize_links
+from url_canonical import canonicalize_url, url_key
+
+COMPANY_NAME = "Acme"
+PAGES = sorted(path.name for path in (FIXTURE_DIR / "serp").glob("*.html"))
+
+# Categorized links recorded from the original BrowserManager.filter_and_categorize_links for each page
+BASELINE = {
+    'challenge_page.html': {},
+    'encoding_declaration.html': {
+        'website': ['https://www.acme.de/'],
+        'careers': ['https://acme.teamtailor.com/jobs', 'https://acme.jobs.personio.de/'],
+    },
+    'html_endpoint.html': {
+        'website': ['https://acme.com/'],
+        'linkedin': ['https://www.linkedin.com/company/acme/'],
+        'careers': ['https://www.acme.com/careers/', 'https://www.acme.com/careers/',
+                    'https://www.linkedin.com/jobs/acme-jobs', 'https://www.glassdoor.com/Jobs/Acme-Jobs-E1234.htm'],
+        'other': ['https://en.wikipedia.org/wiki/Acme_Corporation'],
+    },
+    'no_container.html': {
+        'website': ['http://www.acme.com:80/about-us'],
+        'jobs_platform': ['https://jobs.smartrecruiters.com/Acme', 'https://acme.bamboohr.com/careers'],
+    },
+    'react_layout.html': {
+        'website': ['https://acme.com', 'https://www.acme-fan-site.net/'],
+        'careers': ['https://acme.wd5.myworkdayjobs.com/en-US/External',
+                    'https://careers.acme.com/jobs?pk_campaign=search#/openings', 'https://www.indeed.com/q-Acme-jobs.html'],
+        'jobs_platform': ['https://boards.greenhouse.io/acme', 'https://boards.greenhouse.io/acme'],
+    },
+}
+
+# Intended differences from the baseline: (page, URL, baseline category, new category); None means absent
+RECLASSIFIED = [
+    # Shared classifier: registrable-domain platform list and job aggregators that are never careers pages
+    ('encoding_declaration.html', 'https://acme.teamtailor.com/jobs', 'careers', 'jobs_platform'),
+    ('encoding_declaration.html', 'https://acme.jobs.personio.de/', 'careers', 'jobs_platform'),
+    ('react_layout.html', 'https://acme.wd5.myworkdayjobs.com/en-US/External', 'careers', 'jobs_platform'),
+    ('html_endpoint.html', 'https://www.linkedin.com/jobs/acme-jobs', 'careers', 'other'),
+    ('html_endpoint.html', 'https://www.glassdoor.com/Jobs/Acme-Jobs-E1234.htm', 'careers', 'other'),
+    ('react_layout.html', 'https://www.indeed.com/q-Acme-jobs.html', 'careers', 'other'),
+    # lxml parser: DuckDuckGo redirect links are unwrapped, links outside the results are ignored
+    ('html_endpoint.html', 'https://jobs.lever.co/acme', None, 'jobs_platform'),
+    ('react_layout.html', 'https://www.acme-fan-site.net/', 'website', None),
+]
+
+# Platform IDs the classifier must give jobs_platform links
+PLATFORMS = {
+    'https://acme.teamtailor.com/jobs': 'teamtailor',
+    'https://acme.jobs.personio.de/': 'personio',
+    'https://jobs.lever.co/acme': 'lever',
+    'https://jobs.smartrecruiters.com/Acme': 'smartrecruiters',
+    'https://acme.bamboohr.com/careers': 'bamboohr',
+    'https://acme.wd5.myworkdayjobs.com/en-US/External': 'workday',
+    'https://boards.greenhouse.io/acme': 'greenhouse',
+}
+
+def expected_categories(page):
+    """Baseline categories with the intended reclassifications applied, as sets of canonical URL keys.
+    Duplicates and tracking-parameter variants collapse, as they do since URLs are canonicalized."""
+    expected = {category: {url_key(url) for url in urls} for category, urls in BASELINE[page].items()}
+    for changed_page, url, before, after in RECLASSIFIED:
+        if changed_page != page:
+            continue
+        if before:
+            expected[before].remove(url_key(url))
+        if after:
+            expected.setdefault(after, set()).add(url_key(url))
+    return {category: keys for category, keys in expected.items() if keys}
+
+@pytest.mark.parametrize('page', PAGES)
+def test_lxml_matches_beautifulsoup(page):
+    html_content = read_fixture('serp', page)
+    assert extract_links(html_content) == _extract_links_bs4(html_content)
+    assert extract_result_title_links(html_content) == _extract_result_title_links_bs4(html_content)
+
+@pytest.mark.parametrize('page', PAGES)
+def test_categories_match_baseline(page):
+    categorized = categorize_links(read_fixture('serp', page), COMPANY_NAME)
+    found = {category: {url_key(link['url']) for link in links} for category, links in categorized.items() if links}
+    assert found == expected_categories(page)
+
+@pytest.mark.parametrize('page', PAGES)
+def test_links_are_canonical_and_tagged(page):
+    categorized = categorize_links(read_fixture('serp', page), COMPANY_NAME)
+    for category, links in categorized.items():
+        assert len({url_key(link['url']) for link in links}) == len(links)
+        for link in links:
+            assert link['url'] == canonicalize_url(link['url'])
+            if category == 'jobs_platform':
+                assert link['platform'] == PLATFORMS[link['url']]
+
+def test_challenge_page_has_no_results():
+    assert extract_result_title_links(read_fixture('serp', 'challenge_page.html')) == []
@@ -0,0 +1,94 @@
+# URL validation against a local HTTP server
+import asyncio
+from aiohttp import web
+
+from url_validator import UrlValidator
+
+async def serve(hits):
+    """Start a server with /ok, /no-head (refuses HEAD), /redirect (to /ok) and /slow; returns the runner and base URL"""
+    async def ok(request):
+        hits.append((request.method, request.path))
+        return web.Response(text='ok')
+
+    async def no_head(request):
+        hits.append((request.method, request.path))
+        if request.method == 'HEAD':
+            return web.Response(status=405)
+        return web.Response(text='ok')
+
+    async def redirect(request):
+        hits.append((request.method, request.path))
+        raise web.HTTPFound('/ok')
+
+    async def slow(request):
+        hits.append((request.method, request.path))
+        await asyncio.sleep(0.3)
+        return web.Response(text='ok')
+
+    app = web.Application()
+    for path, handler in [('/ok', ok), ('/no-head', no_head), ('/redirect', redirect), ('/slow', slow)]:
+        app.router.add_route('*', path, handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, '127.0.0.1', 0).start()
+    host, port = runner.addresses[0][:2]
+    return runner, f"http://{host}:{port}"
+
+def run_with_server(check):
+    """Run check(validator, base URL, hits) against a fresh server and validator"""
+    async def main():
+        hits = []
+        runner, base = await serve(hits)
+        validator = UrlValidator()
+        try:
+            return await check(validator, base, hits)
+        finally:
+            await validator.close()
+            await runner.cleanup()
+    return asyncio.run(main())
+
+def test_head_refused_falls_back_to_get():
+    async def check(validator, base, hits):
+        result = await validator.validate(f"{base}/no-head")
+        assert (result['ok'], result['status']) == (True, 200)
+        assert hits == [('HEAD', '/no-head'), ('GET', '/no-head')]
+        assert validator.stats()['get_fallbacks'] == 1
+    run_with_server(check)
+
+def test_redirect_chain_is_reused():
+    async def check(validator, base, hits):
+        result = await validator.validate(f"{base}/redirect")
+        assert result['final_url'] == f"{base}/ok"
+        requests = validator.requests
+
+        # The final URL was answered by the redirect's check
+        again = await validator.validate(f"{base}/ok")
+        assert (again['url'], again['ok']) == (f"{base}/ok", True)
+        assert validator.requests == requests
+        assert validator.cache_hits == 1
+        assert validator.final_url(f"{base}/redirect") == f"{base}/ok"
+    run_with_server(check)
+
+def test_cancelled_check_is_taken_over_by_waiter():
+    async def check(validator, base, hits):
+        first = asyncio.ensure_future(validator.validate(f"{base}/slow"))
+        await asyncio.sleep(0.05)
+        second = asyncio.ensure_future(validator.validate(f"{base}/slow"))
+        await asyncio.sleep(0.05)
+        first.cancel()
+
+        result = await second
+        assert first.cancelled()
+        assert (result['ok'], result['status']) == (True, 200)
+        assert hits == [('HEAD', '/slow'), ('HEAD', '/slow')]
+    run_with_server(check)
+
+def test_unexpected_error_gives_unchecked_result():
+    async def check(validator, base, hits):
+        async def broken(method, url):
+            raise RuntimeError("connection pool closed")
+        validator._send = broken
+        result = await validator.validate(f"{base}/ok")
+        assert (result['ok'], result['error']) == (None, "connection pool closed")
+        assert not validator.is_dead(f"{base}/ok")
+    run_with_server(check)